@@ -0,0 +1,57 @@
+import argparse
+import random
+import sqlite3
+import time
+import p2app.engine.indexes as indexes
+import p2app.engine.query as query
+from p2app.events import AirportDetails, AirportFrequency, Runway
+from benchmarks import scratch
+
+
+def _one_airport_at_a_time(connection, airport_ids) -> list[AirportDetails]:
+    """
+    Loads the details the way a caller would without load_airport_details: three
+    queries for every airport
+    """
+    details = []
+
+    for airport_id in airport_ids:
+        airport = query.load_airport(connection, airport_id)
+        runways = tuple(Runway(*row) for row in connection.execute(
+            'SELECT * FROM runway WHERE airport_id = ?;', (airport_id,)))
+        frequencies = tuple(AirportFrequency(*row) for row in connection.execute(
+            'SELECT * FROM airport_frequency WHERE airport_id = ?;', (airport_id,)))
+        details.append(AirportDetails(airport, runways, frequencies))
+
+    return details
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times loading airports with their runways and frequencies three queries per airport '
+                      'against three queries in all with load_airport_details.')
+    parser.add_argument('--airports', type = int, default = 80000, help = 'airports in the scratch database')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.airport_database(directory / 'airports.db', args.airports))
+
+        try:
+            indexes.create_indexes(connection, indexes.missing_indexes(connection))
+            generator = random.Random(3)
+
+            for count in (10, 100, 1000, 10000):
+                airport_ids = generator.sample(range(1, args.airports + 1), min(count, args.airports))
+                assert _one_airport_at_a_time(connection, airport_ids) == query.load_airport_details(connection,
+                                                                                                     airport_ids)
+                repeat = max(1, 2000 // count)
+                per_airport = scratch.best_seconds(lambda: _one_airport_at_a_time(connection, airport_ids), repeat)
+                batched = scratch.best_seconds(lambda: query.load_airport_details(connection, airport_ids), repeat)
+                print(f'N={len(airport_ids):>5}  per airport {per_airport * 1e3:8.2f} ms  '
+                      f'batched {batched * 1e3:7.2f} ms  ({per_airport / batched:.1f}x)')
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import random
+import sqlite3
+import time
+import p2app.engine.indexes as indexes
+import p2app.engine.query as query
+from p2app import Engine
+from p2app.events import CloseDatabaseEvent, OpenDatabaseEvent, StartAirportSearchEvent
+from benchmarks import scratch
+
+
+def _mean_seconds(search, keys) -> float:
+    start = time.perf_counter()
+
+    for key in keys:
+        search(key)
+
+    return (time.perf_counter() - start) / len(keys)
+
+
+def _print_time(label, what, microseconds) -> None:
+    print(f'{label:11} {what:36} {microseconds:9,.0f} us')
+
+
+def _run(label, path, airports, lookups) -> None:
+    # Only the first 17,576 airports have an IATA code
+    connection = sqlite3.connect(path)
+    generator = random.Random(2)
+    airport_ids = [generator.randint(1, min(airports, 26 ** 3)) for _ in range(lookups)]
+    rows = [connection.execute('SELECT airport_ident, iata_code, gps_code FROM airport WHERE airport_id = ?;',
+                               (airport_id,)).fetchone() for airport_id in airport_ids]
+
+    try:
+        for column, position in (('airport_ident', 0), ('iata_code', 1), ('gps_code', 2)):
+            seconds = _mean_seconds(lambda key: list(query.airport_search(connection, **{column: key})),
+                                    [row[position] for row in rows])
+            _print_time(label, f'query by {column}', seconds * 1e6)
+    finally:
+        connection.close()
+
+    # The search cache is turned off so that every event runs its query
+    engine = Engine(search_cache_bytes = 0)
+    list(engine.process_event(OpenDatabaseEvent(path)))
+
+    seconds = _mean_seconds(lambda key: list(engine.process_event(StartAirportSearchEvent(iata_code = key))),
+                            [row[1] for row in rows])
+    _print_time(label, 'engine event by iata_code', seconds * 1e6)
+
+    seconds = _mean_seconds(
+        lambda country_id: list(engine.process_event(StartAirportSearchEvent(country_id = country_id,
+                                                                             airport_type = 'heliport'))),
+        list(range(1, 21)))
+    _print_time(label, 'engine event by country_id and type', seconds * 1e6)
+
+    list(engine.process_event(CloseDatabaseEvent()))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times airport lookups by code, and an airport search by country and type, before '
+                      'and after the recommended indexes are created.')
+    parser.add_argument('--airports', type = int, default = 80000, help = 'airports in the scratch database')
+    parser.add_argument('--lookups', type = int, default = 2000, help = 'random airports looked up by each code')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        path = scratch.airport_database(directory / 'airports.db', args.airports)
+        _run('no indexes', path, args.airports, args.lookups)
+
+        connection = sqlite3.connect(path)
+
+        try:
+            indexes.create_indexes(connection, indexes.missing_indexes(connection))
+        finally:
+            connection.close()
+
+        _run('indexed', path, args.airports, args.lookups)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import csv
+import itertools
+import sqlite3
+import time
+import p2app.engine.importer as importer
+from benchmarks import scratch
+
+
+_RUNWAY_INSERT = f'INSERT INTO runway VALUES ({", ".join("?" * 19)});'
+
+
+def _empty_database(path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.executescript(scratch.SCHEMA.read_text())
+    return connection
+
+
+def _per_row_commit(connection, rows) -> None:
+    for row in rows:
+        connection.execute(_RUNWAY_INSERT, row)
+        connection.commit()
+
+
+def _one_executemany(connection, rows) -> None:
+    with connection:
+        connection.executemany(_RUNWAY_INSERT, rows)
+
+
+def _relaxed_executemany(connection, rows) -> None:
+    importer._relax_pragmas(connection)
+    _one_executemany(connection, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times a full import of made-up OurAirports files, then three ways of inserting '
+                      'the same already parsed runway rows.')
+    parser.add_argument('--airports', type = int, default = 1000000,
+                        help = 'airports in the files; the other files are sized from it')
+    parser.add_argument('--rows', type = int, default = 20000, help = 'runway rows inserted by each way')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        csv_directory = directory / 'csv'
+        csv_directory.mkdir()
+        scratch.ourairports_csvs(csv_directory, args.airports)
+
+        connection = _empty_database(directory / 'import.db')
+
+        try:
+            start = time.perf_counter()
+            results = importer.import_directory(connection, csv_directory,
+                                                progress = lambda result: print(importer.format_result(result)))
+            total = importer.ImportResult('total', sum(result.rows for result in results),
+                                          time.perf_counter() - start)
+            print(importer.format_result(total))
+        finally:
+            connection.close()
+
+        with open(csv_directory / 'runways.csv', newline = '', encoding = 'utf-8') as csv_file:
+            records = itertools.islice(csv.DictReader(csv_file), args.rows)
+            rows = [importer._runway_row(record, {}) for record in records]
+
+        print()
+
+        for label, insert in (('per-row commit', _per_row_commit), ('one executemany', _one_executemany),
+                              ('executemany, relaxed pragmas', _relaxed_executemany)):
+            connection = _empty_database(directory / f'{insert.__name__}.db')
+
+            try:
+                start = time.perf_counter()
+                insert(connection, rows)
+                seconds = time.perf_counter() - start
+            finally:
+                connection.close()
+
+            print(f'{label:30} {len(rows) / seconds:10,.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
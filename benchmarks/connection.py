@@ -0,0 +1,62 @@
+import argparse
+import random
+import sqlite3
+import time
+import p2app.engine.query as query
+from benchmarks import scratch
+
+
+def _per_call_connection(path, region_ids) -> float:
+    """
+    Loads each region through a connection of its own, the way every query
+    function used to connect and close again
+    """
+    start = time.perf_counter()
+
+    for region_id in region_ids:
+        connection = sqlite3.connect(path)
+        connection.execute('PRAGMA foreign_keys = ON;')
+        query.load_region(connection, region_id)
+        connection.close()
+
+    return time.perf_counter() - start
+
+
+def _shared_connection(path, region_ids) -> float:
+    """
+    Loads each region through one connection, the way the engine does now
+    """
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA foreign_keys = ON;')
+
+    try:
+        start = time.perf_counter()
+
+        for region_id in region_ids:
+            query.load_region(connection, region_id)
+
+        return time.perf_counter() - start
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times load_region by primary key through a connection per call and through one '
+                      'shared connection.')
+    parser.add_argument('--regions', type = int, default = 200000, help = 'regions in the scratch database')
+    parser.add_argument('--calls', type = int, default = 5000, help = 'regions loaded by each approach')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        path = scratch.region_database(directory / 'regions.db', args.regions)
+        generator = random.Random(1)
+        region_ids = [generator.randint(1, args.regions) for _ in range(args.calls)]
+
+        for label, run in (('connection per call', _per_call_connection), ('shared connection', _shared_connection)):
+            seconds = run(path, region_ids)
+            print(f'{label:20} {seconds / len(region_ids) * 1e6:7.1f} us per load_region')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import timeit
+from p2app import Engine
+from p2app.events import *
+
+
+def _stub(connections, event):
+    return None
+
+
+def _streaming_stub(connections, event):
+    yield None
+
+
+_EVENTS = (
+    QuitInitiatedEvent(), CloseDatabaseEvent(), AnalyzeIndexesEvent(),
+    LoadContinentEvent(1), LoadCountryEvent(1), LoadRegionEvent(1), SaveRegionEvent(None),
+    LoadAirportDetailsEvent([1]), StartRadiusSearchEvent('airport', 0, 0, 1),
+    StartRegionSearchEvent('US-CA', None, None))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times routing events through the engine, with every handler replaced by a stub so '
+                      'that only the routing is measured.')
+    parser.add_argument('--number', type = int, default = 100000, help = 'times each event is processed')
+    args = parser.parse_args()
+
+    engine = Engine()
+    handlers = engine.dispatcher._handlers
+
+    # No database is open, so the stubs are marked as not needing one
+    for event_type, handler in handlers.items():
+        handlers[event_type] = handler._replace(function = _streaming_stub if handler.streams else _stub,
+                                                needs_database = False)
+
+    engine.dispatcher._resolved.clear()
+
+    for event in _EVENTS:
+        seconds = timeit.timeit(lambda: list(engine.process_event(event)), number = args.number) / args.number
+        print(f'{type(event).__name__:26} {seconds * 1e6:6.2f} us per event')
+
+    seconds = timeit.timeit(lambda: engine.dispatcher.handler(LoadRegionEvent), number = args.number) / args.number
+    print(f'{"Dispatcher.handler alone":26} {seconds * 1e9:6.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
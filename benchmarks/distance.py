@@ -0,0 +1,54 @@
+import argparse
+import sqlite3
+import time
+import numpy as np
+from p2app.engine.distance import AirportCoordinates
+from p2app.engine.spatial import great_circle_nm
+from benchmarks import scratch
+
+
+def _time_one_to_many(connection: sqlite3.Connection, coordinates: AirportCoordinates, airport_id: int) -> None:
+    """
+    Times the distances from one airport to every other airport, computed with
+    NumPy and with a pure Python loop over great_circle_nm
+    """
+    rows = connection.execute('SELECT latitude_deg, longitude_deg FROM airport ORDER BY airport_id;').fetchall()
+    latitude, longitude = connection.execute('SELECT latitude_deg, longitude_deg FROM airport WHERE airport_id = ?;',
+                                             (airport_id,)).fetchone()
+
+    start = time.perf_counter()
+    expected = [great_circle_nm(latitude, longitude, other_latitude, other_longitude)
+                for other_latitude, other_longitude in rows]
+    loop_seconds = time.perf_counter() - start
+
+    numpy_seconds = scratch.best_seconds(lambda: coordinates.one_to_many(airport_id))
+    distances = coordinates.one_to_many(airport_id)
+
+    difference = float(np.max(np.abs(distances - np.array(expected)))) if rows else 0.0
+    print(f'one to {len(rows)}: Python loop {loop_seconds * 1000:.1f} ms, '
+          f'NumPy {numpy_seconds * 1000:.1f} ms ({loop_seconds / numpy_seconds:.0f}x), '
+          f'largest difference {difference:.2e} nm')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times the distances from one airport to every airport, computed with NumPy and with a '
+                      'pure Python loop over great_circle_nm.')
+    parser.add_argument('--airports', type = int, default = 80000, help = 'airports in the scratch database')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.airport_database(directory / 'airports.db', args.airports))
+
+        try:
+            start = time.perf_counter()
+            coordinates = AirportCoordinates.load(connection)
+            print(f'Loaded {len(coordinates)} airports in {time.perf_counter() - start:.2f} s')
+
+            _time_one_to_many(connection, coordinates, 1)
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import gc
+import itertools
+import sqlite3
+import tracemalloc
+import p2app.engine.query as query
+from p2app.events import *
+from p2app.views.regions import _SEARCH_PAGE_SIZE
+from benchmarks import scratch
+
+
+class _UnslottedResultEvent:
+    # RegionSearchResultEvent as it was before the event classes had __slots__
+    def __init__(self, region):
+        self._region = region
+
+
+
+def _regions(connection):
+    yield from query.record_cursor(connection, Region).execute('SELECT * FROM region;')
+
+
+def _pages(regions):
+    # Splits the regions into lists of the size of a page of the region search
+    regions = iter(regions)
+
+    while page := list(itertools.islice(regions, _SEARCH_PAGE_SIZE)):
+        yield page
+
+
+def _bytes_per_row(path, hold) -> float:
+    """
+    Reads every region, keeps what hold makes of them, and returns the memory
+    that is still held afterward per region
+    """
+    connection = sqlite3.connect(path)
+
+    try:
+        gc.collect()
+        tracemalloc.start()
+        held = hold(_regions(connection))
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        connection.close()
+
+    rows = sum(len(event.regions()) if hasattr(event, 'regions') else 1 for event in held)
+    return size / rows
+
+
+_LAYOUTS = (
+    ('the values alone', lambda regions: [tuple(region) for region in regions]),
+    ('one event + Region per row, with __dict__', lambda regions: [_UnslottedResultEvent(region) for region in regions]),
+    ('one event + Region per row, slotted', lambda regions: [RegionSearchResultEvent(region) for region in regions]),
+    ('page events of Regions in a list',
+     lambda regions: [RegionSearchPageEvent(page, page[-1][0]) for page in _pages(regions)]),
+    ('page events of RegionBatch columns',
+     lambda regions: [RegionSearchPageEvent(RegionBatch(page), page[-1][0]) for page in _pages(regions)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Measures the memory held per region by the result events of a search that finds '
+                      'every region, for each way the events have been laid out.')
+    parser.add_argument('--regions', type = int, default = 1000000, help = 'regions in the scratch database')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        path = scratch.region_database(directory / 'regions.db', args.regions)
+
+        for label, hold in _LAYOUTS:
+            print(f'{label:42} {_bytes_per_row(path, hold):6.1f} B/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import csv
+import sqlite3
+import tracemalloc
+import p2app.engine.export as export
+from benchmarks import scratch
+
+
+def _peak_bytes(function) -> int:
+    tracemalloc.start()
+
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _fetch_all_then_write(connection, path) -> None:
+    """
+    Exports the runways the way the streaming export replaced: every row is
+    read with fetchall before any is written
+    """
+    rows = connection.execute('SELECT * FROM runway;').fetchall()
+
+    with open(path, 'w', encoding = 'utf-8', newline = '') as output:
+        csv.writer(output).writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times exporting the runway table to each export format, and compares the peak '
+                      'memory of the streaming export with reading every row first.')
+    parser.add_argument('--airports', type = int, default = 1000000,
+                        help = 'airports in the scratch database, which has 1.2 runways per airport')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.airport_database(directory / 'airports.db', args.airports))
+
+        try:
+            for file_name in ('runways.csv', 'runways.csv.gz', 'runways.jsonl', 'runways.jsonl.gz'):
+                path = directory / file_name
+                result = export.export_table(connection, 'runway', path)
+                print(f'{file_name:17} {result.rows / result.seconds:9,.0f} rows/s '
+                      f'{path.stat().st_size / 1e6:8.1f} MB')
+
+            streamed = _peak_bytes(lambda: export.export_table(connection, 'runway', directory / 'streamed.csv'))
+            fetched = _peak_bytes(lambda: _fetch_all_then_write(connection, directory / 'fetched.csv'))
+        finally:
+            connection.close()
+
+    print(f'\npeak memory traced, streaming export  {streamed / 1e6:7.1f} MB')
+    print(f'peak memory traced, fetchall first    {fetched / 1e6:7.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
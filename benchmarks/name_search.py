@@ -0,0 +1,56 @@
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+import p2app.engine.fulltext as fulltext
+import p2app.engine.indexes as indexes
+import p2app.engine.query as query
+from p2app.events import MATCH_FULL_TEXT, MATCH_PREFIX
+from benchmarks import scratch
+
+
+def _median_seconds(search, words) -> float:
+    seconds = []
+
+    for word in words:
+        start = time.perf_counter()
+        search(word)
+        seconds.append(time.perf_counter() - start)
+
+    return statistics.median(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times region name searches by prefix, by full-text match and by a LIKE scan.')
+    parser.add_argument('--regions', type = int, default = 1000000, help = 'regions in the scratch database')
+    parser.add_argument('--searches', type = int, default = 8, help = 'words searched for by each approach')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.region_database(directory / 'regions.db', args.regions))
+
+        try:
+            indexes.create_indexes(connection, indexes.missing_indexes(connection))
+            fulltext.enable_full_text(connection)
+
+            generator = random.Random(1)
+            words = [connection.execute('SELECT name FROM region WHERE region_id = ?;',
+                                        (generator.randint(1, args.regions),)).fetchone()[0].split()[0]
+                     for _ in range(args.searches)]
+
+            searches = (
+                ('prefix', lambda word: list(query.region_search(connection, None, None, word, MATCH_PREFIX))),
+                ('full-text', lambda word: list(query.region_search(connection, None, None, word, MATCH_FULL_TEXT))),
+                ("LIKE '%...%' scan", lambda word: connection.execute(
+                    'SELECT * FROM region WHERE name LIKE ?;', (f'%{word}%',)).fetchall()))
+
+            for label, search in searches:
+                print(f'{label:18} median {_median_seconds(search, words) * 1e3:7.1f} ms')
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import sqlite3
+import p2app.engine.query as query
+from p2app.events import MATCH_PREFIX, Region
+from benchmarks import scratch
+
+
+_SELECT_REGIONS = 'SELECT * FROM region;'
+
+
+def _count(rows) -> int:
+    return sum(len(batch) for batch in query.fetch_batches(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times the ways of reading regions as records, then the region search, page and '
+                      'load functions that read them.')
+    parser.add_argument('--regions', type = int, default = 900000, help = 'regions in the scratch database')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'runs of each, of which the fastest counts')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.region_database(directory / 'regions.db', args.regions, 'Region '))
+
+        def plain_tuples():
+            return _count(connection.execute(_SELECT_REGIONS))
+
+        def constructor_per_row():
+            regions = 0
+
+            for rows in query.fetch_batches(connection.execute(_SELECT_REGIONS)):
+                for row in rows:
+                    Region(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
+                    regions += 1
+
+            return regions
+
+        def make_per_row():
+            cursor = connection.cursor()
+            cursor.row_factory = lambda cursor, row: Region._make(row)
+            return _count(cursor.execute(_SELECT_REGIONS))
+
+        def record_cursor():
+            return _count(query.record_cursor(connection, Region).execute(_SELECT_REGIONS))
+
+        def region_search():
+            return sum(1 for _ in query.region_search(connection, None, None, 'Region', MATCH_PREFIX))
+
+        def region_search_pages():
+            regions = 0
+            page_cursor = None
+
+            while regions < 300000:
+                page, page_cursor = query.region_search_page(connection, None, None, 'Region', MATCH_PREFIX,
+                                                             page_cursor, 1000)
+                regions += len(page)
+
+                if page_cursor is None:
+                    break
+
+            return regions
+
+        def load_region():
+            for region_id in range(1, min(args.regions, 20000) + 1):
+                query.load_region(connection, region_id)
+
+            return min(args.regions, 20000)
+
+        try:
+            for run in (plain_tuples, constructor_per_row, make_per_row, record_cursor,
+                        region_search, region_search_pages, load_region):
+                regions = run()
+                seconds = scratch.best_seconds(run, args.repeat)
+                print(f'{run.__name__:20} {regions / seconds / 1e3:7.0f} k rows/s')
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
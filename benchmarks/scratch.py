@@ -0,0 +1,214 @@
+import contextlib
+import csv
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+import p2app.engine.importer as importer
+
+
+SCHEMA = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+# Every scratch database is generated from this seed, so each run of a
+# benchmark sees the same rows
+_SEED = 1
+
+_SYLLABLES = ('ka', 'lo', 'ren', 'vi', 'sa', 'mor', 'tel', 'an', 'bri', 'dun', 'ho', 'el',
+              'ma', 'nor', 'pe', 'ri', 'sto', 'ul', 'wes', 'ya', 'zen', 'gar', 'fi', 'cot')
+
+_CONTINENT_CODES = ('AF', 'AN', 'AS', 'EU', 'NA', 'OC', 'SA')
+
+# The sizes of the other OurAirports files, relative to the number of airports,
+# roughly as they are in the real data
+_COUNTRIES = 250
+_REGIONS = 4000
+_RUNWAYS_PER_AIRPORT = 1.2
+_FREQUENCIES_PER_AIRPORT = 0.8
+_NAVIGATION_AIDS_PER_AIRPORT = 0.2
+
+
+@contextlib.contextmanager
+def scratch_directory():
+    """
+    Yields the path of a temporary directory for the databases and files a
+    benchmark builds, which is removed with everything in it afterward
+    """
+    with tempfile.TemporaryDirectory(prefix = 'p2app-benchmark-') as directory:
+        yield Path(directory)
+
+
+def best_seconds(function, repeat: int = 5) -> float:
+    """
+    Calls function repeat times and returns the fastest call's time in seconds
+    """
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def place_name(generator: random.Random) -> str:
+    """
+    Returns a made-up place name of one or two words
+    """
+    words = []
+
+    for _ in range(generator.choice((1, 2, 2))):
+        word = ''.join(generator.choice(_SYLLABLES) for _ in range(generator.randint(2, 3)))
+        words.append(word.capitalize())
+
+    return ' '.join(words)
+
+
+def region_database(path, regions: int, name_prefix: str = '') -> Path:
+    """
+    Creates a database at the given path from schema.sql, holding two
+    continents, two countries and the given number of regions with made-up
+    names, each starting with name_prefix
+    """
+    generator = random.Random(_SEED)
+    connection = sqlite3.connect(path)
+
+    try:
+        connection.executescript(SCHEMA.read_text())
+
+        with connection:
+            connection.executemany('INSERT INTO continent VALUES (?, ?, ?);',
+                                   [(1, 'NA', 'North America'), (2, 'EU', 'Europe')])
+            connection.executemany('INSERT INTO country VALUES (?, ?, ?, ?, ?, ?);',
+                                   [(1, 'US', 'United States', 1, 'https://en.wikipedia.org/wiki/United_States', None),
+                                    (2, 'FR', 'France', 2, 'https://en.wikipedia.org/wiki/France', None)])
+            connection.executemany(
+                'INSERT INTO region VALUES (?, ?, ?, ?, ?, ?, ?, ?);',
+                ((region_id, f'R-{region_id}', f'L{region_id % 100}', name_prefix + place_name(generator),
+                  region_id % 2 + 1, region_id % 2 + 1, None, None)
+                 for region_id in range(1, regions + 1)))
+    finally:
+        connection.close()
+
+    return Path(path)
+
+
+def _iata_code(number: int) -> str:
+    """
+    Returns the number'th of the 17,576 three letter codes, or '' after the last
+    """
+    if number >= 26 ** 3:
+        return ''
+
+    letters = string.ascii_uppercase
+    return letters[number // 676] + letters[number // 26 % 26] + letters[number % 26]
+
+
+def _write_csv(path: Path, header: list[str], rows) -> None:
+    with open(path, 'w', encoding = 'utf-8', newline = '') as output:
+        writer = csv.writer(output)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def ourairports_csvs(directory, airports: int) -> Path:
+    """
+    Writes made-up countries.csv, regions.csv, airports.csv, runways.csv,
+    airport-frequencies.csv and navaids.csv files in the OurAirports format to
+    the given directory, for the given number of airports
+    """
+    generator = random.Random(_SEED)
+    directory = Path(directory)
+
+    def country_code(number):
+        return f'C{number % _COUNTRIES + 1:03d}'
+
+    _write_csv(directory / 'countries.csv', ['id', 'code', 'name', 'continent', 'wikipedia_link', 'keywords'],
+               ((number, f'C{number:03d}', place_name(generator), _CONTINENT_CODES[number % 7],
+                 f'https://en.wikipedia.org/wiki/Country_{number}', '')
+                for number in range(1, _COUNTRIES + 1)))
+
+    regions = [(number, f'{country_code(number)}-{number}', str(number), place_name(generator),
+                _CONTINENT_CODES[(number % _COUNTRIES + 1) % 7], country_code(number), '', '')
+               for number in range(1, _REGIONS + 1)]
+
+    _write_csv(directory / 'regions.csv',
+               ['id', 'code', 'local_code', 'name', 'continent', 'iso_country', 'wikipedia_link', 'keywords'],
+               regions)
+
+    def airport_rows():
+        for number in range(1, airports + 1):
+            region = regions[number % _REGIONS]
+            yield (number, f'A{number}', generator.choice(('small_airport', 'small_airport', 'heliport', 'closed')),
+                   f'{place_name(generator)} Airport',
+                   f'{generator.uniform(-85, 85):.6f}', f'{generator.uniform(-180, 180):.6f}',
+                   generator.randint(0, 9000), region[4], region[5], region[1], place_name(generator),
+                   'no', f'G{number}', _iata_code(number - 1), f'L{number}', '', '', '')
+
+    _write_csv(directory / 'airports.csv',
+               ['id', 'ident', 'type', 'name', 'latitude_deg', 'longitude_deg', 'elevation_ft', 'continent',
+                'iso_country', 'iso_region', 'municipality', 'scheduled_service', 'gps_code', 'iata_code',
+                'local_code', 'home_link', 'wikipedia_link', 'keywords'],
+               airport_rows())
+
+    def runway_rows():
+        for number in range(1, int(airports * _RUNWAYS_PER_AIRPORT) + 1):
+            airport = generator.randint(1, airports)
+            yield (number, airport, f'A{airport}', 3000, 60, 'ASP', 1, 0,
+                   '09', '1.0', '2.0', 100, '90', '', '27', '1.1', '2.1', 100, '270', '')
+
+    _write_csv(directory / 'runways.csv',
+               ['id', 'airport_ref', 'airport_ident', 'length_ft', 'width_ft', 'surface', 'lighted', 'closed',
+                'le_ident', 'le_latitude_deg', 'le_longitude_deg', 'le_elevation_ft', 'le_heading_degT',
+                'le_displaced_threshold_ft', 'he_ident', 'he_latitude_deg', 'he_longitude_deg',
+                'he_elevation_ft', 'he_heading_degT', 'he_displaced_threshold_ft'],
+               runway_rows())
+
+    def frequency_rows():
+        for number in range(1, int(airports * _FREQUENCIES_PER_AIRPORT) + 1):
+            airport = generator.randint(1, airports)
+            yield number, airport, f'A{airport}', 'TWR', 'Tower', '118.1'
+
+    _write_csv(directory / 'airport-frequencies.csv',
+               ['id', 'airport_ref', 'airport_ident', 'type', 'description', 'frequency_mhz'],
+               frequency_rows())
+
+    def navigation_aid_rows():
+        for number in range(1, int(airports * _NAVIGATION_AIDS_PER_AIRPORT) + 1):
+            airport = generator.randint(1, airports)
+            yield (number, f'N{number}', f'N{number}', f'{place_name(generator)} VOR', 'VOR', 113000,
+                   f'{generator.uniform(-85, 85):.6f}', f'{generator.uniform(-180, 180):.6f}', '', 'C001',
+                   '', '', '', '', '', '', '1.5', 'BOTH', 'HIGH', f'A{airport}' if number % 2 else '')
+
+    _write_csv(directory / 'navaids.csv',
+               ['id', 'filename', 'ident', 'name', 'type', 'frequency_khz', 'latitude_deg', 'longitude_deg',
+                'elevation_ft', 'iso_country', 'dme_frequency_khz', 'dme_channel', 'dme_latitude_deg',
+                'dme_longitude_deg', 'dme_elevation_ft', 'slaved_variation_deg', 'magnetic_variation_deg',
+                'usageType', 'power', 'associated_airport'],
+               navigation_aid_rows())
+
+    return directory
+
+
+def airport_database(path, airports: int) -> Path:
+    """
+    Creates a database at the given path from schema.sql and imports made-up
+    OurAirports files for the given number of airports into it, with no
+    secondary indexes
+    """
+    path = Path(path)
+    csv_directory = path.with_name(path.stem + '-csv')
+    csv_directory.mkdir()
+    ourairports_csvs(csv_directory, airports)
+
+    connection = sqlite3.connect(path)
+
+    try:
+        connection.executescript(SCHEMA.read_text())
+        importer.import_directory(connection, csv_directory)
+    finally:
+        connection.close()
+
+    return path
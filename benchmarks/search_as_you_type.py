@@ -0,0 +1,104 @@
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+import p2app.engine.indexes as indexes
+import p2app.engine.query as query
+from p2app.events import MATCH_PREFIX
+from p2app.views.incremental import DEFAULT_IDLE_MILLISECONDS
+from benchmarks import scratch
+
+
+_TYPING_SPEEDS_MILLISECONDS = (120, 200, 300)
+_IDLE_MILLISECONDS = (150, DEFAULT_IDLE_MILLISECONDS, 500)
+
+# How often, and for how long, a typist pauses after finishing a word
+_PAUSE_CHANCE = 0.3
+_PAUSE_MILLISECONDS = 400
+
+
+def _keystrokes(generator, text, mean_milliseconds) -> list[tuple[float, str]]:
+    """
+    Returns the time of each keystroke typing the text, with Gaussian gaps
+    between keys and an occasional pause between words, along with the text
+    typed so far
+    """
+    now = 0
+    keystrokes = []
+
+    for length, character in enumerate(text, start = 1):
+        now += max(40, generator.gauss(mean_milliseconds, mean_milliseconds / 3))
+
+        if character == ' ' and generator.random() < _PAUSE_CHANCE:
+            now += _PAUSE_MILLISECONDS
+
+        keystrokes.append((now, text[:length]))
+
+    return keystrokes
+
+
+def _searches(keystrokes, idle_milliseconds) -> int:
+    """
+    Returns the number of searches run while typing if a search runs whenever
+    typing pauses for idle_milliseconds, and not again for the same text
+    """
+    searches = 0
+    last_searched = None
+
+    for index, (now, text) in enumerate(keystrokes):
+        next_keystroke = keystrokes[index + 1][0] if index + 1 < len(keystrokes) else float('inf')
+        text = text.strip()
+
+        if next_keystroke - now >= idle_milliseconds and text and text != last_searched:
+            searches += 1
+            last_searched = text
+
+    return searches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Counts the searches run per region name typed, searching on every keystroke and '
+                      'after an idle pause, then times the first page of a prefix search.')
+    parser.add_argument('--regions', type = int, default = 1000000, help = 'regions in the scratch database')
+    parser.add_argument('--names', type = int, default = 200, help = 'region names typed')
+    args = parser.parse_args()
+
+    generator = random.Random(3)
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.region_database(directory / 'regions.db', args.regions))
+
+        try:
+            indexes.create_indexes(connection, indexes.missing_indexes(connection))
+            names = [name for (name,) in connection.execute(
+                "SELECT name FROM region WHERE name LIKE '% %' AND region_id % 97 = 0 LIMIT ?;", (args.names,))]
+
+            header = ''.join(f'   idle {idle} ms' for idle in _IDLE_MILLISECONDS)
+            print(f'typing speed   per keystroke{header}')
+
+            for mean_milliseconds in _TYPING_SPEEDS_MILLISECONDS:
+                typed = [_keystrokes(generator, name, mean_milliseconds) for name in names]
+                counts = [statistics.mean(_searches(keystrokes, idle) for keystrokes in typed)
+                          for idle in _IDLE_MILLISECONDS]
+                print(f'{mean_milliseconds:4} ms/key   {statistics.mean(map(len, typed)):13.1f}'
+                      + ''.join(f'{count:15.2f}' for count in counts))
+
+            seconds = []
+
+            for name in names[:100]:
+                for length in (1, 3, len(name)):
+                    start = time.perf_counter()
+                    query.region_search_page(connection, None, None, name[:length], MATCH_PREFIX, None, 100)
+                    seconds.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+    seconds.sort()
+    print(f'\nfirst page of a prefix search: median {statistics.median(seconds) * 1e3:.2f} ms, '
+          f'p95 {seconds[int(len(seconds) * 0.95)] * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
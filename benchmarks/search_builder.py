@@ -0,0 +1,48 @@
+import argparse
+import random
+import sqlite3
+import time
+import p2app.engine.query as query
+from benchmarks import scratch
+
+
+# A search by region code written out as one fixed statement, the way each
+# branch of region_search used to be
+_FIXED_REGION_CODE_SEARCH = """SELECT region_id, region_code, local_code, name, continent_id, country_id,
+wikipedia_link, keywords FROM region WHERE region_code = ?;"""
+
+
+def _time_searches(search, codes) -> float:
+    start = time.perf_counter()
+
+    for code in codes:
+        list(search(code))
+
+    return (time.perf_counter() - start) / len(codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times region searches by region code built from criteria against the same search '
+                      'written as one fixed statement.')
+    parser.add_argument('--regions', type = int, default = 200000, help = 'regions in the scratch database')
+    parser.add_argument('--searches', type = int, default = 3000, help = 'searches run by each approach')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.region_database(directory / 'regions.db', args.regions))
+        generator = random.Random(1)
+        codes = [f'R-{generator.randint(1, args.regions)}' for _ in range(args.searches)]
+
+        try:
+            fixed = _time_searches(lambda code: connection.execute(_FIXED_REGION_CODE_SEARCH, (code,)), codes)
+            built = _time_searches(lambda code: query.region_search(connection, code, None, None), codes)
+        finally:
+            connection.close()
+
+    for label, seconds in (('fixed statement', fixed), ('built from criteria', built)):
+        print(f'{label:20} {seconds * 1e6:6.1f} us per search')
+
+
+if __name__ == '__main__':
+    main()
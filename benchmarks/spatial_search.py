@@ -0,0 +1,77 @@
+import argparse
+import random
+import sqlite3
+import time
+import p2app.engine.spatial as spatial
+from benchmarks import scratch
+
+
+_RADII_NM = (50, 200)
+
+
+def _python_scan(connection, latitude, longitude, radius_nm) -> list[tuple]:
+    """
+    Finds the airports within the radius by working out the distance to every
+    airport in Python, with no help from SQLite
+    """
+    found = []
+
+    for row in connection.execute('SELECT * FROM airport;'):
+        airport = spatial.SPATIAL_RECORDS['airport'](*row)
+        distance = spatial.great_circle_nm(latitude, longitude, airport.latitude_deg, airport.longitude_deg)
+
+        if distance <= radius_nm:
+            found.append((airport, distance))
+
+    return found
+
+
+def _mean_seconds(search, points) -> float:
+    start = time.perf_counter()
+
+    for latitude, longitude in points:
+        search(latitude, longitude)
+
+    return (time.perf_counter() - start) / len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times radius searches for airports by a scan in Python, by radius_search without '
+                      'an R*Tree, and by radius_search with one.')
+    parser.add_argument('--airports', type = int, default = 80000, help = 'airports in the scratch database')
+    parser.add_argument('--searches', type = int, default = 20, help = 'random centers searched around')
+    args = parser.parse_args()
+
+    generator = random.Random(7)
+    points = [(generator.uniform(-80, 80), generator.uniform(-180, 180)) for _ in range(args.searches)]
+
+    with scratch.scratch_directory() as directory:
+        connection = sqlite3.connect(scratch.airport_database(directory / 'airports.db', args.airports))
+
+        try:
+            seconds = {}
+
+            for radius_nm in _RADII_NM:
+                seconds['python scan', radius_nm] = _mean_seconds(
+                    lambda latitude, longitude: _python_scan(connection, latitude, longitude, radius_nm), points[:3])
+                seconds['SQL box scan', radius_nm] = _mean_seconds(
+                    lambda latitude, longitude: spatial.radius_search(connection, 'airport', latitude, longitude,
+                                                                      radius_nm), points)
+
+            spatial.enable_spatial(connection)
+
+            for radius_nm in _RADII_NM:
+                seconds['R*Tree', radius_nm] = _mean_seconds(
+                    lambda latitude, longitude: spatial.radius_search(connection, 'airport', latitude, longitude,
+                                                                      radius_nm), points)
+        finally:
+            connection.close()
+
+    for radius_nm in _RADII_NM:
+        for label in ('python scan', 'SQL box scan', 'R*Tree'):
+            print(f'{radius_nm:4} nm  {label:13} {seconds[label, radius_nm] * 1e3:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
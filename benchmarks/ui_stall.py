@@ -0,0 +1,115 @@
+import argparse
+import time
+import tkinter
+from p2app import Engine, EventBus
+from p2app.events import *
+from benchmarks import scratch
+
+
+# How often the stand-in for the rest of the UI asks for a turn of the event loop
+_HEARTBEAT_MILLISECONDS = 5
+
+# How often MainView checks an asynchronous bus for events, as it does
+_ENGINE_POLL_MILLISECONDS = 15
+
+
+class _View:
+    def __init__(self):
+        self.events = 0
+        self.finished = False
+
+
+    def handle_event(self, event):
+        self.events += 1
+
+        if isinstance(event, RegionLoadedEvent):
+            self.finished = True
+
+
+
+def _stalls(path, asynchronous, search) -> tuple[float, list[float]]:
+    """
+    Runs a search while a heartbeat asks Tcl's event loop for a turn every
+    _HEARTBEAT_MILLISECONDS, and returns how long the search took and how far
+    each heartbeat ran late. Tk cannot start here, so the loop is Tcl's, which
+    runs after() callbacks the same way.
+    """
+    tcl = tkinter.Tcl()
+    bus = EventBus(asynchronous = asynchronous)
+    view = _View()
+    bus.register_engine(Engine())
+    bus.register_view(view)
+    beats = []
+
+    def heartbeat():
+        beats.append(time.perf_counter())
+        tcl.after(_HEARTBEAT_MILLISECONDS, heartbeat)
+
+    def deliver_engine_events():
+        # As MainView._deliver_engine_events
+        events_waiting = bus.deliver_events()
+
+        if bus.is_running():
+            tcl.after(1 if events_waiting else _ENGINE_POLL_MILLISECONDS, deliver_engine_events)
+
+    def start_search():
+        # The region loaded after the search tells when its last result was delivered
+        bus.initiate_event(search)
+        bus.initiate_event(LoadRegionEvent(1))
+
+    bus.start()
+
+    try:
+        bus.initiate_event(OpenDatabaseEvent(path))
+
+        if asynchronous:
+            deliver_engine_events()
+
+        while view.events == 0:
+            tcl.dooneevent()
+
+        start = time.perf_counter()
+        heartbeat()
+        tcl.after(_HEARTBEAT_MILLISECONDS, start_search)
+
+        while not view.finished:
+            tcl.dooneevent()
+
+        seconds = time.perf_counter() - start
+        beat_count = len(beats)
+
+        # The heartbeat after the search ends shows how late the loop got its turn back
+        while len(beats) == beat_count:
+            tcl.dooneevent()
+    finally:
+        bus.stop()
+
+    return seconds, [(later - earlier) * 1000 - _HEARTBEAT_MILLISECONDS for earlier, later in zip(beats, beats[1:])]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Measures how long the Tk thread stalls while a search runs, with the engine on the '
+                      'Tk thread and on its worker thread.')
+    parser.add_argument('--regions', type = int, default = 900000, help = 'regions in the scratch database')
+    args = parser.parse_args()
+
+    searches = (
+        ('page of a search scanning every region', LoadRegionSearchPageEvent(None, 'X', None, MATCH_EXACT)),
+        ('search streaming every region', StartRegionSearchEvent(None, None, 'Region', MATCH_PREFIX)))
+
+    with scratch.scratch_directory() as directory:
+        path = scratch.region_database(directory / 'regions.db', args.regions, 'Region ')
+
+        for label, search in searches:
+            print(label)
+
+            for asynchronous in (False, True):
+                seconds, stalls = _stalls(path, asynchronous, search)
+                stalls.sort()
+                print(f'  {"worker thread" if asynchronous else "Tk thread    "} {seconds:6.2f} s in all, '
+                      f'worst stall {stalls[-1]:7.1f} ms, 99th percentile {stalls[int(len(stalls) * 0.99)]:6.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
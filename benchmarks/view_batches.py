@@ -0,0 +1,147 @@
+import argparse
+import itertools
+import sqlite3
+import time
+import tkinter
+from p2app import Engine
+from p2app.events import *
+from p2app.views.countries import _CountriesSearchView, _SEARCH_PAGE_SIZE
+from p2app.views.event_handling import EventHandler
+from p2app.views.events import ClearCountriesSearchListEvent
+from benchmarks import scratch
+
+
+# Tk cannot start without a display, so the search list is a stand-in whose
+# insert makes the one call into Tcl that Listbox.insert makes, with the same
+# arguments, to a proc that keeps the items
+_tcl = tkinter.Tcl()
+_tcl.eval('proc listbox {operation index args} { global items; lappend items {*}$args; return {} }')
+_names = itertools.count()
+
+
+class _Listbox:
+    def __init__(self):
+        self.calls = 0
+
+
+    def insert(self, index, *elements):
+        self.calls += 1
+        _tcl.call('listbox', 'insert', index, *elements)
+
+
+    def delete(self, first, last = None):
+        _tcl.eval('set items {}')
+
+
+
+class _Widget:
+    def __init__(self, master = None):
+        self.master = master
+        self.children = {}
+        self._name = f'!widget{next(_names)}'
+
+        if master is not None:
+            master.children[self._name] = self
+
+
+
+class _Root(_Widget, EventHandler):
+    def __init__(self):
+        super().__init__(None)
+        self.search = None
+
+
+
+class _SearchView(_Widget, EventHandler):
+    # The country search view's event handling, over the stand-in list
+    subscribed_events = _CountriesSearchView.subscribed_events
+    on_event = _CountriesSearchView.on_event
+    _add_search_results = _CountriesSearchView._add_search_results
+
+
+    def __init__(self, master):
+        super().__init__(master)
+        self._search_list = _Listbox()
+        self._search_country_ids = []
+        self._next_page_cursor = None
+        self._edit_button = {}
+        self._load_more_button = {}
+
+
+
+class _RowByRowSearchView(_SearchView):
+    # The country search view as it was before pages were added with one call
+    def _add_search_results(self, countries):
+        for country in countries:
+            self._search_list.insert(tkinter.END, f'{country.country_code} - {country.name}')
+            self._search_country_ids.append(country.country_id)
+
+
+
+def _country_database(path, countries: int):
+    scratch.region_database(path, 0)
+    connection = sqlite3.connect(path)
+
+    try:
+        with connection:
+            connection.executemany(
+                'INSERT INTO country VALUES (?, ?, ?, ?, ?, ?);',
+                ((country_id, f'X{country_id}', f'Country {country_id}', 1, 'https://en.wikipedia.org/', None)
+                 for country_id in range(3, countries + 3)))
+    finally:
+        connection.close()
+
+    return path
+
+
+def _load_every_page(engine) -> list[CountrySearchPageEvent]:
+    # Loads a search that finds every country the way the view does, a page
+    # at a time as if Load More were clicked until there were no more
+    pages = []
+    page_cursor = None
+
+    while True:
+        page, = engine.process_event(LoadCountrySearchPageEvent(None, 'Country', MATCH_PREFIX, page_cursor,
+                                                                _SEARCH_PAGE_SIZE))
+        pages.append(page)
+        page_cursor = page.next_page_cursor()
+
+        if page_cursor is None:
+            return pages
+
+
+def _deliver(root, events) -> tuple[float, int]:
+    root.handle_event(ClearCountriesSearchListEvent())
+    root.search._search_list.calls = 0
+    start = time.perf_counter()
+
+    for event in events:
+        root.handle_event(event)
+
+    return time.perf_counter() - start, root.search._search_list.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Times the country search view adding every page of a search that finds every '
+                      'country, with one call into Tcl per row and with one per page.')
+    parser.add_argument('--countries', type = int, default = 50000, help = 'countries in the scratch database')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        engine = Engine()
+        path = _country_database(directory / 'countries.db', args.countries)
+        list(engine.process_event(OpenDatabaseEvent(path)))
+        pages = _load_every_page(engine)
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    for label, view in (('one insert per row', _RowByRowSearchView), ('one insert per page', _SearchView)):
+        root = _Root()
+        root.search = view(root)
+        seconds = min(_deliver(root, pages)[0] for _ in range(4))
+        calls = _deliver(root, pages)[1]
+        print(f'{label:19} {len(pages):7,} pages {calls:7,} Tcl calls {seconds * 1e3:8.1f} ms in the view')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import queue
+import time
+import tracemalloc
+from p2app import Engine, EventBus
+from p2app.events import *
+from benchmarks import scratch
+
+
+class _View:
+    def __init__(self):
+        self.events = []
+
+
+    def handle_event(self, event):
+        self.events.append(event)
+
+
+
+def _waiting_events(path, stall_seconds, bounded) -> tuple[int, int]:
+    """
+    Starts a search that finds every region while the view delivers nothing
+    for stall_seconds, and returns the events left waiting for the view and
+    the peak memory traced while they piled up
+    """
+    bus = EventBus(asynchronous = True)
+    view = _View()
+    bus.register_engine(Engine())
+    bus.register_view(view)
+
+    if not bounded:
+        bus._view_events = queue.Queue()
+
+    bus.start()
+
+    try:
+        bus.initiate_event(OpenDatabaseEvent(path))
+
+        while not view.events:
+            bus.deliver_events()
+            time.sleep(0.001)
+
+        tracemalloc.start()
+        bus.initiate_event(StartRegionSearchEvent(None, None, 'Region', MATCH_PREFIX))
+        time.sleep(stall_seconds)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return bus._view_events.qsize(), peak
+    finally:
+        bus.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Measures the result events that pile up, and the memory they take, while the view '
+                      'is too busy to deliver any, with the queue to the view unbounded and bounded.')
+    parser.add_argument('--regions', type = int, default = 900000, help = 'regions in the scratch database')
+    parser.add_argument('--stall', type = float, default = 4.0, help = 'seconds the view delivers nothing')
+    args = parser.parse_args()
+
+    with scratch.scratch_directory() as directory:
+        path = scratch.region_database(directory / 'regions.db', args.regions, 'Region ')
+
+        for label, bounded in (('unbounded', False), ('bounded', True)):
+            waiting, peak = _waiting_events(path, args.stall, bounded)
+            print(f'{label:10} {waiting:6,} events waiting  peak {peak / 1e6:6.1f} MB traced')
+
+
+if __name__ == '__main__':
+    main()
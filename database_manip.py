@@ -1,11 +1,19 @@
+import argparse
 from p2app import EventBus
 from p2app import Engine
 from p2app import MainView
 
 
 def main():
-    event_bus = EventBus()
-    engine = Engine()
+    parser = argparse.ArgumentParser(description = 'Edits an OurAirports database.')
+    parser.add_argument('--synchronous', action = 'store_true',
+                        help = 'run the engine on the Tk thread instead of a worker thread')
+    parser.add_argument('--create-indexes', action = 'store_true',
+                        help = 'create the recommended indexes a database is missing when it is opened')
+    args = parser.parse_args()
+
+    event_bus = EventBus(asynchronous = not args.synchronous)
+    engine = Engine(auto_create_indexes = args.create_indexes)
     main_view = MainView(event_bus)
 
     event_bus.register_engine(engine)
@@ -0,0 +1,150 @@
+import sqlite3
+from collections.abc import Iterator
+import p2app.events.airports as airports
+import p2app.engine.query as query
+import p2app.engine.fulltext as fulltext
+import p2app.events.search as match_modes
+import p2app.events.app as app
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
+
+
+def airport_search_data(event: airports.StartAirportSearchEvent | airports.LoadAirportSearchPageEvent) -> tuple:
+    """
+    Retrieves user entered data when searching for an airport.
+    The data is returned in the form of a tuple, (airport ident, IATA code, GPS code,
+    local code, name, type, country id, region id, scheduled service, match mode)
+    """
+    return (event.airport_ident(), event.iata_code(), event.gps_code(), event.local_code(),
+            event.name(), event.airport_type(), event.country_id(), event.region_id(),
+            event.scheduled_service(), event.match_mode())
+
+
+def airport_search_result(connections: ConnectionManager, data: tuple) -> Iterator[airports.AirportSearchResultEvent |
+                                                                                    app.ErrorEvent]:
+    """
+    Yields an AirportSearchResultEvent for each airport found in the search as soon as
+    it is read, so the first results reach the view before the search finishes
+    """
+    if data[9] == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'airport'):
+        yield app.ErrorEvent('Full-text search is not enabled for this database!')
+        return
+
+    search_result = connections.searches.get('airport', data)
+
+    if search_result is None:
+        search_result = connections.searches.collect(
+            'airport', data, query.airport_search(connections.connection(), *data))
+
+    for airport in search_result:
+        yield airports.AirportSearchResultEvent(airport)
+
+
+def airport_search(connections: ConnectionManager, event: airports.StartAirportSearchEvent) -> Iterator[airports.AirportSearchResultEvent |
+                                                                                                  app.ErrorEvent]:
+    """
+    Yields the events of a search for the airport data in the given event
+    """
+    return airport_search_result(connections, airport_search_data(event))
+
+
+def load_airport_search_page(connections: ConnectionManager, event: airports.LoadAirportSearchPageEvent) -> (airports.AirportSearchPageEvent |
+                                                                                                             app.ErrorEvent):
+    """
+    Returns an AirportSearchPageEvent holding one page of the airports found in the
+    search and the cursor that loads the page after it. Pages are served from the
+    search cache when they are there.
+    """
+    if event.match_mode() == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'airport'):
+        return app.ErrorEvent('Full-text search is not enabled for this database!')
+
+    data = airport_search_data(event)
+    airports_found, next_page_cursor = connections.searches.page(
+        'airport', data, event.page_cursor(), event.page_size(),
+        lambda page_cursor, count: query.airport_search_page(connections.connection(), *data, page_cursor, count))
+
+    return airports.AirportSearchPageEvent(airports_found, next_page_cursor)
+
+
+def load_airport(connections: ConnectionManager, event: airports.LoadAirportEvent) -> airports.AirportLoadedEvent | app.ErrorEvent:
+    """
+    Returns an AirportLoadedEvent using the data from the given event in a query
+    """
+    try:
+        airport_id = event.airport_id()
+        airport = connections.records.get('airport', airport_id)
+
+        if airport is None:
+            airport = query.load_airport(connections.connection(), airport_id)
+
+            if airport is None:
+                raise LookupError(f'There is no airport with the id {airport_id}')
+
+            connections.records.put('airport', airport_id, airport)
+
+        return airports.AirportLoadedEvent(airport)
+    except:
+        return app.ErrorEvent('There was an error when loading the airport!')
+
+
+def load_airport_details(connections: ConnectionManager, event: airports.LoadAirportDetailsEvent) -> (airports.AirportDetailsLoadedEvent |
+                                                                                                    app.ErrorEvent):
+    """
+    Returns an AirportDetailsLoadedEvent holding each requested airport with its
+    runways and frequencies, all loaded in a fixed number of queries
+    """
+    try:
+        return airports.AirportDetailsLoadedEvent(
+            query.load_airport_details(connections.connection(), event.airport_ids()))
+    except sqlite3.Error:
+        return app.ErrorEvent('There was an error when loading the airports!')
+
+
+def save_airport(connections: ConnectionManager, event: airports.SaveAirportEvent) -> (airports.AirportSavedEvent |
+                                                                                       airports.SaveAirportFailedEvent):
+    """
+    Given the airport in the event, updates it using a query and returns an AirportSavedEvent
+    """
+    try:
+        airport = query.save_airport(connections.connection(), event.airport())
+        connections.searches.invalidate_table('airport')
+        connections.records.invalidate('airport', airport.airport_id)
+        return airports.AirportSavedEvent(airport)
+
+    except sqlite3.IntegrityError:
+        return save_new_airport_fail()
+
+
+def save_new_airport(connections: ConnectionManager, event: airports.SaveNewAirportEvent) -> (airports.AirportSavedEvent |
+                                                                                              airports.SaveAirportFailedEvent):
+    """
+    Given the airport in the event, inserts it using a query and returns an
+    AirportSavedEvent with the airport_id SQLite assigned
+    """
+    try:
+        airport = query.save_new_airport(connections.connection(), event.airport())
+        connections.searches.invalidate_table('airport')
+        connections.records.invalidate('airport', airport.airport_id)
+        return airports.AirportSavedEvent(airport)
+
+    except sqlite3.IntegrityError:
+        return save_new_airport_fail()
+
+
+def save_new_airport_fail() -> airports.SaveAirportFailedEvent:
+    """
+    Returns a SaveAirportFailedEvent
+    """
+    return airports.SaveAirportFailedEvent("Saving the airport failed!")
+
+
+def register_handlers(dispatcher: Dispatcher) -> None:
+    """
+    Registers the handlers of all airport related events
+    """
+    dispatcher.register(airports.StartAirportSearchEvent, airport_search, streams = True)
+    dispatcher.register(airports.LoadAirportSearchPageEvent, load_airport_search_page)
+    dispatcher.register(airports.LoadAirportEvent, load_airport)
+    dispatcher.register(airports.LoadAirportDetailsEvent, load_airport_details)
+    dispatcher.register(airports.SaveNewAirportEvent, save_new_airport)
+    dispatcher.register(airports.SaveAirportEvent, save_airport)
@@ -1,12 +1,20 @@
+import sqlite3
 import p2app.events.database as db
 import p2app.events.app as app
 import p2app.engine.query as query
+import p2app.engine.indexes as indexes
+import p2app.engine.fulltext as fulltext
+import p2app.engine.export as export
+import p2app.engine.spatial as spatial
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
 
 
-def quit_app() -> app.EndApplicationEvent:
+def quit_app(connections: ConnectionManager, event: app.QuitInitiatedEvent) -> app.EndApplicationEvent:
     """
-    Returns an EndApplicationEvent
+    Closes the open database, if there is one, and returns an EndApplicationEvent
     """
+    connections.close()
     obj = app.EndApplicationEvent()
     return obj
 
@@ -32,19 +40,90 @@ def close_db_file() -> db.DatabaseClosedEvent:
     return obj
 
 
-def application_events(path, event):
+def open_database(connections: ConnectionManager, event: db.OpenDatabaseEvent) -> (db.DatabaseOpenedEvent |
+                                                                                    db.DatabaseOpenFailedEvent):
     """
-    Processes all the application level events
+    Opens the shared connection to the database named in the event, which every
+    query uses until the database is closed, and returns a DatabaseOpenedEvent.
+    Nothing is left open if the file is not a database of airports.
     """
-    if 'QuitInitiatedEvent' in event.__repr__():
-        return quit_app()
+    path = event.path()
 
-    elif 'OpenDatabaseEvent' in event.__repr__():
-        path = event.path()
-        if '.db' in str(path) and query.check_for_tables(path):
-            return open_db_file(path)
-        else:
-            return open_db_file_fail()
+    if '.db' in str(path) and connections.open(path, query.check_for_tables) is not None:
+        return open_db_file(path)
+    else:
+        connections.close()
+        return open_db_file_fail()
 
-    elif 'CloseDatabaseEvent' in event.__repr__():
-        return close_db_file()
+
+def close_database(connections: ConnectionManager, event: db.CloseDatabaseEvent) -> db.DatabaseClosedEvent:
+    """
+    Closes the open database and returns a DatabaseClosedEvent
+    """
+    connections.close()
+    return close_db_file()
+
+
+def index_report(connections: ConnectionManager, event: db.AnalyzeIndexesEvent) -> db.IndexReportEvent:
+    """
+    Returns an IndexReportEvent describing which searches scan a whole table
+    """
+    return db.IndexReportEvent(indexes.index_report(connections.connection()))
+
+
+def apply_recommended_indexes(connections: ConnectionManager, event: db.ApplyRecommendedIndexesEvent) -> db.IndexReportEvent:
+    """
+    Creates the missing recommended indexes and returns an IndexReportEvent
+    describing the searches afterward
+    """
+    connection = connections.connection()
+    created = indexes.create_indexes(connection, indexes.missing_indexes(connection))
+    report = indexes.index_report(connection)
+
+    if created:
+        report = f'Created {", ".join(created)}\n\n{report}'
+
+    return db.IndexReportEvent(report)
+
+
+def enable_full_text(connections: ConnectionManager, event: db.EnableFullTextSearchEvent) -> db.FullTextSearchEnabledEvent:
+    """
+    Creates the full-text search indexes and returns a FullTextSearchEnabledEvent
+    naming the tables that were enabled
+    """
+    return db.FullTextSearchEnabledEvent(fulltext.enable_full_text(connections.connection()))
+
+
+def enable_spatial(connections: ConnectionManager, event: db.EnableSpatialSearchEvent) -> db.SpatialSearchEnabledEvent:
+    """
+    Creates the spatial search indexes and returns a SpatialSearchEnabledEvent
+    naming the tables that were enabled
+    """
+    return db.SpatialSearchEnabledEvent(spatial.enable_spatial(connections.connection()))
+
+
+def export_table(connections: ConnectionManager, event: db.ExportTableEvent) -> db.TableExportedEvent | app.ErrorEvent:
+    """
+    Streams the table named in the event to the file it names and returns a
+    TableExportedEvent
+    """
+    try:
+        result = export.export_table(connections.connection(), event.table(), event.path())
+        return db.TableExportedEvent(result.table, result.path, result.rows)
+    except (sqlite3.Error, OSError, ValueError):
+        return app.ErrorEvent('Exporting the table failed!')
+
+
+def register_handlers(dispatcher: Dispatcher) -> None:
+    """
+    Registers the handlers of the application level events that use the open
+    database. The Engine registers the handlers of opening and closing
+    databases and quitting itself, with close_database and quit_app from this
+    module, since they are handled whether or not a database is open, and
+    opening one also reports its missing indexes.
+    """
+    dispatcher.register(db.AnalyzeIndexesEvent, index_report)
+    dispatcher.register(db.ApplyRecommendedIndexesEvent, apply_recommended_indexes)
+    dispatcher.register(db.EnableFullTextSearchEvent, enable_full_text)
+    dispatcher.register(db.EnableSpatialSearchEvent, enable_spatial)
+    dispatcher.register(db.ExportTableEvent, export_table)
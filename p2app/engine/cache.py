@@ -0,0 +1,247 @@
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+# How many pages of a search are read at once when a page after the first is
+# not cached, so most Load More clicks are served from the cache
+_READ_AHEAD_PAGES = 10
+
+
+class RecordCache:
+    """
+    A size-bounded, least-recently-used cache of loaded records, keyed by
+    (entity, id), e.g. ('region', 42). Users tend to move back and forth between
+    the same few records, so loading them again is served from here instead of
+    the database.
+    """
+
+    def __init__(self, max_records: int = 1024):
+        """Initializes an empty cache holding at most max_records records"""
+        self._max_records = max_records
+        self._records = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, entity: str, record_id: int):
+        """
+        Returns the cached record, or None if it is not cached
+        """
+        key = (entity, record_id)
+        record = self._records.get(key)
+
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._records.move_to_end(key)
+
+        return record
+
+
+    def put(self, entity: str, record_id: int, record) -> None:
+        """
+        Caches a record, evicting the least recently used one if the cache is full
+        """
+        key = (entity, record_id)
+        self._records[key] = record
+        self._records.move_to_end(key)
+
+        while len(self._records) > self._max_records:
+            self._records.popitem(last = False)
+            self.evictions += 1
+
+
+    def invalidate(self, entity: str, record_id: int) -> None:
+        """
+        Removes one record from the cache, if it is there
+        """
+        self._records.pop((entity, record_id), None)
+
+
+    def clear(self) -> None:
+        """
+        Removes every record from the cache
+        """
+        self._records.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: size = {len(self._records)}, hits = {self.hits}, ' + \
+               f'misses = {self.misses}, evictions = {self.evictions}'
+
+
+
+def _record_size(record) -> int:
+    """
+    Returns an estimate, in bytes, of the memory used by one record held in a list
+    """
+    return 8 + sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record)
+
+
+def _result_size(records: list) -> int:
+    """
+    Returns an estimate, in bytes, of the memory used by a list of records
+    """
+    return sys.getsizeof([]) + sum(_record_size(record) for record in records)
+
+
+
+class SearchCache:
+    """
+    A cache of search results keyed by the table searched and the normalized
+    criteria of the search. It holds at most max_bytes of results, evicting the
+    least recently used results first, and never caches a single result larger
+    than max_entry_bytes, so one broad search cannot push out everything else.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_entry_bytes: int | None = None):
+        """Initializes an empty cache with the given memory budget"""
+        self._max_bytes = max_bytes
+        self._max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._results = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, table: str, criteria: tuple) -> list | None:
+        """
+        Returns the cached records for a search, or None if it is not cached
+        """
+        key = (table, criteria)
+        entry = self._results.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._results.move_to_end(key)
+        return entry[0]
+
+
+    def put(self, table: str, criteria: tuple, records: list) -> None:
+        """
+        Caches the records found by a search, if they fit in the budget
+        """
+        size = _result_size(records)
+
+        if size <= self._max_entry_bytes:
+            self._store(table, criteria, records, size)
+
+
+    def page(self, table: str, criteria: tuple, page_cursor, page_size: int,
+             read_pages: Callable[[object, int], tuple[list, object]]) -> tuple[list, object]:
+        """
+        Returns one page of a search and the cursor of the page after it, from
+        the cache if it is there. Otherwise read_pages(page_cursor, count) reads
+        the count records after the cursor, with the cursor after them. The
+        first page is read alone, so a search run as the user types reads no
+        more than it shows; a later page is read along with the pages after it,
+        and each is cached under the cursor that loads it.
+        """
+        page = self.get(table, (criteria, page_cursor, page_size))
+
+        if page is not None:
+            return page
+
+        page_count = 1 if page_cursor is None else _READ_AHEAD_PAGES
+        records, last_page_cursor = read_pages(page_cursor, page_count * page_size)
+        pages = []
+
+        for start in range(0, max(len(records), 1), page_size):
+            page_records = records[start:start + page_size]
+            next_page_cursor = page_records[-1][0] if start + page_size < len(records) else last_page_cursor
+            pages.append((page_cursor, (page_records, next_page_cursor)))
+            page_cursor = next_page_cursor
+
+        for cursor, page in pages:
+            size = sys.getsizeof(page) + _result_size(page[0])
+
+            if size <= self._max_entry_bytes:
+                self._store(table, (criteria, cursor, page_size), page, size)
+
+        return pages[0][1]
+
+
+    def collect(self, table: str, criteria: tuple, records):
+        """
+        Yields the records of a search as they are read, keeping a copy that is
+        cached once the search is complete. The copy is dropped as soon as it
+        grows past max_entry_bytes, so a broad search streams through without
+        being held in memory.
+        """
+        collected = []
+        size = sys.getsizeof(collected)
+
+        for record in records:
+            if collected is not None:
+                size += _record_size(record)
+
+                if size > self._max_entry_bytes:
+                    collected = None
+                else:
+                    collected.append(record)
+
+            yield record
+
+        if collected is not None:
+            self._store(table, criteria, collected, size)
+
+
+    def _store(self, table: str, criteria: tuple, records: list, size: int) -> None:
+        """
+        Caches records of the given size, evicting older results to stay in the budget
+        """
+        key = (table, criteria)
+        self._remove(key)
+        self._results[key] = (records, size)
+        self._size += size
+
+        while self._size > self._max_bytes:
+            _, (_, evicted_size) = self._results.popitem(last = False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+
+    def _remove(self, key) -> None:
+        """
+        Removes one entry, if it is there
+        """
+        entry = self._results.pop(key, None)
+
+        if entry is not None:
+            self._size -= entry[1]
+
+
+    def invalidate_table(self, table: str) -> None:
+        """
+        Removes every cached search of the given table
+        """
+        for key in [key for key in self._results if key[0] == table]:
+            self._remove(key)
+
+
+    def clear(self) -> None:
+        """
+        Removes every cached search
+        """
+        self._results.clear()
+        self._size = 0
+
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: size = {len(self._results)}, bytes = {self._size}, ' + \
+               f'hits = {self.hits}, misses = {self.misses}, evictions = {self.evictions}'
@@ -0,0 +1,128 @@
+import sqlite3
+from p2app.engine.cache import RecordCache, SearchCache
+
+
+# Large enough that every search shape built by p2app.engine.search stays prepared
+_CACHED_STATEMENTS = 256
+
+
+class ConnectionManager:
+    """
+    Owns the one long-lived connection to the open database. The engine opens it
+    when a database is opened and every query function is handed the same
+    connection, instead of connecting and closing again for each query.
+    It also owns the caches of data read through that connection.
+    """
+
+    def __init__(self, search_cache_bytes: int = 16 * 1024 * 1024):
+        """Initializes the manager with no database open. Cached search results
+        are limited to search_cache_bytes."""
+        self._path = None
+        self._connection = None
+        self._data_version = None
+        self.records = RecordCache()
+        self.searches = SearchCache(search_cache_bytes)
+
+
+    def open(self, path, is_usable = None) -> sqlite3.Connection | None:
+        """
+        Opens a connection to the database at the given path, closing any
+        connection that was already open. The connection pragmas are applied once here.
+        If the file is not a database SQLite can read, or is_usable(connection)
+        returns False, the new connection is closed again, no database is left
+        open and None is returned.
+        """
+        self.close()
+        connection = None
+
+        try:
+            connection = sqlite3.connect(path, cached_statements = _CACHED_STATEMENTS)
+            connection.execute("PRAGMA foreign_keys = ON;")
+            data_version = self._read_data_version(connection)
+
+            if is_usable is not None and not is_usable(connection):
+                connection.close()
+                return None
+        except sqlite3.Error:
+            if connection is not None:
+                connection.close()
+
+            return None
+
+        self._path = path
+        self._connection = connection
+        self._data_version = data_version
+        return connection
+
+
+    def connection(self) -> sqlite3.Connection | None:
+        """
+        Returns the open connection, or None if no database is open
+        """
+        return self._connection
+
+
+    def path(self):
+        """
+        Returns the path of the open database, or None if no database is open
+        """
+        return self._path
+
+
+    def is_open(self) -> bool:
+        """
+        Returns True if a database is currently open
+        """
+        return self._connection is not None
+
+
+    @staticmethod
+    def _read_data_version(connection: sqlite3.Connection) -> int:
+        """
+        Returns SQLite's data_version, which changes whenever another connection
+        commits a change to the database
+        """
+        return connection.execute('PRAGMA data_version;').fetchone()[0]
+
+
+    def refresh(self) -> None:
+        """
+        Clears the caches if another connection or application has written to
+        the database since the last refresh. Writes made through this
+        connection do not change data_version; they invalidate precisely instead.
+        """
+        if self._connection is None:
+            return
+
+        data_version = self._read_data_version(self._connection)
+
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self.records.clear()
+            self.searches.clear()
+
+
+    def interrupt(self) -> None:
+        """
+        Interrupts the query running on the open connection, if there is one. This
+        is safe to call from any thread; the query raises sqlite3.OperationalError
+        in the thread running it.
+        """
+        connection = self._connection
+
+        if connection is not None:
+            connection.interrupt()
+
+
+    def close(self) -> None:
+        """
+        Closes the open connection, if there is one, and empties the caches
+        """
+        if self._connection is not None:
+            self._connection.close()
+
+        self._connection = None
+        self._path = None
+        self._data_version = None
+        self.records.clear()
+        self.searches.clear()
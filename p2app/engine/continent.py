@@ -1,75 +1,118 @@
 import sqlite3
+from collections.abc import Iterator
 import p2app.events.continents as continents
 import p2app.engine.query as query
+import p2app.engine.fulltext as fulltext
+import p2app.events.search as match_modes
 import p2app.events.app as app
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
 
 
-def continent_search_data(event: continents.StartContinentSearchEvent) -> tuple:
+def continent_search_data(event: continents.StartContinentSearchEvent | continents.LoadContinentSearchPageEvent) -> tuple:
     """
     Retrieves user entered data when searching for a continent.
-    The data is returned in the form of a tuple, (continent code, name)
+    The data is returned in the form of a tuple, (continent code, name, match mode)
     """
-    return event.continent_code(), event.name()
+    return event.continent_code(), event.name(), event.match_mode()
 
 
-def continent_search_result(path: str, data: tuple) -> list[continents.ContinentSearchResultEvent]:
+def continent_search_result(connections: ConnectionManager, data: tuple) -> Iterator[continents.ContinentSearchResultEvent |
+                                                                                     app.ErrorEvent]:
     """
-    Returns a list of ContinentSearchResultEvent for each continent found in the search
+    Yields a ContinentSearchResultEvent for each continent found in the search as soon as
+    it is read, so the first results reach the view before the search finishes
     """
-    search_result = query.continent_search(path, data[0], data[1])
-    search_result_list = []
+    if data[2] == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'continent'):
+        yield app.ErrorEvent('Full-text search is not enabled for this database!')
+        return
+
+    search_result = connections.searches.get('continent', data)
+
+    if search_result is None:
+        search_result = connections.searches.collect(
+            'continent', data, query.continent_search(connections.connection(), data[0], data[1], data[2]))
 
     for continent in search_result:
-        search_result_list.append(continents.ContinentSearchResultEvent(continent))
+        yield continents.ContinentSearchResultEvent(continent)
+
 
-    return search_result_list
+def continent_search(connections: ConnectionManager, event: continents.StartContinentSearchEvent) -> Iterator[continents.ContinentSearchResultEvent |
+                                                                                                              app.ErrorEvent]:
+    """
+    Yields the events of a search for the continent data in the given event
+    """
+    return continent_search_result(connections, continent_search_data(event))
 
 
-def load_continent(path: str, event: continents.LoadContinentEvent) -> (continents.ContinentLoadedEvent |
-                                                                        app.ErrorEvent):
+def load_continent_search_page(connections: ConnectionManager, event: continents.LoadContinentSearchPageEvent) -> (continents.ContinentSearchPageEvent |
+                                                                                                                   app.ErrorEvent):
+    """
+    Returns a ContinentSearchPageEvent holding one page of the continents found in the
+    search and the cursor that loads the page after it. Pages are served from the
+    search cache when they are there.
+    """
+    if event.match_mode() == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'continent'):
+        return app.ErrorEvent('Full-text search is not enabled for this database!')
+
+    data = continent_search_data(event)
+    continents_found, next_page_cursor = connections.searches.page(
+        'continent', data, event.page_cursor(), event.page_size(),
+        lambda page_cursor, count: query.continent_search_page(connections.connection(), *data, page_cursor, count))
+
+    return continents.ContinentSearchPageEvent(continents_found, next_page_cursor)
+
+
+def load_continent(connections: ConnectionManager, event: continents.LoadContinentEvent) -> (continents.ContinentLoadedEvent |
+                                                                                             app.ErrorEvent):
     """
     Returns a ContinentLoadedEvent using the data from the given event in a query
     """
     try:
         continent_id = event.continent_id()
-        continent_data = query.load_continent(path, continent_id)
-        return continents.ContinentLoadedEvent(continents.Continent(continent_data[0],
-                                                                    continent_data[1],
-                                                                    continent_data[2]))
+        continent = connections.records.get('continent', continent_id)
+
+        if continent is None:
+            continent = query.load_continent(connections.connection(), continent_id)
+
+            if continent is None:
+                raise LookupError(f'There is no continent with the id {continent_id}')
+
+            connections.records.put('continent', continent_id, continent)
+
+        return continents.ContinentLoadedEvent(continent)
     except:
         return app.ErrorEvent('Loading the continent failed!')
 
 
-def save_continent(path: str, event: continents.SaveContinentEvent) -> (continents.ContinentSavedEvent |
-                                                                        continents.SaveContinentFailedEvent):
+def save_continent(connections: ConnectionManager, event: continents.SaveContinentEvent) -> (continents.ContinentSavedEvent |
+                                                                                             continents.SaveContinentFailedEvent):
     """
     Given the data from the event (continent_id, continent_code, name), update
     the data using a query and return a ContinentSavedEvent
     """
     try:
-        continent_update_data = event.continent()
-        query.save_continent(path, continent_update_data)
+        continent = query.save_continent(connections.connection(), event.continent())
+        connections.searches.invalidate_table('continent')
+        connections.records.invalidate('continent', continent.continent_id)
 
-        return continents.ContinentSavedEvent(continents.Continent(continent_update_data[0],
-                                                                   continent_update_data[1],
-                                                                   continent_update_data[2]))
+        return continents.ContinentSavedEvent(continent)
     except sqlite3.IntegrityError:
         return save_new_continent_fail()
 
 
-def save_new_continent(path: str, event: continents.SaveNewContinentEvent) -> (continents.ContinentSavedEvent |
-                                                                               continents.SaveContinentFailedEvent):
+def save_new_continent(connections: ConnectionManager, event: continents.SaveNewContinentEvent) -> (continents.ContinentSavedEvent |
+                                                                                                    continents.SaveContinentFailedEvent):
     """"
     Given the data from the event (continent_id, continent_code, name),
     inserts the data using a query and return a ContinentSavedEvent
     """
     try:
-        continent_update_data = event.continent()
-        returned_id = query.save_new_continent(path, continent_update_data)
+        continent = query.save_new_continent(connections.connection(), event.continent())
+        connections.searches.invalidate_table('continent')
+        connections.records.invalidate('continent', continent.continent_id)
 
-        return continents.ContinentSavedEvent(continents.Continent(returned_id,
-                                                                   continent_update_data[1],
-                                                                   continent_update_data[2]))
+        return continents.ContinentSavedEvent(continent)
     except sqlite3.IntegrityError:
         return save_new_continent_fail()
 
@@ -81,21 +124,12 @@ def save_new_continent_fail() -> continents.SaveContinentFailedEvent:
     return continents.SaveContinentFailedEvent("Saving the continent failed!")
 
 
-def continent_events(path, event):
+def register_handlers(dispatcher: Dispatcher) -> None:
     """
-    Processes all continent related events
+    Registers the handlers of all continent related events
     """
-    if isinstance(event, continents.StartContinentSearchEvent):
-        data = continent_search_data(event)
-        search_result_list = continent_search_result(path, data)
-        return search_result_list
-
-    elif isinstance(event, continents.LoadContinentEvent):
-        return load_continent(path, event)
-
-    elif isinstance(event, continents.SaveNewContinentEvent):
-        return save_new_continent(path, event)
-
-    elif isinstance(event, continents.SaveContinentEvent):
-        return save_continent(path, event)
-
+    dispatcher.register(continents.StartContinentSearchEvent, continent_search, streams = True)
+    dispatcher.register(continents.LoadContinentSearchPageEvent, load_continent_search_page)
+    dispatcher.register(continents.LoadContinentEvent, load_continent)
+    dispatcher.register(continents.SaveNewContinentEvent, save_new_continent)
+    dispatcher.register(continents.SaveContinentEvent, save_continent)
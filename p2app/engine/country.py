@@ -1,70 +1,114 @@
 import sqlite3
+from collections.abc import Iterator
 import p2app.events.countries as countries
 import p2app.engine.query as query
+import p2app.engine.fulltext as fulltext
+import p2app.events.search as match_modes
 import p2app.events.app as app
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
 
-def country_search_data(event: countries.StartCountrySearchEvent) -> tuple:
+def country_search_data(event: countries.StartCountrySearchEvent | countries.LoadCountrySearchPageEvent) -> tuple:
     """
     Retrieves user entered data when searching for a country.
-    The data is returned in the form of a tuple, (country code, name)
+    The data is returned in the form of a tuple, (country code, name, match mode)
     """
-    return event.country_code(), event.name()
+    return event.country_code(), event.name(), event.match_mode()
 
 
-def country_search_result(path: str, data: tuple) -> list[countries.CountrySearchResultEvent]:
+def country_search_result(connections: ConnectionManager, data: tuple) -> Iterator[countries.CountrySearchResultEvent |
+                                                                                   app.ErrorEvent]:
     """
-    Returns a list of CountrySearchResultEvent for each country found in the search
+    Yields a CountrySearchResultEvent for each country found in the search as soon as
+    it is read, so the first results reach the view before the search finishes
     """
-    search_result = query.country_search(path, data[0], data[1])
-    search_result_list = []
+    if data[2] == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'country'):
+        yield app.ErrorEvent('Full-text search is not enabled for this database!')
+        return
+
+    search_result = connections.searches.get('country', data)
+
+    if search_result is None:
+        search_result = connections.searches.collect(
+            'country', data, query.country_search(connections.connection(), data[0], data[1], data[2]))
 
     for country in search_result:
-        search_result_list.append(countries.CountrySearchResultEvent(country))
+        yield countries.CountrySearchResultEvent(country)
+
 
-    return search_result_list
+def country_search(connections: ConnectionManager, event: countries.StartCountrySearchEvent) -> Iterator[countries.CountrySearchResultEvent |
+                                                                                                         app.ErrorEvent]:
+    """
+    Yields the events of a search for the country data in the given event
+    """
+    return country_search_result(connections, country_search_data(event))
 
 
-def load_country(path: str, event: countries.LoadCountryEvent) -> countries.CountryLoadedEvent | app.ErrorEvent:
+def load_country_search_page(connections: ConnectionManager, event: countries.LoadCountrySearchPageEvent) -> (countries.CountrySearchPageEvent |
+                                                                                                              app.ErrorEvent):
+    """
+    Returns a CountrySearchPageEvent holding one page of the countries found in the
+    search and the cursor that loads the page after it. Pages are served from the
+    search cache when they are there.
+    """
+    if event.match_mode() == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'country'):
+        return app.ErrorEvent('Full-text search is not enabled for this database!')
+
+    data = country_search_data(event)
+    countries_found, next_page_cursor = connections.searches.page(
+        'country', data, event.page_cursor(), event.page_size(),
+        lambda page_cursor, count: query.country_search_page(connections.connection(), *data, page_cursor, count))
+
+    return countries.CountrySearchPageEvent(countries_found, next_page_cursor)
+
+
+def load_country(connections: ConnectionManager, event: countries.LoadCountryEvent) -> countries.CountryLoadedEvent | app.ErrorEvent:
     """
     Returns a CountryLoadedEvent using the data from the given event in a query
     """
     try:
         country_id = event.country_id()
-        country_data = query.load_country(path, country_id)
-        return countries.CountryLoadedEvent(countries.Country(country_data[0], country_data[1], country_data[2],
-                                                              country_data[3], country_data[4], country_data[5]))
+        country = connections.records.get('country', country_id)
+
+        if country is None:
+            country = query.load_country(connections.connection(), country_id)
+
+            if country is None:
+                raise LookupError(f'There is no country with the id {country_id}')
+
+            connections.records.put('country', country_id, country)
+
+        return countries.CountryLoadedEvent(country)
     except:
         return app.ErrorEvent('There was an error when loading the country!')
 
-def save_country(path: str, event: countries.SaveCountryEvent) -> (countries.CountrySavedEvent |
-                                                                   countries.SaveCountryFailedEvent):
+def save_country(connections: ConnectionManager, event: countries.SaveCountryEvent) -> (countries.CountrySavedEvent |
+                                                                                        countries.SaveCountryFailedEvent):
     """
     Given the data from the event, ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
     updates the data using a query and return a CountrySavedEvent if successful
     """
     try:
-        country_update_data = event.country()
-        query.save_country(path, country_update_data)
-        return countries.CountrySavedEvent(countries.Country(country_update_data[0], country_update_data[1],
-                                                             country_update_data[2],country_update_data[3],
-                                                             country_update_data[4], country_update_data[5]))
+        country = query.save_country(connections.connection(), event.country())
+        connections.searches.invalidate_table('country')
+        connections.records.invalidate('country', country.country_id)
+        return countries.CountrySavedEvent(country)
 
     except sqlite3.IntegrityError:
         return save_new_country_fail()
 
-def save_new_country(path: str, event: countries.SaveNewCountryEvent)-> (countries.CountrySavedEvent |
-                                                                         countries.SaveCountryFailedEvent):
+def save_new_country(connections: ConnectionManager, event: countries.SaveNewCountryEvent)-> (countries.CountrySavedEvent |
+                                                                                              countries.SaveCountryFailedEvent):
     """"
     Given the data from the event ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
     inserts the data using a query and return a CountrySavedEvent if successful
     """
     try:
-        country_update_data = event.country()
-        returned_id = query.save_new_country(path, country_update_data)
+        country = query.save_new_country(connections.connection(), event.country())
+        connections.searches.invalidate_table('country')
+        connections.records.invalidate('country', country.country_id)
 
-        return countries.CountrySavedEvent(countries.Country(returned_id, country_update_data[1],
-                                                             country_update_data[2],country_update_data[3],
-                                                             country_update_data[4], country_update_data[5]))
+        return countries.CountrySavedEvent(country)
     except sqlite3.IntegrityError:
         return save_new_country_fail()
 
@@ -75,20 +119,13 @@ def save_new_country_fail() -> countries.SaveCountryFailedEvent:
     """
     return countries.SaveCountryFailedEvent("Saving the country failed!")
 
-def country_events(path, event):
+
+def register_handlers(dispatcher: Dispatcher) -> None:
     """
-    Processes all country related events
+    Registers the handlers of all country related events
     """
-    if isinstance(event, countries.StartCountrySearchEvent):
-        data = country_search_data(event)
-        search_result_list = country_search_result(path, data)
-        return search_result_list
-
-    elif isinstance(event, countries.LoadCountryEvent):
-        return load_country(path, event)
-
-    elif isinstance(event, countries.SaveNewCountryEvent):
-        return save_new_country(path, event)
-
-    elif isinstance(event, countries.SaveCountryEvent):
-        return save_country(path, event)
\ No newline at end of file
+    dispatcher.register(countries.StartCountrySearchEvent, country_search, streams = True)
+    dispatcher.register(countries.LoadCountrySearchPageEvent, load_country_search_page)
+    dispatcher.register(countries.LoadCountryEvent, load_country)
+    dispatcher.register(countries.SaveNewCountryEvent, save_new_country)
+    dispatcher.register(countries.SaveCountryEvent, save_country)
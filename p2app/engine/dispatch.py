@@ -0,0 +1,80 @@
+from collections import namedtuple
+from collections.abc import Callable, Iterator
+import p2app.events.app as app
+
+
+Handler = namedtuple('Handler', ['function', 'streams', 'needs_database'])
+
+Handler.__annotations__ = {
+    'function': Callable,
+    'streams': bool,
+    'needs_database': bool
+}
+
+
+class Dispatcher:
+    """
+    Routes each event to the handler registered for its type. An event whose
+    own type has no handler goes to the handler of the nearest of its base
+    classes, in method resolution order. The handler found for each type is
+    remembered, so routing an event costs one dictionary lookup.
+    """
+
+    def __init__(self):
+        """Initializes the dispatcher with no handlers"""
+        self._handlers = {}
+        self._resolved = {}
+
+
+    def register(self, event_type: type, function: Callable, streams: bool = False,
+                 needs_database: bool = True) -> None:
+        """
+        Registers function(connections, event) as the handler of events of the
+        given type and its subclasses. A streaming handler returns an iterator
+        of events; any other handler returns one event. A handler that needs a
+        database is not called while none is open.
+        """
+        if event_type in self._handlers:
+            raise ValueError(f'{event_type.__name__} already has a handler')
+
+        self._handlers[event_type] = Handler(function, streams, needs_database)
+        self._resolved.clear()
+
+
+    def handler(self, event_type: type) -> Handler | None:
+        """
+        Returns the handler of events of the given type, or None if there is none
+        """
+        try:
+            return self._resolved[event_type]
+        except KeyError:
+            handler = None
+
+            for base in event_type.__mro__:
+                if base in self._handlers:
+                    handler = self._handlers[base]
+                    break
+
+            self._resolved[event_type] = handler
+            return handler
+
+
+    def dispatch(self, connections, event) -> Iterator:
+        """
+        Yields the events the handler of the given event returns, or nothing if
+        no handler is registered for it. An event whose handler needs a database
+        is answered with an ErrorEvent while none is open.
+        """
+        handler = self.handler(type(event))
+
+        if handler is None:
+            return
+
+        if handler.needs_database and not connections.is_open():
+            yield app.ErrorEvent('No database is open!')
+            return
+
+        if handler.streams:
+            yield from handler.function(connections, event)
+        else:
+            yield handler.function(connections, event)
@@ -0,0 +1,203 @@
+import argparse
+import sqlite3
+import time
+import numpy as np
+import p2app.engine.query as query
+from p2app.engine.spatial import EARTH_RADIUS_NM
+
+
+# The largest number of distances many_to_many computes at once. Each block
+# needs a few float64 temporaries of this size, so this keeps a many-to-many
+# computation to a few tens of MB however many airports are involved; larger
+# blocks fall out of the CPU caches and are no faster.
+_MAX_BLOCK_ELEMENTS = 1_000_000
+
+
+class AirportCoordinates:
+    """
+    The positions of the airports in a database, loaded once into contiguous
+    NumPy arrays ordered by airport_id. Latitudes and longitudes are kept in
+    radians, along with the cosine of each latitude that every haversine
+    computation needs. Positions are addressed by airport_id, and every result
+    is given back as airport_ids.
+    """
+
+    def __init__(self, airport_ids: np.ndarray, latitudes_deg: np.ndarray, longitudes_deg: np.ndarray):
+        """Initializes the coordinates from arrays sorted by airport_id"""
+        self.airport_ids = np.ascontiguousarray(airport_ids, dtype = np.int64)
+        self.latitudes = np.ascontiguousarray(np.radians(latitudes_deg), dtype = np.float64)
+        self.longitudes = np.ascontiguousarray(np.radians(longitudes_deg), dtype = np.float64)
+        self.cos_latitudes = np.cos(self.latitudes)
+
+
+    @classmethod
+    def load(cls, connection: sqlite3.Connection) -> 'AirportCoordinates':
+        """
+        Reads the position of every airport in the database, a batch of rows
+        at a time, straight into preallocated arrays
+        """
+        count = connection.execute('SELECT COUNT(*) FROM airport;').fetchone()[0]
+        airport_ids = np.empty(count, dtype = np.int64)
+        latitudes = np.empty(count, dtype = np.float64)
+        longitudes = np.empty(count, dtype = np.float64)
+
+        cursor = connection.execute(
+            'SELECT airport_id, latitude_deg, longitude_deg FROM airport ORDER BY airport_id;')
+        filled = 0
+
+        for rows in query.fetch_batches(cursor, 50000):
+            batch = np.array(rows, dtype = np.float64)
+            end = filled + len(rows)
+            airport_ids[filled:end] = batch[:, 0]
+            latitudes[filled:end] = batch[:, 1]
+            longitudes[filled:end] = batch[:, 2]
+            filled = end
+
+        return cls(airport_ids[:filled], latitudes[:filled], longitudes[:filled])
+
+
+    def __len__(self) -> int:
+        return len(self.airport_ids)
+
+
+    def indexes_of(self, airport_ids) -> np.ndarray:
+        """
+        Returns the positions in the arrays of the given airport_ids, raising
+        KeyError if any of them is not loaded
+        """
+        airport_ids = np.asarray(airport_ids, dtype = np.int64)
+        indexes = np.searchsorted(self.airport_ids, airport_ids)
+        found = indexes < len(self.airport_ids)
+        found[found] = self.airport_ids[indexes[found]] == airport_ids[found]
+
+        if not found.all():
+            raise KeyError(f'Unknown airport_id: {airport_ids[~found][0]}')
+
+        return indexes
+
+
+    def _distances(self, latitudes, cos_latitudes, longitudes, target_indexes) -> np.ndarray:
+        """
+        Returns the haversine distances, in nautical miles, from the given
+        positions (column vectors for many sources) to the target airports
+        """
+        if target_indexes is None:
+            target_latitudes, target_cos, target_longitudes = self.latitudes, self.cos_latitudes, self.longitudes
+        else:
+            target_latitudes = self.latitudes[target_indexes]
+            target_cos = self.cos_latitudes[target_indexes]
+            target_longitudes = self.longitudes[target_indexes]
+
+        h = np.sin((target_latitudes - latitudes) / 2) ** 2
+        h += cos_latitudes * target_cos * np.sin((target_longitudes - longitudes) / 2) ** 2
+        np.sqrt(h, out = h)
+        np.minimum(h, 1.0, out = h)
+        np.arcsin(h, out = h)
+        h *= 2 * EARTH_RADIUS_NM
+        return h
+
+
+    def one_to_many(self, airport_id: int, target_ids = None) -> np.ndarray:
+        """
+        Returns the distances in nautical miles from one airport to the target
+        airports, in the order of target_ids, or to every airport in airport_id
+        order if no targets are given
+        """
+        source = self.indexes_of([airport_id])[0]
+        targets = None if target_ids is None else self.indexes_of(target_ids)
+        return self._distances(self.latitudes[source], self.cos_latitudes[source],
+                               self.longitudes[source], targets)
+
+
+    def from_position(self, latitude_deg: float, longitude_deg: float, target_ids = None) -> np.ndarray:
+        """
+        Returns the distances in nautical miles from a position to the target
+        airports, or to every airport if no targets are given
+        """
+        latitude = np.radians(latitude_deg)
+        targets = None if target_ids is None else self.indexes_of(target_ids)
+        return self._distances(latitude, np.cos(latitude), np.radians(longitude_deg), targets)
+
+
+    def many_to_many(self, source_ids, target_ids = None, max_block_elements: int = _MAX_BLOCK_ELEMENTS):
+        """
+        Yields (source airport_ids, distances) blocks covering every source, where
+        distances[i, j] is the distance in nautical miles from the block's i-th
+        source to the j-th target. Each block holds at most max_block_elements
+        distances, so the whole matrix never has to fit in memory.
+        """
+        sources = self.indexes_of(source_ids)
+        targets = None if target_ids is None else self.indexes_of(target_ids)
+        target_count = len(self) if targets is None else len(targets)
+        rows_per_block = max(1, max_block_elements // max(1, target_count))
+
+        for start in range(0, len(sources), rows_per_block):
+            block = sources[start:start + rows_per_block]
+            distances = self._distances(self.latitudes[block, np.newaxis], self.cos_latitudes[block, np.newaxis],
+                                        self.longitudes[block, np.newaxis], targets)
+            yield self.airport_ids[block], distances
+
+
+    def k_nearest(self, source_ids, k: int, max_block_elements: int = _MAX_BLOCK_ELEMENTS) -> tuple[np.ndarray,
+                                                                                                    np.ndarray]:
+        """
+        Returns (airport_ids, distances), two arrays with a row for each source
+        holding its k nearest other airports, nearest first
+        """
+        sources = self.indexes_of(source_ids)
+        k = max(0, min(k, len(self) - 1))
+        nearest_ids = np.empty((len(sources), k), dtype = np.int64)
+        nearest_distances = np.empty((len(sources), k), dtype = np.float64)
+        row = 0
+
+        if k == 0:
+            return nearest_ids, nearest_distances
+
+        for block_ids, distances in self.many_to_many(self.airport_ids[sources], None, max_block_elements):
+            rows = np.arange(len(block_ids))
+            distances[rows, sources[row:row + len(block_ids)]] = np.inf
+
+            candidates = np.argpartition(distances, k - 1, axis = 1)[:, :k]
+            candidate_distances = np.take_along_axis(distances, candidates, axis = 1)
+            order = np.argsort(candidate_distances, axis = 1)
+
+            nearest_ids[row:row + len(block_ids)] = self.airport_ids[np.take_along_axis(candidates, order, axis = 1)]
+            nearest_distances[row:row + len(block_ids)] = np.take_along_axis(candidate_distances, order, axis = 1)
+            row += len(block_ids)
+
+        return nearest_ids, nearest_distances
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Prints the airports nearest to an airport, computed from the coordinates of every airport.')
+    parser.add_argument('database', help = 'path to the .db file')
+    parser.add_argument('airport_ident', help = 'the ident of the airport to start from')
+    parser.add_argument('-k', type = int, default = 10, help = 'how many airports to list')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        start = time.perf_counter()
+        coordinates = AirportCoordinates.load(connection)
+        print(f'Loaded {len(coordinates)} airports in {time.perf_counter() - start:.2f} s')
+
+        row = connection.execute('SELECT airport_id FROM airport WHERE airport_ident = ?;',
+                                 (args.airport_ident,)).fetchone()
+
+        if row is None:
+            parser.error(f'No airport has the ident {args.airport_ident}')
+
+        nearest_ids, nearest_distances = coordinates.k_nearest([row[0]], args.k)
+
+        for airport_id, distance in zip(nearest_ids[0], nearest_distances[0]):
+            ident = connection.execute('SELECT airport_ident FROM airport WHERE airport_id = ?;',
+                                       (int(airport_id),)).fetchone()[0]
+            print(f'{ident:>10} {distance:10.1f} nm')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from pathlib import Path
+import p2app.engine.query as query
+import p2app.engine.search as search
+
+
+# Every table in schema.sql can be exported whole; only the tables in
+# search.TABLE_COLUMNS can also be filtered by search criteria
+EXPORT_TABLES = ('continent', 'country', 'region', 'airport', 'airport_frequency', 'runway', 'navigation_aid')
+
+CSV = 'csv'
+JSON_LINES = 'jsonl'
+
+# How many rows are read from the database and written to the file at a time
+_EXPORT_BATCH_ROWS = 5000
+
+# The compression level used for .gz output, which is much faster than the
+# default of 9 for files only slightly larger
+_GZIP_LEVEL = 6
+
+
+ExportResult = namedtuple('ExportResult', ['table', 'path', 'rows', 'seconds'])
+
+ExportResult.__annotations__ = {
+    'table': str,
+    'path': Path,
+    'rows': int,
+    'seconds': float
+}
+
+
+def export_format(path) -> tuple[str, bool]:
+    """
+    Returns the format an export to the given path is written in, from the
+    path's extension, and whether the file is gzip compressed
+    """
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == '.gz'
+
+    if compressed:
+        suffixes = suffixes[:-1]
+
+    if suffixes and suffixes[-1] in ('.jsonl', '.json', '.ndjson'):
+        return JSON_LINES, compressed
+    else:
+        return CSV, compressed
+
+
+def _open_output(path, compressed: bool):
+    """
+    Opens the file an export is written to, compressing it if asked to
+    """
+    if compressed:
+        return gzip.open(path, 'wt', compresslevel = _GZIP_LEVEL, encoding = 'utf-8', newline = '')
+    else:
+        return open(path, 'w', encoding = 'utf-8', newline = '')
+
+
+def _temporary_path(path: Path) -> Path:
+    """
+    Returns the path an export is written to before it is complete. It is in
+    the same directory as the output, so it can be renamed over it.
+    """
+    return path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+
+
+def _select(connection: sqlite3.Connection, table: str, criteria: list[search.Criterion]) -> sqlite3.Cursor:
+    """
+    Returns a cursor over the rows of the table that match the criteria, or
+    over the whole table if there are no criteria
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f'Unknown table: {table}')
+
+    if criteria:
+        return query.search_records(connection, table, criteria)
+    else:
+        return connection.execute(f'SELECT * FROM {table};')
+
+
+def _write_csv(output, columns: list[str], batches) -> int:
+    """
+    Writes a header and then each batch of rows as CSV, one write per batch,
+    returning the number of rows written
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+
+    for batch in batches:
+        writer.writerows(batch)
+        output.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+        rows += len(batch)
+
+    output.write(buffer.getvalue())
+    return rows
+
+
+def _write_json_lines(output, columns: list[str], batches) -> int:
+    """
+    Writes each row as a JSON object on its own line, one write per batch,
+    returning the number of rows written
+    """
+    encode = json.JSONEncoder(ensure_ascii = False).encode
+    rows = 0
+
+    for batch in batches:
+        output.write(''.join(encode(dict(zip(columns, row))) + '\n' for row in batch))
+        rows += len(batch)
+
+    return rows
+
+
+def export_table(connection: sqlite3.Connection, table: str, path,
+                 criteria: list[search.Criterion] = (), file_format: str | None = None,
+                 compressed: bool | None = None) -> ExportResult:
+    """
+    Streams the rows of a table, or the rows matching the given criteria, to a
+    CSV or JSON Lines file. The format and compression are taken from the
+    path's extension unless given. Rows are read with fetchmany and written a
+    batch at a time, so memory use does not grow with the size of the table.
+    The rows are written to a temporary file that replaces the output only once
+    every row is written, so a failed export leaves no partial file behind.
+    """
+    path_format, path_compressed = export_format(path)
+    file_format = file_format or path_format
+    compressed = path_compressed if compressed is None else compressed
+
+    start = time.perf_counter()
+    cursor = _select(connection, table, list(criteria))
+    columns = [description[0] for description in cursor.description]
+    batches = query.fetch_batches(cursor, _EXPORT_BATCH_ROWS)
+
+    temporary_path = _temporary_path(Path(path))
+
+    try:
+        with _open_output(temporary_path, compressed) as output:
+            if file_format == JSON_LINES:
+                rows = _write_json_lines(output, columns, batches)
+            else:
+                rows = _write_csv(output, columns, batches)
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink(missing_ok = True)
+        raise
+
+    return ExportResult(table, Path(path), rows, time.perf_counter() - start)
+
+
+def _parse_criteria(values: list[str], operator: str) -> list[search.Criterion]:
+    """
+    Turns COLUMN=VALUE arguments from the command line into criteria
+    """
+    criteria = []
+
+    for value in values:
+        column, separator, text = value.partition('=')
+
+        if not separator:
+            raise ValueError(f'Expected COLUMN=VALUE, got {value}')
+
+        criteria.append(search.Criterion(column, operator, text))
+
+    return criteria
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Streams a table, or the rows matching a search, to a CSV or JSON Lines file. '
+                      'The format is chosen by the extension: .csv, .jsonl, optionally followed by .gz.')
+    parser.add_argument('database', help = 'path to the .db file')
+    parser.add_argument('table', choices = EXPORT_TABLES, help = 'the table to export')
+    parser.add_argument('output', help = 'path of the file to write')
+    parser.add_argument('--equals', action = 'append', default = [], metavar = 'COLUMN=VALUE',
+                        help = 'only export rows where the column has this value')
+    parser.add_argument('--prefix', action = 'append', default = [], metavar = 'COLUMN=VALUE',
+                        help = 'only export rows where the column starts with this value')
+    parser.add_argument('--gzip', action = 'store_true', help = 'compress the output whatever its extension')
+    args = parser.parse_args()
+
+    try:
+        criteria = _parse_criteria(args.equals, search.EQUALS) + _parse_criteria(args.prefix, search.PREFIX)
+    except ValueError as error:
+        parser.error(str(error))
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        result = export_table(connection, args.table, args.output, criteria,
+                              compressed = True if args.gzip else None)
+        rate = result.rows / result.seconds if result.seconds > 0 else 0
+        print(f'Exported {result.rows} {result.table} rows to {result.path} '
+              f'in {result.seconds:.2f} s ({rate:,.0f} rows/s)')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import sqlite3
+import p2app.engine.search as search
+import p2app.engine.query as query
+
+
+# The primary key of each table, which the full-text index uses as its rowid
+_PRIMARY_KEYS = {
+    'continent': 'continent_id',
+    'country': 'country_id',
+    'region': 'region_id',
+    'airport': 'airport_id'
+}
+
+
+def is_enabled(connection: sqlite3.Connection, table: str) -> bool:
+    """
+    Returns True if full-text search has been enabled for the given table
+    """
+    return query.table_exists(connection, f'{table}_fts')
+
+
+def _create_statements(table: str) -> list[str]:
+    """
+    Returns the statements that create a table's external-content FTS5 index
+    and the triggers that keep it in sync with the table
+    """
+    key = _PRIMARY_KEYS[table]
+    columns = search.FULL_TEXT_COLUMNS[table]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+
+    return [
+        f"""CREATE VIRTUAL TABLE {table}_fts
+        USING fts5({column_list}, content = '{table}', content_rowid = '{key}');""",
+
+        f"""CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.{key}, {new_values});
+        END;""",
+
+        f"""CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, {column_list})
+            VALUES ('delete', old.{key}, {old_values});
+        END;""",
+
+        f"""CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, {column_list})
+            VALUES ('delete', old.{key}, {old_values});
+            INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.{key}, {new_values});
+        END;""",
+
+        f"""INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild');"""
+    ]
+
+
+def enable_full_text(connection: sqlite3.Connection) -> list[str]:
+    """
+    Creates the full-text indexes and their triggers for every supported table
+    that does not have one yet, populating them from the existing rows.
+    Returns the names of the tables that were enabled.
+    """
+    enabled = []
+
+    with connection:
+        for table in search.FULL_TEXT_COLUMNS:
+            if query.table_exists(connection, table) and not is_enabled(connection, table):
+                for statement in _create_statements(table):
+                    connection.execute(statement)
+
+                enabled.append(table)
+
+    return enabled
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Creates FTS5 name and keyword indexes, kept in sync by triggers.')
+    parser.add_argument('database', help = 'path to the .db file')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        enabled = enable_full_text(connection)
+        print(f'Enabled full-text search for {", ".join(enabled)}' if enabled
+              else 'Full-text search was already enabled.')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import csv
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+
+# OurAirports publishes no continents file, so the continents are the fixed set
+# of codes that its other files refer to
+CONTINENTS = (
+    ('AF', 'Africa'),
+    ('AN', 'Antarctica'),
+    ('AS', 'Asia'),
+    ('EU', 'Europe'),
+    ('NA', 'North America'),
+    ('OC', 'Oceania'),
+    ('SA', 'South America')
+)
+
+# The number of CSV rows handed to each executemany call
+_CHUNK_ROWS = 50000
+
+
+ImportResult = namedtuple('ImportResult', ['table', 'rows', 'seconds'])
+
+ImportResult.__annotations__ = {
+    'table': str,
+    'rows': int,
+    'seconds': float
+}
+
+
+def _text(value: str) -> str | None:
+    """
+    Returns the CSV value, or None if it is empty
+    """
+    return value if value != '' else None
+
+
+def _integer(value: str) -> int | None:
+    """
+    Returns the CSV value as an integer, or None if it is empty
+    """
+    if value == '':
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _real(value: str) -> float | None:
+    """
+    Returns the CSV value as a real number, or None if it is empty
+    """
+    return float(value) if value != '' else None
+
+
+def _flag(value: str) -> int:
+    """
+    Returns 1 for the CSV values OurAirports uses for true, and 0 otherwise
+    """
+    return 1 if value in ('1', 'yes') else 0
+
+
+def _country_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the country row for a record of countries.csv
+    """
+    return (int(record['id']), record['code'], record['name'],
+            codes['continent'].get(record['continent']),
+            record['wikipedia_link'], _text(record['keywords']))
+
+
+def _region_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the region row for a record of regions.csv
+    """
+    return (int(record['id']), record['code'], record['local_code'], record['name'],
+            codes['continent'].get(record['continent']), codes['country'].get(record['iso_country']),
+            _text(record['wikipedia_link']), _text(record['keywords']))
+
+
+def _airport_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the airport row for a record of airports.csv
+    """
+    # airport.continent_id is declared TEXT in schema.sql
+    continent_id = codes['continent'].get(record['continent'])
+
+    return (int(record['id']), record['ident'], record['type'], record['name'],
+            float(record['latitude_deg']), float(record['longitude_deg']), _integer(record['elevation_ft']),
+            str(continent_id) if continent_id is not None else None,
+            codes['country'].get(record['iso_country']), codes['region'].get(record['iso_region']),
+            _text(record['municipality']), _flag(record['scheduled_service']),
+            _text(record['gps_code']), _text(record['iata_code']), _text(record['local_code']),
+            _text(record['home_link']), _text(record['wikipedia_link']), _text(record['keywords']))
+
+
+def _runway_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the runway row for a record of runways.csv
+    """
+    return (int(record['id']), int(record['airport_ref']),
+            _integer(record['length_ft']), _integer(record['width_ft']), _text(record['surface']),
+            _flag(record['lighted']), _flag(record['closed']),
+            _text(record['le_ident']), _real(record['le_latitude_deg']), _real(record['le_longitude_deg']),
+            _integer(record['le_elevation_ft']), _real(record['le_heading_degT']),
+            _integer(record['le_displaced_threshold_ft']),
+            _text(record['he_ident']), _real(record['he_latitude_deg']), _real(record['he_longitude_deg']),
+            _integer(record['he_elevation_ft']), _real(record['he_heading_degT']),
+            _integer(record['he_displaced_threshold_ft']))
+
+
+def _frequency_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the airport_frequency row for a record of airport-frequencies.csv
+    """
+    return (int(record['id']), int(record['airport_ref']), record['type'],
+            _text(record['description']), float(record['frequency_mhz']))
+
+
+def _navigation_aid_row(record: dict, codes: dict) -> tuple:
+    """
+    Returns the navigation_aid row for a record of navaids.csv
+    """
+    return (int(record['id']), record['filename'], record['ident'], record['name'], record['type'],
+            _integer(record['frequency_khz']), float(record['latitude_deg']), float(record['longitude_deg']),
+            _integer(record['elevation_ft']), record['iso_country'],
+            _integer(record['dme_frequency_khz']), _text(record['dme_channel']),
+            _real(record['dme_latitude_deg']), _real(record['dme_longitude_deg']),
+            _integer(record['dme_elevation_ft']),
+            _real(record['slaved_variation_deg']), _real(record['magnetic_variation_deg']),
+            _text(record['usageType']), _text(record['power']),
+            codes['airport'].get(record['associated_airport']))
+
+
+# Each source is the OurAirports file, the table it is loaded into, the number
+# of columns in that table and the function that turns a CSV record into a row,
+# in the order the files have to be loaded for their codes to resolve
+_SOURCES = (
+    ('countries.csv', 'country', 6, _country_row),
+    ('regions.csv', 'region', 8, _region_row),
+    ('airports.csv', 'airport', 18, _airport_row),
+    ('runways.csv', 'runway', 19, _runway_row),
+    ('airport-frequencies.csv', 'airport_frequency', 5, _frequency_row),
+    ('navaids.csv', 'navigation_aid', 20, _navigation_aid_row)
+)
+
+# The query that maps each kind of code used in the files to its row's id
+_CODE_QUERIES = {
+    'continent': 'SELECT continent_code, continent_id FROM continent;',
+    'country': 'SELECT country_code, country_id FROM country;',
+    'region': 'SELECT region_code, region_id FROM region;',
+    'airport': 'SELECT airport_ident, airport_id FROM airport;'
+}
+
+
+def read_chunks(path, make_row, codes: dict, chunk_rows: int = _CHUNK_ROWS):
+    """
+    Yields the rows of a CSV file in lists of at most chunk_rows rows, so a
+    file of any size is loaded without being held in memory
+    """
+    with open(path, newline = '', encoding = 'utf-8') as csv_file:
+        chunk = []
+
+        for record in csv.DictReader(csv_file):
+            chunk.append(make_row(record, codes))
+
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def _relax_pragmas(connection: sqlite3.Connection) -> dict:
+    """
+    Turns off syncing, the on-disk journal and foreign key enforcement for the
+    length of an import, returning the settings to restore afterward. A crash
+    during the import can leave the database corrupt, which is why this is
+    only done while importing.
+    """
+    saved = {pragma: connection.execute(f'PRAGMA {pragma};').fetchone()[0]
+             for pragma in ('synchronous', 'journal_mode', 'foreign_keys', 'cache_size')}
+
+    connection.execute('PRAGMA synchronous = OFF;')
+    connection.execute('PRAGMA journal_mode = MEMORY;')
+    connection.execute('PRAGMA foreign_keys = OFF;')
+    connection.execute('PRAGMA cache_size = -65536;')
+    return saved
+
+
+def _restore_pragmas(connection: sqlite3.Connection, saved: dict) -> None:
+    """
+    Restores the settings returned by _relax_pragmas
+    """
+    for pragma, value in saved.items():
+        connection.execute(f'PRAGMA {pragma} = {value};')
+
+
+def _check_foreign_keys(connection: sqlite3.Connection) -> None:
+    """
+    Raises sqlite3.IntegrityError if any row refers to a row that does not exist
+    """
+    violations = connection.execute('PRAGMA foreign_key_check;').fetchall()
+
+    if violations:
+        examples = ', '.join(f'{table} row {rowid} -> {parent}' for table, rowid, parent, _ in violations[:5])
+        raise sqlite3.IntegrityError(f'{len(violations)} foreign key violations, e.g. {examples}')
+
+
+def import_directory(connection: sqlite3.Connection, directory, chunk_rows: int = _CHUNK_ROWS,
+                     progress = None) -> list[ImportResult]:
+    """
+    Loads the OurAirports CSV files found in a directory into the database in
+    one transaction, inserting each chunk of rows with executemany. Foreign keys
+    are checked once all of the files are loaded, and nothing is imported if
+    any of them is broken. progress, if given, is called with each
+    ImportResult as soon as its table is loaded.
+    """
+    results = []
+    saved = _relax_pragmas(connection)
+
+    try:
+        with connection:
+            start = time.perf_counter()
+            cursor = connection.executemany(
+                'INSERT OR IGNORE INTO continent (continent_code, name) VALUES (?, ?);', CONTINENTS)
+            result = ImportResult('continent', cursor.rowcount, time.perf_counter() - start)
+            results.append(result)
+
+            if progress is not None:
+                progress(result)
+
+            codes = {'continent': dict(connection.execute(_CODE_QUERIES['continent']))}
+
+            for file_name, table, column_count, make_row in _SOURCES:
+                path = os.path.join(directory, file_name)
+
+                if not os.path.exists(path):
+                    continue
+
+                statement = f'INSERT INTO {table} VALUES ({", ".join("?" * column_count)});'
+                start = time.perf_counter()
+                rows = 0
+
+                for chunk in read_chunks(path, make_row, codes, chunk_rows):
+                    connection.executemany(statement, chunk)
+                    rows += len(chunk)
+
+                result = ImportResult(table, rows, time.perf_counter() - start)
+                results.append(result)
+
+                if progress is not None:
+                    progress(result)
+
+                if table in _CODE_QUERIES:
+                    codes[table] = dict(connection.execute(_CODE_QUERIES[table]))
+
+            _check_foreign_keys(connection)
+    finally:
+        _restore_pragmas(connection, saved)
+
+    return results
+
+
+def format_result(result: ImportResult) -> str:
+    """
+    Returns a line describing how quickly one table was loaded
+    """
+    rate = result.rows / result.seconds if result.seconds > 0 else 0
+    return f'{result.table}: {result.rows} rows in {result.seconds:.2f} s ({rate:,.0f} rows/s)'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Loads the OurAirports CSV files in a directory into a database.')
+    parser.add_argument('database', help = 'path to the .db file')
+    parser.add_argument('directory', help = 'directory holding countries.csv, regions.csv, airports.csv, ...')
+    parser.add_argument('--schema', help = 'schema.sql to create the tables from before loading')
+    parser.add_argument('--chunk-rows', type = int, default = _CHUNK_ROWS,
+                        help = 'rows inserted per executemany call')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        if args.schema:
+            with open(args.schema, encoding = 'utf-8') as schema_file:
+                connection.executescript(schema_file.read())
+
+        start = time.perf_counter()
+        results = import_directory(connection, args.directory, args.chunk_rows,
+                                   lambda result: print(format_result(result)))
+        total = ImportResult('total', sum(result.rows for result in results), time.perf_counter() - start)
+        print(format_result(total))
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
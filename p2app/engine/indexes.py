@@ -0,0 +1,198 @@
+import argparse
+import sqlite3
+from collections import namedtuple
+import p2app.engine.search as search
+import p2app.engine.query as query
+
+
+IndexDefinition = namedtuple('IndexDefinition', ['name', 'table', 'columns'])
+
+IndexDefinition.__annotations__ = {
+    'name': str,
+    'table': str,
+    'columns': tuple[str, ...]
+}
+
+
+PlanReport = namedtuple('PlanReport', ['table', 'columns', 'plan', 'scans'])
+
+PlanReport.__annotations__ = {
+    'table': str,
+    'columns': tuple[str, ...],
+    'plan': list[str],
+    'scans': bool
+}
+
+
+# The secondary indexes the search and load paths need, beyond the primary
+# keys and UNIQUE constraints that schema.sql already declares
+RECOMMENDED_INDEXES = (
+    IndexDefinition('continent_name_idx', 'continent', ('name',)),
+    IndexDefinition('country_name_idx', 'country', ('name',)),
+    IndexDefinition('country_continent_id_idx', 'country', ('continent_id',)),
+    IndexDefinition('region_name_idx', 'region', ('name',)),
+    IndexDefinition('region_local_code_idx', 'region', ('local_code',)),
+    IndexDefinition('region_country_id_idx', 'region', ('country_id',)),
+    IndexDefinition('region_continent_id_idx', 'region', ('continent_id',)),
+    IndexDefinition('airport_iata_code_idx', 'airport', ('iata_code',)),
+    IndexDefinition('airport_gps_code_idx', 'airport', ('gps_code',)),
+    IndexDefinition('airport_local_code_idx', 'airport', ('local_code',)),
+    IndexDefinition('airport_name_idx', 'airport', ('name',)),
+    IndexDefinition('airport_type_idx', 'airport', ('type',)),
+    IndexDefinition('airport_country_id_idx', 'airport', ('country_id',)),
+    IndexDefinition('airport_region_id_idx', 'airport', ('region_id',)),
+    IndexDefinition('runway_airport_id_idx', 'runway', ('airport_id',)),
+    IndexDefinition('airport_frequency_airport_id_idx', 'airport_frequency', ('airport_id',)),
+    IndexDefinition('navigation_aid_id_idx', 'navigation_aid', ('navigation_aid_id',))
+)
+
+
+# Each shape is a table and the columns a search on it filters by
+SEARCH_SHAPES = (
+    ('continent', ('continent_code',)),
+    ('continent', ('name',)),
+    ('country', ('country_code',)),
+    ('country', ('name',)),
+    ('country', ('continent_id',)),
+    ('region', ('region_code',)),
+    ('region', ('local_code',)),
+    ('region', ('name',)),
+    ('region', ('local_code', 'name')),
+    ('region', ('country_id',)),
+    ('region', ('continent_id',)),
+    ('airport', ('airport_ident',)),
+    ('airport', ('iata_code',)),
+    ('airport', ('gps_code',)),
+    ('airport', ('local_code',)),
+    ('airport', ('name',)),
+    ('airport', ('type',)),
+    ('airport', ('country_id',)),
+    ('airport', ('region_id',)),
+    ('airport', ('country_id', 'type')),
+    ('runway', ('airport_id',)),
+    ('airport_frequency', ('airport_id',))
+)
+
+
+def _indexed_leading_columns(connection: sqlite3.Connection, table: str) -> set[tuple[str, ...]]:
+    """
+    Returns the column lists of every index on the table, including the ones
+    SQLite creates for UNIQUE constraints
+    """
+    column_lists = set()
+
+    for index in connection.execute(f'PRAGMA index_list({table});').fetchall():
+        index_name = index[1]
+        info = connection.execute(f'PRAGMA index_info("{index_name}");').fetchall()
+        column_lists.add(tuple(column[2] for column in sorted(info)))
+
+    return column_lists
+
+
+def missing_indexes(connection: sqlite3.Connection) -> list[IndexDefinition]:
+    """
+    Returns the recommended indexes whose columns are not already covered by an
+    existing index with the same leading columns
+    """
+    missing = []
+
+    for definition in RECOMMENDED_INDEXES:
+        if not query.table_exists(connection, definition.table):
+            continue
+
+        covered = any(columns[:len(definition.columns)] == definition.columns
+                      for columns in _indexed_leading_columns(connection, definition.table))
+
+        if not covered:
+            missing.append(definition)
+
+    return missing
+
+
+def create_indexes(connection: sqlite3.Connection, definitions: list[IndexDefinition]) -> list[str]:
+    """
+    Creates the given indexes in one transaction and returns their names
+    """
+    with connection:
+        for definition in definitions:
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {definition.name} '
+                f'ON {definition.table} ({", ".join(definition.columns)});')
+
+    if definitions:
+        connection.execute('PRAGMA optimize;')
+
+    return [definition.name for definition in definitions]
+
+
+def advise(connection: sqlite3.Connection) -> list[PlanReport]:
+    """
+    Runs EXPLAIN QUERY PLAN on every search shape and reports which of them
+    have to scan the whole table
+    """
+    reports = []
+
+    for table, columns in SEARCH_SHAPES:
+        if not query.table_exists(connection, table):
+            continue
+
+        criteria = [search.Criterion(column, search.EQUALS, None) for column in columns]
+        statement, parameters = search.build_select(table, criteria)
+        plan = [row[3] for row in connection.execute('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        scans = any(detail.startswith('SCAN') for detail in plan)
+        reports.append(PlanReport(table, columns, plan, scans))
+
+    return reports
+
+
+def format_report(reports: list[PlanReport], missing: list[IndexDefinition]) -> str:
+    """
+    Returns a readable report of the query plans and the indexes that are still missing
+    """
+    lines = []
+
+    for report in reports:
+        status = 'SCAN  ' if report.scans else 'SEARCH'
+        lines.append(f'{status} {report.table} by {", ".join(report.columns)}: {"; ".join(report.plan)}')
+
+    if missing:
+        lines.append('')
+        lines.append('Recommended indexes:')
+
+        for definition in missing:
+            lines.append(f'  {definition.name} ON {definition.table} ({", ".join(definition.columns)})')
+    else:
+        lines.append('')
+        lines.append('All recommended indexes exist.')
+
+    return '\n'.join(lines)
+
+
+def index_report(connection: sqlite3.Connection) -> str:
+    """
+    Returns the advisor's report for the open database
+    """
+    return format_report(advise(connection), missing_indexes(connection))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Reports which searches scan a table and creates the recommended indexes.')
+    parser.add_argument('database', help = 'path to the .db file')
+    parser.add_argument('--apply', action = 'store_true', help = 'create the missing recommended indexes')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        if args.apply:
+            for name in create_indexes(connection, missing_indexes(connection)):
+                print(f'Created {name}')
+
+        print(index_report(connection))
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
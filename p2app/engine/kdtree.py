@@ -0,0 +1,292 @@
+import argparse
+import math
+import sqlite3
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import p2app.engine.query as query
+from p2app.engine.spatial import EARTH_RADIUS_NM
+
+
+# The most points kept in one leaf of the tree. Leaves are scanned point by
+# point, so small leaves mean fewer distances and more nodes to walk.
+_LEAF_SIZE = 16
+
+# The number of navigation aids each worker process is handed at a time
+_CHUNK_POINTS = 20000
+
+
+JoinResult = namedtuple('JoinResult', ['airports', 'navigation_aids', 'linked',
+                                       'build_seconds', 'query_seconds', 'write_seconds'])
+
+JoinResult.__annotations__ = {
+    'airports': int,
+    'navigation_aids': int,
+    'linked': int,
+    'build_seconds': float,
+    'query_seconds': float,
+    'write_seconds': float
+}
+
+
+def unit_vectors(latitudes_deg, longitudes_deg) -> np.ndarray:
+    """
+    Returns the positions as points on the unit sphere, one (x, y, z) row each.
+    The straight-line distance between two of these points grows with the
+    great-circle distance between the positions, so the nearest point is also
+    the nearest position.
+    """
+    latitudes = np.radians(np.asarray(latitudes_deg, dtype = np.float64))
+    longitudes = np.radians(np.asarray(longitudes_deg, dtype = np.float64))
+    cos_latitudes = np.cos(latitudes)
+    return np.column_stack((cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes),
+                            np.sin(latitudes)))
+
+
+def chord_for_nm(distance_nm: float) -> float:
+    """
+    Returns the straight-line distance between two points on the unit sphere
+    that are distance_nm apart along a great circle
+    """
+    return 2 * math.sin(min(distance_nm / EARTH_RADIUS_NM, math.pi) / 2)
+
+
+def nm_for_chord(chord: float) -> float:
+    """
+    Returns the great-circle distance in nautical miles between two points on
+    the unit sphere that are the given straight-line distance apart
+    """
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, chord / 2))
+
+
+class KDTree:
+    """
+    A k-d tree over points on the unit sphere, each labelled with an id. It is
+    built once with NumPy, splitting every node at the median of its widest
+    coordinate, and then held as plain lists, which the pure Python nearest
+    neighbour search indexes much faster than it could index arrays.
+    """
+
+    def __init__(self, ids, points: np.ndarray, leaf_size: int = _LEAF_SIZE):
+        """Builds the tree from the ids and their (x, y, z) rows of points"""
+        points = np.asarray(points, dtype = np.float64)
+        order = np.arange(len(points))
+
+        axes, splits, lefts, rights, starts, ends = [], [], [], [], [], []
+        pending = [(self._new_node(axes, splits, lefts, rights, starts, ends), 0, len(points))]
+
+        while pending:
+            node, start, end = pending.pop()
+            starts[node] = start
+            ends[node] = end
+
+            if end - start <= leaf_size:
+                continue
+
+            block = points[order[start:end]]
+            axis = int(np.argmax(block.max(axis = 0) - block.min(axis = 0)))
+            middle = (end - start) // 2
+            order[start:end] = order[start:end][np.argpartition(block[:, axis], middle)]
+
+            axes[node] = axis
+            splits[node] = float(points[order[start + middle], axis])
+            lefts[node] = self._new_node(axes, splits, lefts, rights, starts, ends)
+            rights[node] = self._new_node(axes, splits, lefts, rights, starts, ends)
+            pending.append((lefts[node], start, start + middle))
+            pending.append((rights[node], start + middle, end))
+
+        self._axes = axes
+        self._splits = splits
+        self._lefts = lefts
+        self._rights = rights
+        self._starts = starts
+        self._ends = ends
+        self._points = [tuple(point) for point in points[order].tolist()]
+        self._ids = np.asarray(ids)[order].tolist()
+
+
+    @staticmethod
+    def _new_node(axes, splits, lefts, rights, starts, ends) -> int:
+        """
+        Appends a leaf to the node lists and returns its number
+        """
+        for values in (axes, lefts, rights, starts, ends):
+            values.append(-1)
+
+        splits.append(0.0)
+        return len(axes) - 1
+
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+    def nearest(self, point: tuple[float, float, float], max_chord: float = 2.0) -> tuple:
+        """
+        Returns (id, chord) for the point of the tree nearest to the given one,
+        or (None, None) if none of them is within max_chord of it
+        """
+        axes, splits, lefts, rights = self._axes, self._splits, self._lefts, self._rights
+        starts, ends, points = self._starts, self._ends, self._points
+
+        best = math.nextafter(max_chord * max_chord, math.inf)
+        best_index = -1
+        pending = [(0, 0.0)]
+
+        while pending:
+            node, lower_bound = pending.pop()
+
+            if lower_bound >= best:
+                continue
+
+            axis = axes[node]
+
+            if axis < 0:
+                x, y, z = point
+
+                for index in range(starts[node], ends[node]):
+                    px, py, pz = points[index]
+                    squared = (px - x) * (px - x) + (py - y) * (py - y) + (pz - z) * (pz - z)
+
+                    if squared < best:
+                        best = squared
+                        best_index = index
+            else:
+                difference = point[axis] - splits[node]
+
+                if difference < 0:
+                    near, far = lefts[node], rights[node]
+                else:
+                    near, far = rights[node], lefts[node]
+
+                far_bound = max(lower_bound, difference * difference)
+
+                if far_bound < best:
+                    pending.append((far, far_bound))
+
+                pending.append((near, lower_bound))
+
+        if best_index < 0:
+            return None, None
+
+        return self._ids[best_index], math.sqrt(best)
+
+
+    def nearest_many(self, points, max_chord: float = 2.0) -> list[tuple]:
+        """
+        Returns nearest(point, max_chord) for each of the given points
+        """
+        return [self.nearest(point, max_chord) for point in points]
+
+
+# The tree each worker process searches, handed over once when the worker starts
+# rather than with every chunk of points
+_worker_tree = None
+
+
+def _start_worker(tree: KDTree) -> None:
+    """
+    Keeps the tree a worker process will search
+    """
+    global _worker_tree
+    _worker_tree = tree
+
+
+def _worker_nearest(points: list[tuple], max_chord: float) -> list[tuple]:
+    """
+    Searches the worker's tree for the nearest point to each of the given points
+    """
+    return _worker_tree.nearest_many(points, max_chord)
+
+
+def nearest_join(tree: KDTree, points: list[tuple], max_chord: float, processes: int = 1) -> list[tuple]:
+    """
+    Returns (id, chord) of the nearest point of the tree to each of the given
+    points, split across a pool of processes if more than one is asked for
+    """
+    if processes <= 1 or len(points) <= _CHUNK_POINTS:
+        return tree.nearest_many(points, max_chord)
+
+    chunks = [points[start:start + _CHUNK_POINTS] for start in range(0, len(points), _CHUNK_POINTS)]
+    found = []
+
+    with ProcessPoolExecutor(processes, initializer = _start_worker, initargs = (tree,)) as pool:
+        for chunk_found in pool.map(_worker_nearest, chunks, [max_chord] * len(chunks)):
+            found.extend(chunk_found)
+
+    return found
+
+
+def airport_tree(connection: sqlite3.Connection) -> KDTree:
+    """
+    Builds a KDTree of the positions of every airport in the database
+    """
+    cursor = connection.execute('SELECT airport_id, latitude_deg, longitude_deg FROM airport;')
+    batches = [np.array(rows, dtype = np.float64) for rows in query.fetch_batches(cursor)]
+    airports = np.concatenate(batches) if batches else np.empty((0, 3))
+
+    return KDTree(airports[:, 0].astype(np.int64), unit_vectors(airports[:, 1], airports[:, 2]))
+
+
+def link_navigation_aids(connection: sqlite3.Connection, max_distance_nm: float, processes: int = 1,
+                         replace: bool = False) -> JoinResult:
+    """
+    Sets the airport_id of each navigation aid that has none to the nearest
+    airport within max_distance_nm of it, or of every navigation aid if replace
+    is True. Navigation aids with no airport that close are left as they are.
+    All of the updates are written in one transaction.
+    """
+    start = time.perf_counter()
+    tree = airport_tree(connection)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    missing = '' if replace else ' WHERE airport_id IS NULL'
+    navigation_aids = connection.execute(
+        f'SELECT rowid, navigation_aid_id, latitude_deg, longitude_deg FROM navigation_aid{missing};').fetchall()
+    points = unit_vectors([row[2] for row in navigation_aids], [row[3] for row in navigation_aids])
+
+    found = nearest_join(tree, [tuple(point) for point in points.tolist()], chord_for_nm(max_distance_nm),
+                         processes)
+    query_seconds = time.perf_counter() - start
+
+    # The rowid finds each row without an index on navigation_aid_id, and the id
+    # is checked too in case the rowids changed since they were read
+    updates = [(airport_id, row[0], row[1])
+               for row, (airport_id, _) in zip(navigation_aids, found) if airport_id is not None]
+
+    start = time.perf_counter()
+
+    with connection:
+        connection.executemany(
+            f'UPDATE navigation_aid SET airport_id = ? WHERE rowid = ? AND navigation_aid_id = ?'
+            f'{"" if replace else " AND airport_id IS NULL"};', updates)
+
+    write_seconds = time.perf_counter() - start
+    return JoinResult(len(tree), len(navigation_aids), len(updates), build_seconds, query_seconds, write_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Links each navigation aid with no airport to the nearest airport within a distance.')
+    parser.add_argument('database', help = 'path to the .db file')
+    parser.add_argument('max_distance_nm', type = float, help = 'the farthest an airport can be, in nautical miles')
+    parser.add_argument('--processes', type = int, default = 1, help = 'worker processes searching the tree')
+    parser.add_argument('--replace', action = 'store_true',
+                        help = 'also relink navigation aids that already have an airport')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        result = link_navigation_aids(connection, args.max_distance_nm, args.processes, args.replace)
+        print(f'Built a tree of {result.airports} airports in {result.build_seconds:.2f} s')
+        print(f'Searched for {result.navigation_aids} navigation aids in {result.query_seconds:.2f} s')
+        print(f'Linked {result.linked} navigation aids in {result.write_seconds:.2f} s')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
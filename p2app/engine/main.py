@@ -1,8 +1,12 @@
-import sqlite3
 import p2app.engine.application as application
 import p2app.engine.continent as continent
 import p2app.engine.country as country
 import p2app.engine.region as region
+import p2app.engine.airport as airport
+import p2app.engine.spatial as spatial_search
+import p2app.engine.indexes as indexes
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
 from p2app.events import *
 class Engine:
     """An object that represents the application's engine, whose main role is to
@@ -11,49 +15,76 @@ class Engine:
     unaware of any details of how the engine is implemented.
     """
 
-    def __init__(self):
-        """Initializes the engine"""
-        self.connection = None
-        self.path = None
+    def __init__(self, auto_create_indexes: bool = False, search_cache_bytes: int = 16 * 1024 * 1024):
+        """Initializes the engine. If auto_create_indexes is True, the recommended
+        secondary indexes are created whenever a database is opened; otherwise
+        the ones missing are reported. Cached search results are limited to
+        search_cache_bytes."""
+        self.connections = ConnectionManager(search_cache_bytes)
+        self.auto_create_indexes = auto_create_indexes
+
+        self.dispatcher = Dispatcher()
+        self.dispatcher.register(OpenDatabaseEvent, self.open_database, streams = True, needs_database = False)
+        self.dispatcher.register(CloseDatabaseEvent, application.close_database, needs_database = False)
+        self.dispatcher.register(QuitInitiatedEvent, application.quit_app, needs_database = False)
+
+        for module in (application, continent, country, region, airport, spatial_search):
+            module.register_handlers(self.dispatcher)
 
 
     def process_event(self, event):
         """A generator function that processes one event sent from the user interface,
         yielding zero or more events in response."""
-        if isinstance(event, QuitInitiatedEvent) or isinstance(event, OpenDatabaseEvent) or isinstance(event, CloseDatabaseEvent):
-            if isinstance(event, OpenDatabaseEvent):
-                self.connect_to_database(event)
-
-            yield application.application_events(self.path, event)
-
-        elif (isinstance(event, StartContinentSearchEvent) or isinstance(event, LoadContinentEvent) or
-              isinstance(event, SaveNewContinentEvent) or isinstance(event, SaveContinentEvent)):
-            if isinstance(event, StartContinentSearchEvent):
-                for i in continent.continent_events(self.path, event):
-                    yield i
-            else:
-                yield continent.continent_events(self.path, event)
-
-        elif (isinstance(event, StartCountrySearchEvent) or isinstance(event, LoadCountryEvent) or
-              isinstance(event, SaveNewCountryEvent) or isinstance(event, SaveCountryEvent)):
-            if isinstance(event, StartCountrySearchEvent):
-                for i in country.country_events(self.path, event):
-                    yield i
-            else:
-                yield country.country_events(self.path, event)
-
-        else:
-            if isinstance(event, StartRegionSearchEvent):
-                for i in region.region_events(self.path, event):
-                    yield i
-            else:
-                yield region.region_events(self.path, event)
-
-    def connect_to_database(self, event: OpenDatabaseEvent):
-        """
-        When an OpenDatabaseEvent occurs, initialize connection and path.
-        Also execute the foreign key constraints
-        """
-        self.path = event.path()
-        self.connection = sqlite3.connect(self.path)
-        self.connection.execute("PRAGMA foreign_keys = ON;")
\ No newline at end of file
+        self.connections.refresh()
+        yield from self.dispatcher.dispatch(self.connections, event)
+
+
+    def open_database(self, connections: ConnectionManager, event: OpenDatabaseEvent):
+        """
+        Opens the database named in the event, then checks it for missing
+        secondary indexes. Any that are missing and not created are reported in
+        an IndexReportEvent after the DatabaseOpenedEvent.
+        """
+        result = application.open_database(connections, event)
+        yield result
+
+        if isinstance(result, DatabaseOpenedEvent):
+            report = self.check_indexes()
+
+            if report is not None:
+                yield report
+
+
+    def interrupt(self):
+        """
+        Interrupts the query the engine is running, so a search that has been
+        superseded stops without reading the rest of its rows. Called from the
+        Tk thread while the engine runs on a worker thread.
+        """
+        self.connections.interrupt()
+
+
+    def stats(self) -> str:
+        """
+        Returns a summary of the engine's cache counters, shown in debug mode
+        """
+        return f'{self.connections.records}; {self.connections.searches}'
+
+
+    def check_indexes(self) -> IndexReportEvent | None:
+        """
+        Checks the newly opened database for missing secondary indexes, creating
+        them if the engine was asked to. Returns an IndexReportEvent describing
+        the indexes still missing, or None if there are none.
+        """
+        connection = self.connections.connection()
+        missing = indexes.missing_indexes(connection)
+
+        if not missing:
+            return None
+
+        if self.auto_create_indexes:
+            indexes.create_indexes(connection, missing)
+            return None
+
+        return IndexReportEvent(indexes.format_report(indexes.advise(connection), missing))
@@ -1,445 +1,550 @@
+import functools
 import sqlite3
 import p2app.events.continents as c
 import p2app.events.countries as cc
 import p2app.events.regions as r
+import p2app.events.airports as a
+import p2app.engine.search as search
+import p2app.events.search as match_modes
 
-def continent_search(path, continent_code, name):
+
+# How many rows a search reads from its cursor at a time
+_FETCH_SIZE = 500
+
+# The record each table's rows are read as. The fields of each are the table's
+# columns, in the order search.TABLE_COLUMNS gives them.
+RECORD_TYPES = {
+    'continent': c.Continent,
+    'country': cc.Country,
+    'region': r.Region,
+    'airport': a.Airport,
+    'runway': a.Runway,
+    'airport_frequency': a.AirportFrequency
+}
+
+
+@functools.cache
+def record_factory(record_type):
     """
-    Returns the continents resulting from a user's search
+    Returns a row factory that makes a cursor read each row as a record_type,
+    a namedtuple whose fields are the columns selected, in order. The row the
+    cursor reads becomes the record's values as it is, rather than being indexed
+    column by column into a call to the record's constructor. Each record type
+    has one factory, made the first time it is asked for.
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
-    continents = []
-
-    if continent_code and name:
-        query = """SELECT continent_id, continent_code, name
-        FROM continent
-        WHERE continent_code = ? AND name = ?;"""
-        cursor.execute(query, (continent_code, name))
-    elif continent_code:
-        query = """SELECT continent_id, continent_code, name
-        FROM continent
-        WHERE continent_code = ?;"""
-        cursor.execute(query, (continent_code,))
-    else:
-        query = """SELECT continent_id, continent_code, name
-        FROM continent
-        WHERE name = ?;"""
-        cursor.execute(query, (name,))
+    new = tuple.__new__
 
-    while True:
-        rows = cursor.fetchone()
-        if rows is None:
-            cursor.close()
-            break
-        continents.append(c.Continent(rows[0], rows[1], rows[2]))
+    def make_record(cursor, row):
+        return new(record_type, row)
 
+    return make_record
 
-    connection.close()
-    return continents
 
-def load_continent(path, continent_id):
+def record_cursor(connection, record_type) -> sqlite3.Cursor:
     """
-    Returns the continents resulting from a user's search
+    Returns a new cursor that reads each row as a record_type
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
     cursor = connection.cursor()
+    cursor.row_factory = record_factory(record_type)
+    return cursor
 
-    query = """SELECT continent_id, continent_code, name
-    FROM continent
-    WHERE continent_id = ?;"""
-    cursor.execute(query, (continent_id,))
 
-    rows = cursor.fetchone()
-    connection.close()
+def search_records(connection, table, criteria, order_by = (), limit = None,
+                   as_records = False) -> sqlite3.Cursor:
+    """
+    Runs a search built from the given criteria on a table and returns the cursor
+    positioned before the first matching row. The cursor reads each row as the
+    table's record type if as_records is True, and as a plain tuple otherwise.
+    """
+    query, parameters = search.build_select(table, criteria, order_by, limit)
 
-    return rows
+    if as_records:
+        return record_cursor(connection, RECORD_TYPES[table]).execute(query, parameters)
+    else:
+        return connection.execute(query, parameters)
 
 
-def save_continent(path, continent_data):
+def fetch_batches(cursor: sqlite3.Cursor, size: int = _FETCH_SIZE):
     """
-    Given continent data in a tuple (continent_id, continent_code, name),
-    updates the continent in the database.
+    Yields the rows of a cursor in lists of at most size rows, so only one
+    batch is held in memory at a time, and closes the cursor once they are exhausted
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    try:
+        while True:
+            rows = cursor.fetchmany(size)
 
-    query = """UPDATE continent
-    SET continent_code = ?,  name = ?
-    WHERE continent_id = ?;"""
-    cursor.execute(query, (continent_data[1], continent_data[2], continent_data[0]))
+            if not rows:
+                break
 
-    connection.commit()
-    connection.close()
+            yield rows
+    finally:
+        cursor.close()
 
 
-def unique_continent_id(path):
+def fetch_in_batches(cursor: sqlite3.Cursor):
     """
-    This function will loop through the existing continent_id's and
-    returns an integer, to be used as a valid continent_id for new continents.
+    Yields the rows of a cursor one at a time, reading them from the database
+    _FETCH_SIZE rows at a time, and closes the cursor once they are exhausted
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    for rows in fetch_batches(cursor):
+        yield from rows
+
 
-    query = """SELECT *
-    FROM continent;
+def search_page(connection, table, criteria, page_cursor, page_size) -> tuple[list, object]:
     """
+    Returns one page of a search, as records in primary key order, and the cursor
+    of the next page, or None if this is the last page. The cursor is the last
+    primary key on the page, so every page is read with an indexed range on the
+    primary key rather than an OFFSET that has to skip all of the earlier rows.
+    """
+    key = search.TABLE_COLUMNS[table][0]
 
-    cursor.execute(query)
+    if page_cursor is not None:
+        criteria = criteria + [search.Criterion(key, search.AFTER, page_cursor)]
 
+    cursor = search_records(connection, table, criteria, (key,), page_size + 1, as_records = True)
     rows = cursor.fetchall()
-    connection.close()
-    return rows
+    cursor.close()
+
+    if len(rows) > page_size:
+        return rows[:page_size], rows[page_size - 1][0]
+    else:
+        return rows, None
 
 
-def save_new_continent(path, continent_data):
+def continent_criteria(continent_code, name, match_mode) -> list[search.Criterion]:
     """
-    Given continent data in a tuple (continent_id, continent_code, name),
-    adds the continent in the database.
+    Returns the criteria of a continent search
     """
-    continent_id = unique_continent_id(path)[-1][0] + 1
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    criteria = search.equal_criteria(continent_code = continent_code)
+    criteria += search.name_criteria('name', name, match_mode)
+    return criteria
 
-    query = """INSERT INTO continent (continent_id, continent_code, name)
-    VALUES (?, ?, ?)"""
 
-    cursor.execute(query, (continent_id, continent_data[1], continent_data[2]))
+def continent_search(connection, continent_code, name, match_mode = match_modes.MATCH_EXACT):
+    """
+    Yields the continents resulting from a user's search, with the name
+    matched according to the match mode
+    """
+    criteria = continent_criteria(continent_code, name, match_mode)
 
-    connection.commit()
-    connection.close()
+    if not criteria:
+        return
 
-    return continent_id
+    yield from fetch_in_batches(search_records(connection, 'continent', criteria, as_records = True))
 
-def country_search(path, country_code, name):
+
+def continent_search_page(connection, continent_code, name, match_mode, page_cursor, page_size):
     """
-    Returns the countries resulting from a user's search
+    Returns one page of the continents resulting from a user's search, and the
+    cursor of the next page
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
-    countries = []
+    criteria = continent_criteria(continent_code, name, match_mode)
 
-    if country_code and name:
-        query = """SELECT country_id, country_code, name, continent_id, wikipedia_link, keywords
-        FROM country
-        WHERE country_code = ? AND name = ?;"""
-        cursor.execute(query, (country_code, name))
-    elif country_code:
-        query = """SELECT country_id, country_code, name, continent_id, wikipedia_link, keywords
-        FROM country
-        WHERE country_code = ?;"""
-        cursor.execute(query, (country_code,))
-    else:
-        query = """SELECT country_id, country_code, name, continent_id, wikipedia_link, keywords
-        FROM country
-        WHERE name = ?;"""
-        cursor.execute(query, (name,))
+    if not criteria:
+        return [], None
 
-    while True:
-        rows = cursor.fetchone()
-        if rows is None:
-            cursor.close()
-            break
-        countries.append(cc.Country(rows[0], rows[1], rows[2], rows[3], rows[4], rows[5]))
+    return search_page(connection, 'continent', criteria, page_cursor, page_size)
 
+def load_continent(connection, continent_id):
+    """
+    Returns the continent with the given id, or None if there is none
+    """
+    cursor = record_cursor(connection, c.Continent)
 
-    connection.close()
-    return countries
+    query = """SELECT continent_id, continent_code, name
+    FROM continent
+    WHERE continent_id = ?;"""
+    cursor.execute(query, (continent_id,))
+
+    return cursor.fetchone()
 
 
-def load_country(path, country_id):
+def save_continent(connection, continent_data) -> c.Continent:
     """
-    Returns the countries resulting from a user's search
+    Given continent data in a tuple (continent_id, continent_code, name),
+    updates the continent in the database and returns it as a Continent.
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    with connection:
+        cursor = connection.cursor()
 
-    query = """SELECT country_id, country_code, name, continent_id, wikipedia_link, keywords
-    FROM country
-    WHERE country_id = ?;"""
-    cursor.execute(query, (country_id,))
+        query = """UPDATE continent
+        SET continent_code = ?,  name = ?
+        WHERE continent_id = ?;"""
+        cursor.execute(query, (continent_data[1], continent_data[2], continent_data[0]))
+
+    return c.Continent._make(continent_data)
+
+
+def save_new_continent(connection, continent_data) -> c.Continent:
+    """
+    Given continent data in a tuple (continent_id, continent_code, name),
+    adds the continent in the database and returns it as a Continent. The
+    continent_id is assigned by SQLite as part of the insert.
+    """
+    with connection:
+        cursor = connection.cursor()
 
-    rows = cursor.fetchone()
-    connection.close()
+        query = """INSERT INTO continent (continent_code, name)
+        VALUES (?, ?)"""
 
-    return rows
+        cursor.execute(query, (continent_data[1], continent_data[2]))
 
+    return c.Continent(cursor.lastrowid, *continent_data[1:])
 
-def save_country(path, country_data):
+def country_criteria(country_code, name, match_mode) -> list[search.Criterion]:
     """
-    Given country data in a tuple ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
-    updates the country in the database.
+    Returns the criteria of a country search
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
-    if country_data[5] == '':
-        query = """UPDATE country
-        SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?, keywords = NULL
-        WHERE country_id = ?;"""
-        cursor.execute(query, (country_data[1], country_data[2], country_data[3],
-                               country_data[4], country_data[0]))
-    else:
-        query = """UPDATE country
-        SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?, keywords = ?
-        WHERE country_id = ?;"""
-        cursor.execute(query, (country_data[1], country_data[2], country_data[3],
-                               country_data[4], country_data[5], country_data[0]))
+    criteria = search.equal_criteria(country_code = country_code)
+    criteria += search.name_criteria('name', name, match_mode)
+    return criteria
+
+
+def country_search(connection, country_code, name, match_mode = match_modes.MATCH_EXACT):
+    """
+    Yields the countries resulting from a user's search, with the name
+    matched according to the match mode
+    """
+    criteria = country_criteria(country_code, name, match_mode)
 
+    if not criteria:
+        return
 
-    connection.commit()
-    connection.close()
+    yield from fetch_in_batches(search_records(connection, 'country', criteria, as_records = True))
 
 
-def unique_country_id(path):
+def country_search_page(connection, country_code, name, match_mode, page_cursor, page_size):
     """
-    This function will loop through the existing country_id's and
-    returns an integer, to be used as a valid country_id for new continents.
+    Returns one page of the countries resulting from a user's search, and the
+    cursor of the next page
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    criteria = country_criteria(country_code, name, match_mode)
+
+    if not criteria:
+        return [], None
+
+    return search_page(connection, 'country', criteria, page_cursor, page_size)
+
 
-    query = """SELECT *
-    FROM country;
+def load_country(connection, country_id):
     """
+    Returns the country with the given id, or None if there is none
+    """
+    cursor = record_cursor(connection, cc.Country)
 
-    cursor.execute(query)
+    query = """SELECT country_id, country_code, name, continent_id, wikipedia_link, keywords
+    FROM country
+    WHERE country_id = ?;"""
+    cursor.execute(query, (country_id,))
 
-    rows = cursor.fetchall()
-    return rows
+    return cursor.fetchone()
 
 
-def save_new_country(path, country_data):
+def save_country(connection, country_data) -> cc.Country:
     """
     Given country data in a tuple ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
-    adds the country in the database.
+    updates the country in the database and returns it as a Country.
     """
-    country_id = unique_country_id(path)[-1][0] + 1
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    with connection:
+        cursor = connection.cursor()
+        if country_data[5] == '':
+            query = """UPDATE country
+            SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?, keywords = NULL
+            WHERE country_id = ?;"""
+            cursor.execute(query, (country_data[1], country_data[2], country_data[3],
+                                   country_data[4], country_data[0]))
+        else:
+            query = """UPDATE country
+            SET country_code = ?, name = ?, continent_id = ?, wikipedia_link = ?, keywords = ?
+            WHERE country_id = ?;"""
+            cursor.execute(query, (country_data[1], country_data[2], country_data[3],
+                                   country_data[4], country_data[5], country_data[0]))
 
-    if country_data[5] == '':
-        query = """INSERT INTO country (country_id, country_code, name, continent_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, NULL)"""
+    return cc.Country._make(country_data)
 
-        cursor.execute(query, (country_id, country_data[1], country_data[2], country_data[3],
-                               country_data[4]))
-    else:
-        query = """INSERT INTO country (country_id, country_code, name, continent_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, ?)"""
 
-        cursor.execute(query, (country_id, country_data[1], country_data[2], country_data[3],
-                               country_data[4], country_data[5]))
+def save_new_country(connection, country_data) -> cc.Country:
+    """
+    Given country data in a tuple ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
+    adds the country in the database and returns it as a Country. The
+    country_id is assigned by SQLite as part of the insert.
+    """
+    with connection:
+        cursor = connection.cursor()
 
-    connection.commit()
-    connection.close()
+        query = """INSERT INTO country (country_code, name, continent_id, wikipedia_link, keywords)
+        VALUES (?, ?, ?, ?, ?)"""
+
+        cursor.execute(query, (country_data[1], country_data[2], country_data[3],
+                               country_data[4], country_data[5] or None))
 
-    return country_id
+    return cc.Country(cursor.lastrowid, *country_data[1:])
 
 
-def region_search(path, region_code, local_code, name):
+def region_criteria(region_code, local_code, name, match_mode) -> list[search.Criterion]:
     """
-    Returns the region resulting from a user's search
+    Returns the criteria of a region search
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
-    regions = []
+    criteria = search.equal_criteria(region_code = region_code, local_code = local_code)
+    criteria += search.name_criteria('name', name, match_mode)
+    return criteria
 
-    if region_code and local_code and name:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE region_code = ? AND local_code = ? AND name = ?;"""
-        cursor.execute(query, (region_code, local_code, name))
 
-    elif region_code and local_code:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE region_code = ? AND local_code = ?;"""
-        cursor.execute(query, (region_code, local_code))
+def region_search(connection, region_code, local_code, name, match_mode = match_modes.MATCH_EXACT):
+    """
+    Yields the regions resulting from a user's search, with the name
+    matched according to the match mode
+    """
+    criteria = region_criteria(region_code, local_code, name, match_mode)
 
-    elif region_code and name:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE region_code = ? AND name = ?;"""
-        cursor.execute(query, (region_code, name))
+    if not criteria:
+        return
 
-    elif local_code and name:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE local_code = ? AND name = ?;"""
-        cursor.execute(query, (local_code, name))
+    yield from fetch_in_batches(search_records(connection, 'region', criteria, as_records = True))
 
-    elif region_code:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE region_code = ?;"""
-        cursor.execute(query, (region_code,))
 
-    elif local_code:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE local_code = ?"""
-        cursor.execute(query, (local_code,))
+def region_search_page(connection, region_code, local_code, name, match_mode, page_cursor, page_size):
+    """
+    Returns one page of the regions resulting from a user's search, and the
+    cursor of the next page
+    """
+    criteria = region_criteria(region_code, local_code, name, match_mode)
 
-    elif name:
-        query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
-        FROM region
-        WHERE name = ?;"""
-        cursor.execute(query, (name,))
+    if not criteria:
+        return [], None
 
-    while True:
-        rows = cursor.fetchone()
-        if rows is None:
-            cursor.close()
-            break
-        regions.append(r.Region(rows[0], rows[1], rows[2], rows[3], rows[4], rows[5], rows[6], rows[7]))
+    return search_page(connection, 'region', criteria, page_cursor, page_size)
 
 
-    connection.close()
-    return regions
+def load_regions(connection, region_ids) -> list[r.Region]:
+    """
+    Returns the regions with the given ids, in no particular order. Ids of
+    regions that do not exist are left out.
+    """
+    criteria = [search.Criterion('region_id', search.IN, region_ids)]
+    return list(fetch_in_batches(search_records(connection, 'region', criteria, as_records = True)))
 
-def load_region(path, region_id):
+def load_region(connection, region_id):
     """
-    Returns the regions resulting from a user's search
+    Returns the region with the given id, or None if there is none
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    cursor = record_cursor(connection, r.Region)
 
     query = """SELECT region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords
     FROM region
     WHERE region_id = ?;"""
     cursor.execute(query, (region_id,))
 
-    rows = cursor.fetchone()
-    connection.close()
+    return cursor.fetchone()
+
+
+
+def save_region(connection, region_data) -> r.Region:
+    """
+    Given region data in a tuple ('region_id', 'region_code', 'local_code', 'name',
+    'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
+    updates the region in the database and returns it as a Region.
+    """
+    with connection:
+        cursor = connection.cursor()
+        if region_data[6] and region_data[7]:
+            query = """UPDATE region
+            SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = ?, keywords = ?
+            WHERE region_id = ?;"""
+            cursor.execute(query, (region_data[1], region_data[2], region_data[3],
+                                   region_data[4], region_data[5], region_data[6], region_data[7],
+                                   region_data[0]))
+
+        elif region_data[6] == '' and region_data[7] == '':
+            query = """UPDATE region
+            SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = NULL, keywords = NULL
+            WHERE region_id = ?;"""
+            cursor.execute(query, (region_data[1], region_data[2], region_data[3],
+                                   region_data[4], region_data[5], region_data[0]))
 
-    return rows
+        elif region_data[6] == '' and region_data[7]:
+            query = """UPDATE region
+            SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = NULL, keywords = ?
+            WHERE region_id = ?;"""
+            cursor.execute(query, (region_data[1], region_data[2], region_data[3], region_data[4],
+                                   region_data[5], region_data[7], region_data[0]))
 
+        elif region_data[6] and region_data[7] == '':
+            query = """UPDATE region
+            SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = ?, keywords = NULL
+            WHERE region_id = ?;"""
+            cursor.execute(query, (region_data[1], region_data[2], region_data[3], region_data[4],
+                                   region_data[5], region_data[6], region_data[0]))
 
+    return r.Region._make(region_data)
 
-def save_region(path, region_data):
+
+
+def save_new_region(connection, region_data) -> r.Region:
     """
     Given region data in a tuple ('region_id', 'region_code', 'local_code', 'name',
     'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
-    updates the region in the database.
+    adds the region in the database and returns it as a Region. The region_id
+    is assigned by SQLite as part of the insert.
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
-    if region_data[6] and region_data[7]:
-        query = """UPDATE region
-        SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = ?, keywords = ?
-        WHERE region_id = ?;"""
-        cursor.execute(query, (region_data[1], region_data[2], region_data[3],
-                               region_data[4], region_data[5], region_data[6], region_data[7],
-                               region_data[0]))
-
-    elif region_data[6] == '' and region_data[7] == '':
-        query = """UPDATE region
-        SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = NULL, keywords = NULL
-        WHERE region_id = ?;"""
-        cursor.execute(query, (region_data[1], region_data[2], region_data[3],
-                               region_data[4], region_data[5], region_data[0]))
-
-    elif region_data[6] == '' and region_data[7]:
-        query = """UPDATE region
-        SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = NULL, keywords = ?
-        WHERE region_id = ?;"""
-        cursor.execute(query, (region_data[1], region_data[2], region_data[3], region_data[4],
-                               region_data[5], region_data[7], region_data[0]))
+    with connection:
+        cursor = connection.cursor()
 
-    elif region_data[6] and region_data[7] == '':
-        query = """UPDATE region
-        SET region_code = ?, local_code = ?, name = ?, continent_id = ?, country_id = ?, wikipedia_link = ?, keywords = NULL
-        WHERE region_id = ?;"""
+        query = """INSERT INTO region (region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords)
+        VALUES (?, ?, ?, ?, ?, ?, ?)"""
         cursor.execute(query, (region_data[1], region_data[2], region_data[3], region_data[4],
-                               region_data[5], region_data[6], region_data[0]))
+                               region_data[5], region_data[6] or None, region_data[7] or None))
 
+    return r.Region(cursor.lastrowid, *region_data[1:])
 
-    connection.commit()
-    connection.close()
 
+def airport_criteria(airport_ident, iata_code, gps_code, local_code, name, airport_type,
+                     country_id, region_id, scheduled_service, match_mode) -> list[search.Criterion]:
+    """
+    Returns the criteria of an airport search. Each code is matched exactly,
+    using its index, and the name according to the match mode.
+    """
+    criteria = search.equal_criteria(airport_ident = airport_ident, iata_code = iata_code,
+                                     gps_code = gps_code, local_code = local_code, type = airport_type,
+                                     country_id = country_id, region_id = region_id,
+                                     scheduled_service = scheduled_service)
+    criteria += search.name_criteria('name', name, match_mode)
+    return criteria
 
 
-def unique_region_id(path):
+def airport_search(connection, airport_ident = None, iata_code = None, gps_code = None, local_code = None,
+                   name = None, airport_type = None, country_id = None, region_id = None,
+                   scheduled_service = None, match_mode = match_modes.MATCH_EXACT):
     """
-    This function will loop through the existing region_id's and
-    returns an integer, to be used as a valid region_id for new regions.
+    Yields the airports resulting from a user's search, with the name
+    matched according to the match mode
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    criteria = airport_criteria(airport_ident, iata_code, gps_code, local_code, name, airport_type,
+                                country_id, region_id, scheduled_service, match_mode)
+
+    if not criteria:
+        return
+
+    yield from fetch_in_batches(search_records(connection, 'airport', criteria, as_records = True))
 
-    query = """SELECT *
-    FROM region;
+
+def airport_search_page(connection, airport_ident, iata_code, gps_code, local_code, name, airport_type,
+                        country_id, region_id, scheduled_service, match_mode, page_cursor, page_size):
+    """
+    Returns one page of the airports resulting from a user's search, and the
+    cursor of the next page
     """
+    criteria = airport_criteria(airport_ident, iata_code, gps_code, local_code, name, airport_type,
+                                country_id, region_id, scheduled_service, match_mode)
 
-    cursor.execute(query)
+    if not criteria:
+        return [], None
 
-    rows = cursor.fetchall()
-    connection.close()
-    return rows
+    return search_page(connection, 'airport', criteria, page_cursor, page_size)
 
 
-def save_new_region(path, region_data):
+def load_airport(connection, airport_id):
     """
-    Given region data in a tuple ('region_id', 'region_code', 'local_code', 'name',
-    'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
-    adds the region in the database.
+    Returns the airport with the given id, or None if there is none
     """
-    region_id = unique_region_id(path)[-1][0] + 1
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
-    cursor = connection.cursor()
+    criteria = [search.Criterion('airport_id', search.EQUALS, airport_id)]
+    return search_records(connection, 'airport', criteria, as_records = True).fetchone()
+
+
+def load_airport_details(connection, airport_ids) -> list[a.AirportDetails]:
+    """
+    Returns the airports with the given ids, in the order of the ids, each with
+    all of its runways and frequencies. However many airports are asked for,
+    this runs three queries, one per table, each passing every id at once as a
+    JSON array. Ids that have no airport are left out.
+    """
+    airport_ids = list(dict.fromkeys(airport_ids))
+    criteria = [search.Criterion('airport_id', search.IN, airport_ids)]
+
+    airports = {}
+    runways = {}
+    frequencies = {}
+
+    for airport in fetch_in_batches(search_records(connection, 'airport', criteria, as_records = True)):
+        airports[airport.airport_id] = airport
+        runways[airport.airport_id] = []
+        frequencies[airport.airport_id] = []
+
+    for runway in fetch_in_batches(search_records(connection, 'runway', criteria, as_records = True)):
+        runways[runway.airport_id].append(runway)
 
-    if region_data[6] and region_data[7]:
-        query = """INSERT INTO region (region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
-        cursor.execute(query, (region_id, region_data[1], region_data[2], region_data[3],
-                               region_data[4], region_data[5], region_data[6], region_data[7]))
+    for frequency in fetch_in_batches(search_records(connection, 'airport_frequency', criteria, as_records = True)):
+        frequencies[frequency.airport_id].append(frequency)
 
-    elif region_data[6] == '' and region_data[7] == '':
-        query = """INSERT INTO region (region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, ?, NULL, NULL)"""
-        cursor.execute(query, (
-        region_id, region_data[1], region_data[2], region_data[3], region_data[4], region_data[5]))
+    return [a.AirportDetails(airports[airport_id], tuple(runways[airport_id]), tuple(frequencies[airport_id]))
+            for airport_id in airport_ids if airport_id in airports]
 
-    elif region_data[6] == '' and region_data[7]:
-        query = """INSERT INTO region (region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, ?, NULL, ?)"""
-        cursor.execute(query, (
-        region_id, region_data[1], region_data[2], region_data[3], region_data[4], region_data[5], region_data[7]))
 
-    elif region_data[6] and region_data[7] == '':
-        query = """INSERT INTO region (region_id, region_code, local_code, name, continent_id, country_id, wikipedia_link, keywords)
-        VALUES (?, ?, ?, ?, ?, ?, ?, NULL)"""
-        cursor.execute(query, (
-        region_id, region_data[1], region_data[2], region_data[3], region_data[4], region_data[5], region_data[6]))
+def save_airport(connection, airport_data) -> a.Airport:
+    """
+    Given airport data in a tuple in the order of the airport table's columns,
+    updates the airport in the database and returns it as an Airport, as it was
+    stored. Empty optional values are stored as NULL.
+    """
+    values = _airport_values(airport_data)
+
+    with connection:
+        query = """UPDATE airport
+        SET airport_ident = ?, type = ?, name = ?, latitude_deg = ?, longitude_deg = ?, elevation_ft = ?,
+        continent_id = ?, country_id = ?, region_id = ?, municipality = ?, scheduled_service = ?,
+        gps_code = ?, iata_code = ?, local_code = ?, home_link = ?, wikipedia_link = ?, keywords = ?
+        WHERE airport_id = ?;"""
+        connection.execute(query, values + (airport_data[0],))
+
+    return a.Airport(airport_data[0], *values)
+
+
+def save_new_airport(connection, airport_data) -> a.Airport:
+    """
+    Given airport data in a tuple in the order of the airport table's columns,
+    adds the airport in the database and returns it as an Airport, as it was
+    stored. The airport_id is assigned by SQLite as part of the insert.
+    """
+    values = _airport_values(airport_data)
+
+    with connection:
+        query = """INSERT INTO airport (airport_ident, type, name, latitude_deg, longitude_deg, elevation_ft,
+        continent_id, country_id, region_id, municipality, scheduled_service,
+        gps_code, iata_code, local_code, home_link, wikipedia_link, keywords)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+        cursor = connection.execute(query, values)
 
-    connection.commit()
-    connection.close()
+    return a.Airport(cursor.lastrowid, *values)
 
-    return region_id
+
+# The positions of the airport columns that may be NULL
+_OPTIONAL_AIRPORT_COLUMNS = {6, 10, 12, 13, 14, 15, 16, 17}
+
+
+def _airport_values(airport_data) -> tuple:
+    """
+    Returns the values of every airport column but the id, with empty optional
+    values turned into None
+    """
+    return tuple(None if value == '' and index in _OPTIONAL_AIRPORT_COLUMNS else value
+                 for index, value in enumerate(airport_data) if index != 0)
+
+
+def table_exists(connection, table) -> bool:
+    """
+    Returns True if the database has a table or virtual table with the given name
+    """
+    row = connection.execute(
+        'SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?;', ('table', table)).fetchone()
+    return row is not None
 
 
-def check_for_tables(path) -> bool:
+def check_for_tables(connection) -> bool:
     """
     Checks if the .db file has continent, country, and region tables
     Returns True if they all exist, else False
     """
-    connection = sqlite3.connect(path)
-    connection.execute("PRAGMA foreign_keys = ON;")
     cursor = connection.cursor()
 
     try:
@@ -454,10 +559,8 @@ def check_for_tables(path) -> bool:
         """)
 
         cursor.close()
-        connection.close()
         return True
 
-    except sqlite3.OperationalError:
+    except sqlite3.DatabaseError:
         cursor.close()
-        connection.close()
         return False
@@ -1,77 +1,126 @@
 import sqlite3
+from collections.abc import Iterator
 import p2app.events.regions as regions
 import p2app.engine.query as query
+import p2app.engine.fulltext as fulltext
+import p2app.events.search as match_modes
 import p2app.events.app as app
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
 
-def region_search_data(event: regions.StartRegionSearchEvent) -> tuple:
+def region_search_data(event: regions.StartRegionSearchEvent | regions.LoadRegionSearchPageEvent) -> tuple:
     """
     Retrieves user entered data when searching for a region.
-    The data is returned in the form of a tuple, (region code, local code, name)
+    The data is returned in the form of a tuple, (region code, local code, name, match mode)
     """
-    return event.region_code(), event.local_code(), event.name()
+    return event.region_code(), event.local_code(), event.name(), event.match_mode()
 
 
-def region_search_result(path: str, data: tuple) -> list[regions.RegionSearchResultEvent]:
+def region_search_result(connections: ConnectionManager, data: tuple) -> Iterator[regions.RegionSearchResultEvent |
+                                                                                  app.ErrorEvent]:
     """
-    Returns a list of RegionSearchResultEvent for each region found in the search
+    Yields a RegionSearchResultEvent for each region found in the search as soon as
+    it is read, so the first results reach the view before the search finishes
     """
-    search_result = query.region_search(path, data[0], data[1], data[2])
-    search_result_list = []
+    if data[3] == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'region'):
+        yield app.ErrorEvent('Full-text search is not enabled for this database!')
+        return
+
+    search_result = connections.searches.get('region', data)
+
+    if search_result is None:
+        search_result = connections.searches.collect(
+            'region', data, query.region_search(connections.connection(), data[0], data[1], data[2], data[3]))
 
     for region in search_result:
-        search_result_list.append(regions.RegionSearchResultEvent(region))
+        yield regions.RegionSearchResultEvent(region)
+
+
+
+def region_search(connections: ConnectionManager, event: regions.StartRegionSearchEvent) -> Iterator[regions.RegionSearchResultEvent |
+                                                                                                     app.ErrorEvent]:
+    """
+    Yields the events of a search for the region data in the given event
+    """
+    return region_search_result(connections, region_search_data(event))
+
+
+def load_region_search_page(connections: ConnectionManager, event: regions.LoadRegionSearchPageEvent) -> (regions.RegionSearchPageEvent |
+                                                                                                          app.ErrorEvent):
+    """
+    Returns a RegionSearchPageEvent holding one page of the regions found in the
+    search, as a RegionBatch, and the cursor that loads the page after it. Pages
+    are served from the search cache when they are there.
+    """
+    if event.match_mode() == match_modes.MATCH_FULL_TEXT and not fulltext.is_enabled(connections.connection(), 'region'):
+        return app.ErrorEvent('Full-text search is not enabled for this database!')
 
-    return search_result_list
+    data = region_search_data(event)
+    regions_found, next_page_cursor = connections.searches.page(
+        'region', data, event.page_cursor(), event.page_size(),
+        lambda page_cursor, count: query.region_search_page(connections.connection(), *data, page_cursor, count))
 
+    return regions.RegionSearchPageEvent(regions.RegionBatch(regions_found), next_page_cursor)
 
 
-def load_region(path: str, event: regions.LoadRegionEvent) -> regions.RegionLoadedEvent | app.ErrorEvent:
+def load_region_search_rows(connections: ConnectionManager, event: regions.LoadRegionSearchRowsEvent) -> regions.RegionSearchRowsEvent:
+    """
+    Returns a RegionSearchRowsEvent holding the regions with the ids in the given
+    event, as a RegionBatch
+    """
+    return regions.RegionSearchRowsEvent(regions.RegionBatch(query.load_regions(connections.connection(), event.region_ids())))
+
+
+def load_region(connections: ConnectionManager, event: regions.LoadRegionEvent) -> regions.RegionLoadedEvent | app.ErrorEvent:
     """
     Returns a RegionLoadedEvent using the data from the given event in a query
     """
     try:
         region_id = event.region_id()
-        region_data = query.load_region(path, region_id)
-        return regions.RegionLoadedEvent(regions.Region(region_data[0], region_data[1], region_data[2],
-                                                        region_data[3], region_data[4], region_data[5],
-                                                        region_data[6], region_data[7]))
+        region = connections.records.get('region', region_id)
+
+        if region is None:
+            region = query.load_region(connections.connection(), region_id)
+
+            if region is None:
+                raise LookupError(f'There is no region with the id {region_id}')
+
+            connections.records.put('region', region_id, region)
+
+        return regions.RegionLoadedEvent(region)
     except:
         return app.ErrorEvent('There was an error when loading the region!')
 
 
-def save_region(path: str, event: regions.SaveRegionEvent) -> (regions.RegionSavedEvent |
-                                                               regions.SaveRegionFailedEvent):
+def save_region(connections: ConnectionManager, event: regions.SaveRegionEvent) -> (regions.RegionSavedEvent |
+                                                                                    regions.SaveRegionFailedEvent):
     """
     Given the data from the event ('region_id', 'region_code', 'local_code', 'name',
     'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
     updates the data using a query and return a RegionSavedEvent
     """
     try:
-        region_update_data = event.region()
-        query.save_region(path, region_update_data)
-        return regions.RegionSavedEvent(regions.Region(region_update_data[0], region_update_data[1],
-                                                       region_update_data[2], region_update_data[3],
-                                                       region_update_data[4], region_update_data[5],
-                                                       region_update_data[6], region_update_data[7]))
+        region = query.save_region(connections.connection(), event.region())
+        connections.searches.invalidate_table('region')
+        connections.records.invalidate('region', region.region_id)
+        return regions.RegionSavedEvent(region)
 
     except sqlite3.IntegrityError:
         return save_new_region_fail()
 
 
-def save_new_region(path: str, event: regions.SaveNewRegionEvent) -> (regions.RegionSavedEvent |
-                                                                      regions.SaveRegionFailedEvent):
+def save_new_region(connections: ConnectionManager, event: regions.SaveNewRegionEvent) -> (regions.RegionSavedEvent |
+                                                                                           regions.SaveRegionFailedEvent):
     """"
     Given the data from the event ('region_id', 'region_code', 'local_code', 'name',
     'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
     insert the data using a query and return a RegionSavedEvent
     """
     try:
-        region_update_data = event.region()
-        returned_id = query.save_new_region(path, region_update_data)
-        return regions.RegionSavedEvent(regions.Region(returned_id, region_update_data[1],
-                                                       region_update_data[2],region_update_data[3],
-                                                       region_update_data[4], region_update_data[5],
-                                                       region_update_data[6], region_update_data[7]))
+        region = query.save_new_region(connections.connection(), event.region())
+        connections.searches.invalidate_table('region')
+        connections.records.invalidate('region', region.region_id)
+        return regions.RegionSavedEvent(region)
 
     except sqlite3.IntegrityError:
         return save_new_region_fail()
@@ -83,20 +132,13 @@ def save_new_region_fail() -> regions.SaveRegionFailedEvent:
     return regions.SaveRegionFailedEvent("Saving the region failed!")
 
 
-def region_events(path, event):
+def register_handlers(dispatcher: Dispatcher) -> None:
     """
-    Processes all region related events
+    Registers the handlers of all region related events
     """
-    if isinstance(event, regions.StartRegionSearchEvent):
-        data = region_search_data(event)
-        search_result_list = region_search_result(path, data)
-        return search_result_list
-
-    elif isinstance(event, regions.LoadRegionEvent):
-        return load_region(path, event)
-
-    elif isinstance(event, regions.SaveNewRegionEvent):
-        return save_new_region(path, event)
-
-    elif isinstance(event, regions.SaveRegionEvent):
-        return save_region(path, event)
\ No newline at end of file
+    dispatcher.register(regions.StartRegionSearchEvent, region_search, streams = True)
+    dispatcher.register(regions.LoadRegionSearchPageEvent, load_region_search_page)
+    dispatcher.register(regions.LoadRegionSearchRowsEvent, load_region_search_rows)
+    dispatcher.register(regions.LoadRegionEvent, load_region)
+    dispatcher.register(regions.SaveNewRegionEvent, save_new_region)
+    dispatcher.register(regions.SaveRegionEvent, save_region)
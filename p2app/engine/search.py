@@ -0,0 +1,206 @@
+import json
+from collections import namedtuple
+import p2app.events.search as match_modes
+
+
+TABLE_COLUMNS = {
+    'continent': ('continent_id', 'continent_code', 'name'),
+    'country': ('country_id', 'country_code', 'name', 'continent_id', 'wikipedia_link', 'keywords'),
+    'region': ('region_id', 'region_code', 'local_code', 'name',
+               'continent_id', 'country_id', 'wikipedia_link', 'keywords'),
+    'airport': ('airport_id', 'airport_ident', 'type', 'name', 'latitude_deg', 'longitude_deg',
+                'elevation_ft', 'continent_id', 'country_id', 'region_id', 'municipality',
+                'scheduled_service', 'gps_code', 'iata_code', 'local_code', 'home_link',
+                'wikipedia_link', 'keywords'),
+    'runway': ('runway_id', 'airport_id', 'length_ft', 'width_ft', 'surface', 'lighted', 'closed',
+               'le_ident', 'le_latitude_deg', 'le_longitude_deg', 'le_elevation_ft', 'le_heading_deg',
+               'le_displaced_threshold_ft', 'he_ident', 'he_latitude_deg', 'he_longitude_deg',
+               'he_elevation_ft', 'he_heading_deg', 'he_displaced_threshold_ft'),
+    'airport_frequency': ('airport_frequency_id', 'airport_id', 'type', 'description', 'frequency_mhz'),
+    'navigation_aid': ('navigation_aid_id', 'filename', 'ident', 'name', 'type', 'frequency_khz', 'latitude_deg',
+                       'longitude_deg', 'elevation_ft', 'iso_country', 'dme_frequency_khz', 'dme_channel',
+                       'dme_latitude_deg', 'dme_longitude_deg', 'dme_elevation_ft', 'adjusted_variation_deg',
+                       'magnetic_variation_deg', 'usage_type', 'power', 'airport_id')
+}
+
+# The columns covered by each table's FTS5 index, named <table>_fts
+FULL_TEXT_COLUMNS = {
+    'continent': ('name',),
+    'country': ('name', 'keywords'),
+    'region': ('name', 'keywords'),
+    'airport': ('name', 'keywords')
+}
+
+EQUALS = '='
+PREFIX = 'prefix'
+IN = 'in'
+BETWEEN = 'between'
+MATCH = 'match'
+AFTER = 'after'
+
+
+Criterion = namedtuple('Criterion', ['column', 'operator', 'value'])
+
+Criterion.__annotations__ = {
+    'column': str,
+    'operator': str,
+    'value': object
+}
+
+
+def equal_criteria(**values) -> list[Criterion]:
+    """
+    Returns an EQUALS criterion for every keyword argument that has a value.
+    Arguments that are None or empty are left out, the same way an empty search
+    field is ignored.
+    """
+    return [Criterion(column, EQUALS, value) for column, value in values.items()
+            if value is not None and value != '']
+
+
+def match_expression(text: str) -> str:
+    """
+    Turns text typed by the user into an FTS5 query that matches rows containing
+    every word, each word as a prefix. Quoting each word keeps FTS5 syntax
+    characters in the text from being interpreted.
+    """
+    words = text.split()
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+def name_criteria(column: str, value: str | None, match_mode: str) -> list[Criterion]:
+    """
+    Returns the criterion for a name typed into a search, matched according to
+    the match mode of the search event
+    """
+    if value is None or value == '':
+        return []
+    elif match_mode == match_modes.MATCH_PREFIX:
+        return [Criterion(column, PREFIX, value)]
+    elif match_mode == match_modes.MATCH_FULL_TEXT:
+        return [Criterion(column, MATCH, value)]
+    else:
+        return [Criterion(column, EQUALS, value)]
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """
+    Returns the smallest string that is greater than every string starting with
+    the given prefix, or None if there is no such string
+    """
+    while prefix:
+        last = ord(prefix[-1])
+
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+
+        prefix = prefix[:-1]
+
+    return None
+
+
+def _compile_criterion(table: str, criterion: Criterion) -> tuple[list[str], list]:
+    """
+    Returns the SQL conditions and the parameters for one criterion
+    """
+    column, operator, value = criterion
+    column = f'{table}.{column}'
+
+    if operator == EQUALS:
+        return [f'{column} = ?'], [value]
+
+    elif operator == PREFIX:
+        # A range instead of LIKE, so that an index on the column can be used
+        upper = _prefix_upper_bound(value)
+
+        if upper is None:
+            return [f'{column} >= ?'], [value]
+        else:
+            return [f'{column} >= ?', f'{column} < ?'], [value, upper]
+
+    elif operator == IN:
+        # The values are passed as one JSON array, so the SQL text is the same
+        # however many values there are
+        return [f'{column} IN (SELECT value FROM json_each(?))'], [json.dumps(list(value))]
+
+    elif operator == BETWEEN:
+        low, high = value
+
+        if low is not None and high is not None:
+            return [f'{column} BETWEEN ? AND ?'], [low, high]
+        elif low is not None:
+            return [f'{column} >= ?'], [low]
+        elif high is not None:
+            return [f'{column} <= ?'], [high]
+        else:
+            return [], []
+
+    elif operator == AFTER:
+        return [f'{column} > ?'], [value]
+
+    elif operator == MATCH:
+        # Matches against every column in the table's full-text index
+        return [f'{table}_fts MATCH ?'], [match_expression(value)]
+
+    raise ValueError(f'Unknown search operator: {operator}')
+
+
+def build_select(table: str, criteria: list[Criterion],
+                 order_by: tuple[str, ...] = (), limit: int | None = None,
+                 selected: tuple[str, ...] | None = None) -> tuple[str, list]:
+    """
+    Compiles a search on a table into a parameterized SELECT statement and its
+    parameters. The criteria are put into a canonical order first, so the same
+    set of criteria always produces the same SQL text and sqlite3's statement
+    cache can reuse the prepared statement. A column in order_by may start with
+    '-' to sort it in descending order. A full-text search with no order_by is
+    ranked by relevance. Every column of the table is selected unless selected
+    names the ones wanted.
+    """
+    columns = TABLE_COLUMNS[table]
+
+    for column in selected or ():
+        if column not in columns:
+            raise ValueError(f'Unknown column for {table}: {column}')
+    conditions = []
+    parameters = []
+    is_full_text = False
+
+    for criterion in sorted(criteria, key = lambda c: (c.column, c.operator)):
+        if criterion.column not in columns:
+            raise ValueError(f'Unknown column for {table}: {criterion.column}')
+
+        criterion_conditions, criterion_parameters = _compile_criterion(table, criterion)
+        conditions.extend(criterion_conditions)
+        parameters.extend(criterion_parameters)
+        is_full_text = is_full_text or criterion.operator == MATCH
+
+    query = f'SELECT {", ".join(f"{table}.{column}" for column in selected or columns)} FROM {table}'
+
+    if is_full_text:
+        query += f' JOIN {table}_fts ON {table}_fts.rowid = {table}.{columns[0]}'
+
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+
+    if order_by:
+        terms = []
+
+        for column in order_by:
+            descending = column.startswith('-')
+            column = column.lstrip('-')
+
+            if column not in columns:
+                raise ValueError(f'Unknown column for {table}: {column}')
+
+            terms.append(f'{table}.{column} DESC' if descending else f'{table}.{column}')
+
+        query += ' ORDER BY ' + ', '.join(terms)
+    elif is_full_text:
+        query += f' ORDER BY {table}_fts.rank'
+
+    if limit is not None:
+        query += ' LIMIT ?'
+        parameters.append(limit)
+
+    return query + ';', parameters
@@ -0,0 +1,262 @@
+import argparse
+import math
+import sqlite3
+import p2app.engine.query as query
+import p2app.engine.search as search
+import p2app.events.airports as airports
+import p2app.events.navigation_aids as navigation_aids
+import p2app.events.spatial as places
+import p2app.events.app as app
+from p2app.engine.connection import ConnectionManager
+from p2app.engine.dispatch import Dispatcher
+
+
+# The mean radius of the Earth in nautical miles, a nautical mile being about
+# one minute of arc along a great circle
+EARTH_RADIUS_NM = 3440.065
+
+# The tables that can be searched by position, with the record type of their rows
+SPATIAL_RECORDS = {
+    'airport': airports.Airport,
+    'navigation_aid': navigation_aids.NavigationAid
+}
+
+# The id column each table's R*Tree is keyed by, and the index that joins the
+# R*Tree back to the table when that column is not the table's rowid, which
+# VACUUM is free to renumber
+_SPATIAL_KEYS = {
+    'airport': ('airport_id', None),
+    'navigation_aid': ('navigation_aid_id', 'navigation_aid_id_idx')
+}
+
+
+def is_enabled(connection: sqlite3.Connection, table: str) -> bool:
+    """
+    Returns True if spatial search has been enabled for the given table
+    """
+    return query.table_exists(connection, f'{table}_rtree')
+
+
+def _create_statements(table: str) -> list[str]:
+    """
+    Returns the statements that create a table's R*Tree index of positions and
+    the triggers that keep it in sync with the table. Each position is stored
+    as a box with no area, keyed by the row's id.
+    """
+    key, key_index = _SPATIAL_KEYS[table]
+    statements = []
+
+    if key_index is not None:
+        statements.append(f'CREATE INDEX IF NOT EXISTS {key_index} ON {table} ({key});')
+
+    return statements + [
+        f"""CREATE VIRTUAL TABLE {table}_rtree
+        USING rtree(id, min_latitude, max_latitude, min_longitude, max_longitude);""",
+
+        f"""CREATE TRIGGER {table}_rtree_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_rtree
+            VALUES (new.{key}, new.latitude_deg, new.latitude_deg, new.longitude_deg, new.longitude_deg);
+        END;""",
+
+        f"""CREATE TRIGGER {table}_rtree_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {table}_rtree WHERE id = old.{key};
+        END;""",
+
+        f"""CREATE TRIGGER {table}_rtree_update AFTER UPDATE ON {table}
+        WHEN old.{key} IS NOT new.{key} OR old.latitude_deg IS NOT new.latitude_deg
+            OR old.longitude_deg IS NOT new.longitude_deg
+        BEGIN
+            DELETE FROM {table}_rtree WHERE id = old.{key};
+            INSERT INTO {table}_rtree
+            VALUES (new.{key}, new.latitude_deg, new.latitude_deg, new.longitude_deg, new.longitude_deg);
+        END;""",
+
+        f"""INSERT INTO {table}_rtree
+        SELECT {key}, latitude_deg, latitude_deg, longitude_deg, longitude_deg FROM {table};"""
+    ]
+
+
+def enable_spatial(connection: sqlite3.Connection) -> list[str]:
+    """
+    Creates the R*Tree indexes and their triggers for every table with positions
+    that does not have one yet, populating them from the existing rows.
+    Returns the names of the tables that were enabled.
+    """
+    enabled = []
+
+    with connection:
+        for table in SPATIAL_RECORDS:
+            if query.table_exists(connection, table) and not is_enabled(connection, table):
+                for statement in _create_statements(table):
+                    connection.execute(statement)
+
+                enabled.append(table)
+
+    return enabled
+
+
+def great_circle_nm(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """
+    Returns the great-circle distance in nautical miles between two positions,
+    using the haversine formula
+    """
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+
+    h = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_nm: float) -> tuple[float, float, float, float]:
+    """
+    Returns the smallest box (min latitude, max latitude, west longitude, east
+    longitude) holding every position within radius_nm of the given one. The
+    west edge may be less than -180 and the east edge more than 180 when the
+    box crosses the antimeridian; a box reaching a pole covers every longitude.
+    """
+    angle = radius_nm / EARTH_RADIUS_NM
+
+    if angle >= math.pi:
+        return -90.0, 90.0, -180.0, 180.0
+
+    delta_latitude = math.degrees(angle)
+    min_latitude = latitude - delta_latitude
+    max_latitude = latitude + delta_latitude
+
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90.0), min(max_latitude, 90.0), -180.0, 180.0
+
+    delta_longitude = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(latitude))))
+    return min_latitude, max_latitude, longitude - delta_longitude, longitude + delta_longitude
+
+
+def _normalize_longitude(longitude: float) -> float:
+    """
+    Returns the same longitude in the range [-180, 180)
+    """
+    return (longitude + 180) % 360 - 180
+
+
+def longitude_ranges(west: float, east: float) -> list[tuple[float, float]]:
+    """
+    Returns the longitude ranges, each within [-180, 180], covering the span
+    going east from the west edge to the east edge. A span that crosses the
+    antimeridian, such as 170 to -170, is split in two.
+    """
+    if east - west >= 360:
+        return [(-180.0, 180.0)]
+
+    west = _normalize_longitude(west)
+    east = _normalize_longitude(east)
+
+    if west <= east:
+        return [(west, east)]
+    else:
+        return [(west, 180.0), (-180.0, east)]
+
+
+def _records_in_box(connection: sqlite3.Connection, table: str, min_latitude: float, max_latitude: float,
+                    west: float, east: float):
+    """
+    Yields the records of the table positioned inside the box, read straight
+    from the cursor as the table's record type. The R*Tree finds
+    the candidates when the table has one, and the table is scanned otherwise.
+    The stored coordinates are compared as well, because the R*Tree keeps them
+    rounded outward to 32-bit floats.
+    """
+    key = _SPATIAL_KEYS[table][0]
+    columns = ', '.join(f'{table}.{column}' for column in search.TABLE_COLUMNS[table])
+    within = f'{table}.latitude_deg BETWEEN ? AND ? AND {table}.longitude_deg BETWEEN ? AND ?'
+
+    if is_enabled(connection, table):
+        statement = f"""SELECT {columns} FROM {table}_rtree
+        JOIN {table} ON {table}.{key} = {table}_rtree.id
+        WHERE {table}_rtree.max_latitude >= ? AND {table}_rtree.min_latitude <= ?
+        AND {table}_rtree.max_longitude >= ? AND {table}_rtree.min_longitude <= ? AND {within};"""
+        box_count = 2
+    else:
+        statement = f'SELECT {columns} FROM {table} WHERE {within};'
+        box_count = 1
+
+    for low, high in longitude_ranges(west, east):
+        parameters = [min_latitude, max_latitude, low, high] * box_count
+        cursor = query.record_cursor(connection, SPATIAL_RECORDS[table])
+        yield from query.fetch_in_batches(cursor.execute(statement, parameters))
+
+
+def box_search(connection: sqlite3.Connection, table: str, min_latitude: float, max_latitude: float,
+               west: float, east: float) -> list:
+    """
+    Returns the records of the table positioned inside the box. The west edge
+    may be greater than the east edge for a box crossing the antimeridian.
+    """
+    return list(_records_in_box(connection, table, min_latitude, max_latitude, west, east))
+
+
+def radius_search(connection: sqlite3.Connection, table: str, latitude: float, longitude: float,
+                  radius_nm: float) -> list[tuple]:
+    """
+    Returns (record, distance in nautical miles) for each record of the table
+    within radius_nm of the position, nearest first. The bounding box of the
+    circle narrows the candidates and the exact great-circle distance decides.
+    """
+    found = []
+
+    for place in _records_in_box(connection, table, *bounding_box(latitude, longitude, radius_nm)):
+        distance = great_circle_nm(latitude, longitude, place.latitude_deg, place.longitude_deg)
+
+        if distance <= radius_nm:
+            found.append((place, distance))
+
+    found.sort(key = lambda result: result[1])
+    return found
+
+
+def spatial_search_result(connections: ConnectionManager, event: places.StartRadiusSearchEvent |
+                                                                  places.StartBoxSearchEvent):
+    """
+    Yields a SpatialSearchResultEvent for each place found by a radius or box
+    search, nearest first for a radius search
+    """
+    if event.kind() not in SPATIAL_RECORDS or not query.table_exists(connections.connection(), event.kind()):
+        yield app.ErrorEvent(f'Cannot search {event.kind()} by position!')
+        return
+
+    if isinstance(event, places.StartRadiusSearchEvent):
+        for place, distance in radius_search(connections.connection(), event.kind(), event.latitude(),
+                                             event.longitude(), event.radius_nm()):
+            yield places.SpatialSearchResultEvent(place, distance)
+    else:
+        for place in box_search(connections.connection(), event.kind(), event.min_latitude(),
+                                event.max_latitude(), event.min_longitude(), event.max_longitude()):
+            yield places.SpatialSearchResultEvent(place, None)
+
+
+def register_handlers(dispatcher: Dispatcher) -> None:
+    """
+    Registers the handlers of all spatial search events
+    """
+    dispatcher.register(places.StartRadiusSearchEvent, spatial_search_result, streams = True)
+    dispatcher.register(places.StartBoxSearchEvent, spatial_search_result, streams = True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Creates R*Tree indexes of airport and navigation aid positions, kept in sync by triggers.')
+    parser.add_argument('database', help = 'path to the .db file')
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+
+    try:
+        enabled = enable_spatial(connection)
+        print(f'Enabled spatial search for {", ".join(enabled)}' if enabled
+              else 'Spatial search was already enabled.')
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 from .event_bus import EventBus
 from .app import *
+from .airports import *
 from .continents import *
 from .countries import *
 from .database import *
+from .navigation_aids import *
 from .regions import *
+from .search import *
+from .spatial import *
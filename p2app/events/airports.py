@@ -0,0 +1,415 @@
+from collections import namedtuple
+from .search import MATCH_EXACT
+
+
+Airport = namedtuple(
+    'Airport',
+    ['airport_id', 'airport_ident', 'type', 'name', 'latitude_deg', 'longitude_deg', 'elevation_ft',
+     'continent_id', 'country_id', 'region_id', 'municipality', 'scheduled_service', 'gps_code',
+     'iata_code', 'local_code', 'home_link', 'wikipedia_link', 'keywords'])
+
+Airport.__annotations__ = {
+    'airport_id': int | None,
+    'airport_ident': str | None,
+    'type': str | None,
+    'name': str | None,
+    'latitude_deg': float | None,
+    'longitude_deg': float | None,
+    'elevation_ft': int | None,
+    'continent_id': str | None,
+    'country_id': int | None,
+    'region_id': int | None,
+    'municipality': str | None,
+    'scheduled_service': int | None,
+    'gps_code': str | None,
+    'iata_code': str | None,
+    'local_code': str | None,
+    'home_link': str | None,
+    'wikipedia_link': str | None,
+    'keywords': str | None
+}
+
+
+Runway = namedtuple(
+    'Runway',
+    ['runway_id', 'airport_id', 'length_ft', 'width_ft', 'surface', 'lighted', 'closed',
+     'le_ident', 'le_latitude_deg', 'le_longitude_deg', 'le_elevation_ft', 'le_heading_deg',
+     'le_displaced_threshold_ft', 'he_ident', 'he_latitude_deg', 'he_longitude_deg',
+     'he_elevation_ft', 'he_heading_deg', 'he_displaced_threshold_ft'])
+
+Runway.__annotations__ = {
+    'runway_id': int | None,
+    'airport_id': int | None,
+    'length_ft': int | None,
+    'width_ft': int | None,
+    'surface': str | None,
+    'lighted': int | None,
+    'closed': int | None,
+    'le_ident': str | None,
+    'le_latitude_deg': float | None,
+    'le_longitude_deg': float | None,
+    'le_elevation_ft': int | None,
+    'le_heading_deg': float | None,
+    'le_displaced_threshold_ft': int | None,
+    'he_ident': str | None,
+    'he_latitude_deg': float | None,
+    'he_longitude_deg': float | None,
+    'he_elevation_ft': int | None,
+    'he_heading_deg': float | None,
+    'he_displaced_threshold_ft': int | None
+}
+
+
+AirportFrequency = namedtuple(
+    'AirportFrequency',
+    ['airport_frequency_id', 'airport_id', 'type', 'description', 'frequency_mhz'])
+
+AirportFrequency.__annotations__ = {
+    'airport_frequency_id': int | None,
+    'airport_id': int | None,
+    'type': str | None,
+    'description': str | None,
+    'frequency_mhz': float | None
+}
+
+
+# An airport together with all of its runways and frequencies
+AirportDetails = namedtuple('AirportDetails', ['airport', 'runways', 'frequencies'])
+
+AirportDetails.__annotations__ = {
+    'airport': Airport,
+    'runways': tuple[Runway, ...],
+    'frequencies': tuple[AirportFrequency, ...]
+}
+
+
+
+class StartAirportSearchEvent:
+    __slots__ = ('_airport_ident', '_iata_code', '_gps_code', '_local_code', '_name', '_airport_type', '_country_id', '_region_id', '_scheduled_service', '_match_mode')
+
+
+    def __init__(self, airport_ident: str | None = None, iata_code: str | None = None,
+                 gps_code: str | None = None, local_code: str | None = None,
+                 name: str | None = None, airport_type: str | None = None,
+                 country_id: int | None = None, region_id: int | None = None,
+                 scheduled_service: int | None = None, match_mode: str = MATCH_EXACT):
+        self._airport_ident = airport_ident
+        self._iata_code = iata_code
+        self._gps_code = gps_code
+        self._local_code = local_code
+        self._name = name
+        self._airport_type = airport_type
+        self._country_id = country_id
+        self._region_id = region_id
+        self._scheduled_service = scheduled_service
+        self._match_mode = match_mode
+
+
+    def airport_ident(self) -> str | None:
+        return self._airport_ident
+
+
+    def iata_code(self) -> str | None:
+        return self._iata_code
+
+
+    def gps_code(self) -> str | None:
+        return self._gps_code
+
+
+    def local_code(self) -> str | None:
+        return self._local_code
+
+
+    def name(self) -> str | None:
+        return self._name
+
+
+    def airport_type(self) -> str | None:
+        return self._airport_type
+
+
+    def country_id(self) -> int | None:
+        return self._country_id
+
+
+    def region_id(self) -> int | None:
+        return self._region_id
+
+
+    def scheduled_service(self) -> int | None:
+        return self._scheduled_service
+
+
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ident = {repr(self._airport_ident)}, ' + \
+               f'iata_code = {repr(self._iata_code)}, gps_code = {repr(self._gps_code)}, ' + \
+               f'local_code = {repr(self._local_code)}, name = {repr(self._name)}, ' + \
+               f'airport_type = {repr(self._airport_type)}, country_id = {repr(self._country_id)}, ' + \
+               f'region_id = {repr(self._region_id)}, ' + \
+               f'scheduled_service = {repr(self._scheduled_service)}, ' + \
+               f'match_mode = {repr(self._match_mode)}'
+
+
+
+class AirportSearchResultEvent:
+    __slots__ = ('_airport',)
+
+
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class LoadAirportSearchPageEvent:
+    __slots__ = ('_airport_ident', '_iata_code', '_gps_code', '_local_code', '_name', '_airport_type', '_country_id', '_region_id', '_scheduled_service', '_match_mode', '_page_cursor', '_page_size')
+
+
+    def __init__(self, airport_ident: str | None = None, iata_code: str | None = None,
+                 gps_code: str | None = None, local_code: str | None = None,
+                 name: str | None = None, airport_type: str | None = None,
+                 country_id: int | None = None, region_id: int | None = None,
+                 scheduled_service: int | None = None, match_mode: str = MATCH_EXACT,
+                 page_cursor: object = None, page_size: int = 100):
+        self._airport_ident = airport_ident
+        self._iata_code = iata_code
+        self._gps_code = gps_code
+        self._local_code = local_code
+        self._name = name
+        self._airport_type = airport_type
+        self._country_id = country_id
+        self._region_id = region_id
+        self._scheduled_service = scheduled_service
+        self._match_mode = match_mode
+        self._page_cursor = page_cursor
+        self._page_size = page_size
+
+
+    def airport_ident(self) -> str | None:
+        return self._airport_ident
+
+
+    def iata_code(self) -> str | None:
+        return self._iata_code
+
+
+    def gps_code(self) -> str | None:
+        return self._gps_code
+
+
+    def local_code(self) -> str | None:
+        return self._local_code
+
+
+    def name(self) -> str | None:
+        return self._name
+
+
+    def airport_type(self) -> str | None:
+        return self._airport_type
+
+
+    def country_id(self) -> int | None:
+        return self._country_id
+
+
+    def region_id(self) -> int | None:
+        return self._region_id
+
+
+    def scheduled_service(self) -> int | None:
+        return self._scheduled_service
+
+
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
+    def page_cursor(self) -> object:
+        return self._page_cursor
+
+
+    def page_size(self) -> int:
+        return self._page_size
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ident = {repr(self._airport_ident)}, ' + \
+               f'iata_code = {repr(self._iata_code)}, gps_code = {repr(self._gps_code)}, ' + \
+               f'local_code = {repr(self._local_code)}, name = {repr(self._name)}, ' + \
+               f'airport_type = {repr(self._airport_type)}, country_id = {repr(self._country_id)}, ' + \
+               f'region_id = {repr(self._region_id)}, ' + \
+               f'scheduled_service = {repr(self._scheduled_service)}, ' + \
+               f'match_mode = {repr(self._match_mode)}, page_cursor = {repr(self._page_cursor)}, ' + \
+               f'page_size = {repr(self._page_size)}'
+
+
+
+class AirportSearchPageEvent:
+    __slots__ = ('_airports', '_next_page_cursor')
+
+
+    def __init__(self, airports: list[Airport], next_page_cursor: object):
+        self._airports = airports
+        self._next_page_cursor = next_page_cursor
+
+
+    def airports(self) -> list[Airport]:
+        return self._airports
+
+
+    def next_page_cursor(self) -> object:
+        return self._next_page_cursor
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airports = {repr(self._airports)}, ' + \
+               f'next_page_cursor = {repr(self._next_page_cursor)}'
+
+
+
+class LoadAirportEvent:
+    __slots__ = ('_airport_id',)
+
+
+    def __init__(self, airport_id: int):
+        self._airport_id = airport_id
+
+
+    def airport_id(self) -> int:
+        return self._airport_id
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_id = {repr(self._airport_id)}'
+
+
+
+class AirportLoadedEvent:
+    __slots__ = ('_airport',)
+
+
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveNewAirportEvent:
+    __slots__ = ('_airport',)
+
+
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveAirportEvent:
+    __slots__ = ('_airport',)
+
+
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class AirportSavedEvent:
+    __slots__ = ('_airport',)
+
+
+    def __init__(self, airport: Airport):
+        self._airport = airport
+
+
+    def airport(self) -> Airport:
+        return self._airport
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport = {repr(self._airport)}'
+
+
+
+class SaveAirportFailedEvent:
+    __slots__ = ('_reason',)
+
+
+    def __init__(self, reason: str):
+        self._reason = reason
+
+
+    def reason(self) -> str:
+        return self._reason
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: reason = {repr(self._reason)}'
+
+
+
+class LoadAirportDetailsEvent:
+    __slots__ = ('_airport_ids',)
+
+
+    def __init__(self, airport_ids: list[int]):
+        self._airport_ids = airport_ids
+
+
+    def airport_ids(self) -> list[int]:
+        return self._airport_ids
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: airport_ids = {repr(self._airport_ids)}'
+
+
+
+class AirportDetailsLoadedEvent:
+    __slots__ = ('_details',)
+
+
+    def __init__(self, details: list[AirportDetails]):
+        self._details = details
+
+
+    def details(self) -> list[AirportDetails]:
+        return self._details
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: details = {repr(self._details)}'
@@ -1,4 +1,7 @@
 class ErrorEvent:
+    __slots__ = ('_message',)
+
+
     def __init__(self, message: str):
         self._message = message
 
@@ -13,11 +16,17 @@ class ErrorEvent:
 
 
 class QuitInitiatedEvent:
+    __slots__ = ()
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}'
 
 
 
 class EndApplicationEvent:
+    __slots__ = ()
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}'
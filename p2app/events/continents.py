@@ -1,4 +1,5 @@
 from collections import namedtuple
+from .search import MATCH_EXACT
 
 
 
@@ -13,9 +14,13 @@ Continent.__annotations__ = {
 
 
 class StartContinentSearchEvent:
-    def __init__(self, continent_code: str, name: str):
+    __slots__ = ('_continent_code', '_name', '_match_mode')
+
+
+    def __init__(self, continent_code: str, name: str, match_mode: str = MATCH_EXACT):
         self._continent_code = continent_code
         self._name = name
+        self._match_mode = match_mode
 
 
     def continent_code(self) -> str:
@@ -26,12 +31,20 @@ class StartContinentSearchEvent:
         return self._name
 
 
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
     def __repr__(self) -> str:
-        return f'{type(self).__name__}: continent_code = {repr(self._continent_code)}, name = {repr(self._name)}'
+        return f'{type(self).__name__}: continent_code = {repr(self._continent_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}'
 
 
 
 class ContinentSearchResultEvent:
+    __slots__ = ('_continent',)
+
+
     def __init__(self, continent: Continent):
         self._continent = continent
 
@@ -46,6 +59,9 @@ class ContinentSearchResultEvent:
 
 
 class LoadContinentEvent:
+    __slots__ = ('_continent_id',)
+
+
     def __init__(self, continent_id: int):
         self._continent_id = continent_id
 
@@ -60,6 +76,9 @@ class LoadContinentEvent:
 
 
 class ContinentLoadedEvent:
+    __slots__ = ('_continent',)
+
+
     def __init__(self, continent: Continent):
         self._continent = continent
 
@@ -74,6 +93,9 @@ class ContinentLoadedEvent:
 
 
 class SaveNewContinentEvent:
+    __slots__ = ('_continent',)
+
+
     def __init__(self, continent: Continent):
         self._continent = continent
 
@@ -88,6 +110,9 @@ class SaveNewContinentEvent:
 
 
 class SaveContinentEvent:
+    __slots__ = ('_continent',)
+
+
     def __init__(self, continent: Continent):
         self._continent = continent
 
@@ -102,6 +127,9 @@ class SaveContinentEvent:
 
 
 class ContinentSavedEvent:
+    __slots__ = ('_continent',)
+
+
     def __init__(self, continent: Continent):
         self._continent = continent
 
@@ -116,6 +144,9 @@ class ContinentSavedEvent:
 
 
 class SaveContinentFailedEvent:
+    __slots__ = ('_reason',)
+
+
     def __init__(self, reason: str):
         self._reason = reason
 
@@ -126,3 +157,66 @@ class SaveContinentFailedEvent:
 
     def __repr__(self) -> str:
         return f'{type(self).__name__}: reason = {repr(self._reason)}'
+
+
+
+class LoadContinentSearchPageEvent:
+    __slots__ = ('_continent_code', '_name', '_match_mode', '_page_cursor', '_page_size')
+
+
+    def __init__(self, continent_code: str, name: str, match_mode: str = MATCH_EXACT,
+                 page_cursor: object = None, page_size: int = 100):
+        self._continent_code = continent_code
+        self._name = name
+        self._match_mode = match_mode
+        self._page_cursor = page_cursor
+        self._page_size = page_size
+
+
+    def continent_code(self) -> str:
+        return self._continent_code
+
+
+    def name(self) -> str:
+        return self._name
+
+
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
+    def page_cursor(self) -> object:
+        return self._page_cursor
+
+
+    def page_size(self) -> int:
+        return self._page_size
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: continent_code = {repr(self._continent_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}, page_cursor = {repr(self._page_cursor)}, ' + \
+               f'page_size = {repr(self._page_size)}'
+
+
+
+class ContinentSearchPageEvent:
+    __slots__ = ('_continents', '_next_page_cursor')
+
+
+    def __init__(self, continents: list[Continent], next_page_cursor: object):
+        self._continents = continents
+        self._next_page_cursor = next_page_cursor
+
+
+    def continents(self) -> list[Continent]:
+        return self._continents
+
+
+    def next_page_cursor(self) -> object:
+        return self._next_page_cursor
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: continents = {repr(self._continents)}, ' + \
+               f'next_page_cursor = {repr(self._next_page_cursor)}'
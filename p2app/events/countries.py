@@ -1,4 +1,5 @@
 from collections import namedtuple
+from .search import MATCH_EXACT
 
 
 Country = namedtuple(
@@ -17,9 +18,13 @@ Country.__annotations__ = {
 
 
 class StartCountrySearchEvent:
-    def __init__(self, country_code: str, name: str):
+    __slots__ = ('_country_code', '_name', '_match_mode')
+
+
+    def __init__(self, country_code: str, name: str, match_mode: str = MATCH_EXACT):
         self._country_code = country_code
         self._name = name
+        self._match_mode = match_mode
 
 
     def country_code(self) -> str:
@@ -30,12 +35,20 @@ class StartCountrySearchEvent:
         return self._name
 
 
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
     def __repr__(self) -> str:
-        return f'{type(self).__name__}: country_code = {repr(self._country_code)}, name = {repr(self._name)}'
+        return f'{type(self).__name__}: country_code = {repr(self._country_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}'
 
 
 
 class CountrySearchResultEvent:
+    __slots__ = ('_country',)
+
+
     def __init__(self, country: Country):
         self._country = country
 
@@ -50,6 +63,9 @@ class CountrySearchResultEvent:
 
 
 class LoadCountryEvent:
+    __slots__ = ('_country_id',)
+
+
     def __init__(self, country_id: int):
         self._country_id = country_id
 
@@ -64,6 +80,9 @@ class LoadCountryEvent:
 
 
 class CountryLoadedEvent:
+    __slots__ = ('_country',)
+
+
     def __init__(self, country: Country):
         self._country = country
 
@@ -78,6 +97,9 @@ class CountryLoadedEvent:
 
 
 class SaveNewCountryEvent:
+    __slots__ = ('_country',)
+
+
     def __init__(self, country: Country):
         self._country = country
 
@@ -92,6 +114,9 @@ class SaveNewCountryEvent:
 
 
 class SaveCountryEvent:
+    __slots__ = ('_country',)
+
+
     def __init__(self, country: Country):
         self._country = country
 
@@ -106,6 +131,9 @@ class SaveCountryEvent:
 
 
 class CountrySavedEvent:
+    __slots__ = ('_country',)
+
+
     def __init__(self, country: Country):
         self._country = country
 
@@ -120,6 +148,9 @@ class CountrySavedEvent:
 
 
 class SaveCountryFailedEvent:
+    __slots__ = ('_reason',)
+
+
     def __init__(self, reason: str):
         self._reason = reason
 
@@ -130,3 +161,66 @@ class SaveCountryFailedEvent:
 
     def __repr__(self) -> str:
         return f'{type(self).__name__}: reason = {repr(self._reason)}'
+
+
+
+class LoadCountrySearchPageEvent:
+    __slots__ = ('_country_code', '_name', '_match_mode', '_page_cursor', '_page_size')
+
+
+    def __init__(self, country_code: str, name: str, match_mode: str = MATCH_EXACT,
+                 page_cursor: object = None, page_size: int = 100):
+        self._country_code = country_code
+        self._name = name
+        self._match_mode = match_mode
+        self._page_cursor = page_cursor
+        self._page_size = page_size
+
+
+    def country_code(self) -> str:
+        return self._country_code
+
+
+    def name(self) -> str:
+        return self._name
+
+
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
+    def page_cursor(self) -> object:
+        return self._page_cursor
+
+
+    def page_size(self) -> int:
+        return self._page_size
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: country_code = {repr(self._country_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}, page_cursor = {repr(self._page_cursor)}, ' + \
+               f'page_size = {repr(self._page_size)}'
+
+
+
+class CountrySearchPageEvent:
+    __slots__ = ('_countries', '_next_page_cursor')
+
+
+    def __init__(self, countries: list[Country], next_page_cursor: object):
+        self._countries = countries
+        self._next_page_cursor = next_page_cursor
+
+
+    def countries(self) -> list[Country]:
+        return self._countries
+
+
+    def next_page_cursor(self) -> object:
+        return self._next_page_cursor
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: countries = {repr(self._countries)}, ' + \
+               f'next_page_cursor = {repr(self._next_page_cursor)}'
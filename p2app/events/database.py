@@ -3,6 +3,9 @@ from pathlib import Path
 
 
 class OpenDatabaseEvent:
+    __slots__ = ('_path',)
+
+
     def __init__(self, path: Path):
         self._path = path
 
@@ -17,12 +20,18 @@ class OpenDatabaseEvent:
 
 
 class CloseDatabaseEvent:
+    __slots__ = ()
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}'
 
 
 
 class DatabaseOpenedEvent:
+    __slots__ = ('_path',)
+
+
     def __init__(self, path: Path):
         self._path = path
 
@@ -37,6 +46,9 @@ class DatabaseOpenedEvent:
 
 
 class DatabaseOpenFailedEvent:
+    __slots__ = ('_reason',)
+
+
     def __init__(self, reason: str):
         self._reason = reason
 
@@ -51,5 +63,145 @@ class DatabaseOpenFailedEvent:
 
 
 class DatabaseClosedEvent:
+    __slots__ = ()
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
+class AnalyzeIndexesEvent:
+    __slots__ = ()
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
+class ApplyRecommendedIndexesEvent:
+    __slots__ = ()
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
+class IndexReportEvent:
+    __slots__ = ('_report',)
+
+
+    def __init__(self, report: str):
+        self._report = report
+
+
+    def report(self) -> str:
+        return self._report
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: report = {repr(self._report)}'
+
+
+
+class EnableFullTextSearchEvent:
+    __slots__ = ()
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}'
+
+
+
+class FullTextSearchEnabledEvent:
+    __slots__ = ('_tables',)
+
+
+    def __init__(self, tables: list[str]):
+        self._tables = tables
+
+
+    def tables(self) -> list[str]:
+        return self._tables
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: tables = {repr(self._tables)}'
+
+
+
+class EnableSpatialSearchEvent:
+    __slots__ = ()
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}'
+
+
+
+class SpatialSearchEnabledEvent:
+    __slots__ = ('_tables',)
+
+
+    def __init__(self, tables: list[str]):
+        self._tables = tables
+
+
+    def tables(self) -> list[str]:
+        return self._tables
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: tables = {repr(self._tables)}'
+
+
+
+class ExportTableEvent:
+    __slots__ = ('_table', '_path')
+
+
+    def __init__(self, table: str, path: Path):
+        self._table = table
+        self._path = path
+
+
+    def table(self) -> str:
+        return self._table
+
+
+    def path(self) -> Path:
+        return self._path
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: table = {repr(self._table)}, path = {repr(self._path)}'
+
+
+
+class TableExportedEvent:
+    __slots__ = ('_table', '_path', '_rows')
+
+
+    def __init__(self, table: str, path: Path, rows: int):
+        self._table = table
+        self._path = path
+        self._rows = rows
+
+
+    def table(self) -> str:
+        return self._table
+
+
+    def path(self) -> Path:
+        return self._path
+
+
+    def rows(self) -> int:
+        return self._rows
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: table = {repr(self._table)}, path = {repr(self._path)}, ' + \
+               f'rows = {repr(self._rows)}'
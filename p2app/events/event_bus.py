@@ -1,8 +1,67 @@
+import queue
+import threading
+import time
+import traceback
+from .airports import StartAirportSearchEvent, LoadAirportSearchPageEvent
+from .app import ErrorEvent
+from .continents import StartContinentSearchEvent, LoadContinentSearchPageEvent
+from .countries import StartCountrySearchEvent, LoadCountrySearchPageEvent
+from .regions import StartRegionSearchEvent, LoadRegionSearchPageEvent
+from .spatial import StartRadiusSearchEvent, StartBoxSearchEvent
+
+
+
+# How long deliver_events may spend handing result events to the view before
+# returning control to the Tk main loop
+_DELIVERY_BUDGET_SECONDS = 0.015
+
+# The most result events that may wait for the view. Once that many are
+# waiting the engine stops reading rows until the view catches up, so a broad
+# search holds only so many results in memory however fast it reads them.
+_MAX_WAITING_EVENTS = 256
+
+# How long the engine waits for room for a result event before checking again
+# whether the search it belongs to is still wanted
+_SEND_WAIT_SECONDS = 0.05
+
+# The list of results each kind of search fills. A new search supersedes every
+# search still running or waiting for the same list, whose results are no
+# longer wanted; loading another page of a search does not.
+_SEARCH_LISTS = {
+    StartContinentSearchEvent: 'continent',
+    LoadContinentSearchPageEvent: 'continent',
+    StartCountrySearchEvent: 'country',
+    LoadCountrySearchPageEvent: 'country',
+    StartRegionSearchEvent: 'region',
+    LoadRegionSearchPageEvent: 'region',
+    StartAirportSearchEvent: 'airport',
+    LoadAirportSearchPageEvent: 'airport',
+    StartRadiusSearchEvent: 'spatial',
+    StartBoxSearchEvent: 'spatial'
+}
+
+
+
+def _starts_new_search(event) -> bool:
+    # Loading the first page of a search starts it; later pages continue it
+    return not hasattr(event, 'page_cursor') or event.page_cursor() is None
+
+
+
 class EventBus:
-    def __init__(self):
+    def __init__(self, asynchronous: bool = False):
         self._view = None
         self._engine = None
         self._is_debug_mode = False
+        self._is_asynchronous = asynchronous
+        self._engine_events = queue.Queue()
+        self._view_events = queue.Queue(maxsize = _MAX_WAITING_EVENTS)
+        self._worker = None
+        self._lock = threading.Lock()
+        self._search_generations = {}
+        self._running_token = None
+        self._is_engine_busy = False
+        self._discarded_events = 0
 
 
     def register_view(self, view):
@@ -21,12 +80,155 @@ class EventBus:
         self._is_debug_mode = False
 
 
+    def is_asynchronous(self) -> bool:
+        return self._is_asynchronous
+
+
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+
+    def start(self):
+        # In asynchronous mode the engine runs on its own thread, which opens
+        # and uses the engine's connection, so no query ever runs on the Tk thread
+        if self._is_asynchronous and self._worker is None:
+            self._worker = threading.Thread(target = self._run_engine, name = 'engine', daemon = True)
+            self._worker.start()
+
+
+    def stop(self):
+        if self._worker is not None:
+            self._engine_events.put(None)
+            self._worker = None
+
+
     def initiate_event(self, event):
         if self._is_debug_mode:
             print(f'Sent by view  : {event}')
 
-        for result_event in self._engine.process_event(event):
+        if self._is_asynchronous:
+            self._engine_events.put((self._request_token(event), event))
+        else:
+            self._process_event(event, None, self._view.handle_event)
+
+
+    def discarded_events(self) -> int:
+        return self._discarded_events
+
+
+    def _request_token(self, event):
+        # Searches are tagged with the list they fill and that list's
+        # generation, which every new search for the list moves on. A search
+        # whose generation has moved on is stale: it is interrupted if it is
+        # running, skipped if it is waiting, and its results are discarded.
+        search_list = _SEARCH_LISTS.get(type(event))
+
+        if search_list is None:
+            return None
+
+        with self._lock:
+            if _starts_new_search(event):
+                self._search_generations[search_list] = self._search_generations.get(search_list, 0) + 1
+
+                if self._is_stale(self._running_token):
+                    self._engine.interrupt()
+
+            return search_list, self._search_generations.get(search_list, 0)
+
+
+    def _is_stale(self, token) -> bool:
+        return token is not None and token[1] != self._search_generations.get(token[0], 0)
+
+
+    def _is_abandoned(self, token) -> bool:
+        # A search is abandoned once it is superseded, and whatever the worker
+        # is doing is abandoned once the bus is stopped
+        return self._is_stale(token) or (self._is_asynchronous and self._worker is not threading.current_thread())
+
+
+    def deliver_events(self) -> bool:
+        # Called on the Tk thread, through after(), to hand the view the events
+        # the engine has sent back, in the order it sent them. Returns True if
+        # events are still waiting once the time budget is spent, or if the
+        # engine is still working on an event and may send more soon.
+        deadline = time.perf_counter() + _DELIVERY_BUDGET_SECONDS
+
+        while self._worker is not None and time.perf_counter() < deadline:
+            try:
+                token, result_event = self._view_events.get_nowait()
+            except queue.Empty:
+                return self._is_engine_busy
+
+            if self._is_stale(token):
+                self._discarded_events += 1
+            else:
+                self._view.handle_event(result_event)
+
+        return self._is_engine_busy or not self._view_events.empty()
+
+
+    def _process_event(self, event, token, send):
+        result_events = self._engine.process_event(event)
+
+        for result_event in result_events:
+            if self._is_abandoned(token):
+                result_events.close()
+
+                if self._is_debug_mode:
+                    print(f'Superseded    : {event}')
+
+                break
+
             if self._is_debug_mode:
                 print(f'Sent by engine: {result_event}')
 
-            self._view.handle_event(result_event)
+            send(result_event)
+
+        if self._is_debug_mode:
+            print(f'Engine stats  : {self._engine.stats()}')
+
+
+    def _run_engine(self):
+        # A single worker handles the events one at a time, in the order they
+        # were sent, so the results of each event reach the view in order too
+        while True:
+            request = self._engine_events.get()
+
+            if request is None:
+                return
+
+            token, event = request
+
+            with self._lock:
+                if self._is_stale(token):
+                    continue
+
+                self._running_token = token
+                self._is_engine_busy = True
+
+            try:
+                self._process_event(event, token, lambda result_event: self._send_to_view(token, result_event))
+            except Exception:
+                # A superseded search fails with "interrupted" once it is
+                # interrupted, which is expected and not worth reporting
+                if not self._is_stale(token):
+                    traceback.print_exc()
+                    self._send_to_view(None, ErrorEvent('The engine failed to process an event!'))
+            finally:
+                with self._lock:
+                    self._running_token = None
+                    self._is_engine_busy = False
+
+
+    def _send_to_view(self, token, result_event):
+        # Called on the worker thread. Waits while the view is behind, but
+        # drops the event instead if it is abandoned while waiting, so the
+        # worker is never stuck on a full queue.
+        while True:
+            try:
+                self._view_events.put((token, result_event), timeout = _SEND_WAIT_SECONDS)
+                return
+            except queue.Full:
+                if self._is_abandoned(token):
+                    self._discarded_events += 1
+                    return
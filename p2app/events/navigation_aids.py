@@ -0,0 +1,32 @@
+from collections import namedtuple
+
+
+NavigationAid = namedtuple(
+    'NavigationAid',
+    ['navigation_aid_id', 'filename', 'ident', 'name', 'type', 'frequency_khz', 'latitude_deg',
+     'longitude_deg', 'elevation_ft', 'iso_country', 'dme_frequency_khz', 'dme_channel',
+     'dme_latitude_deg', 'dme_longitude_deg', 'dme_elevation_ft', 'adjusted_variation_deg',
+     'magnetic_variation_deg', 'usage_type', 'power', 'airport_id'])
+
+NavigationAid.__annotations__ = {
+    'navigation_aid_id': int | None,
+    'filename': str | None,
+    'ident': str | None,
+    'name': str | None,
+    'type': str | None,
+    'frequency_khz': int | None,
+    'latitude_deg': float | None,
+    'longitude_deg': float | None,
+    'elevation_ft': int | None,
+    'iso_country': str | None,
+    'dme_frequency_khz': int | None,
+    'dme_channel': str | None,
+    'dme_latitude_deg': float | None,
+    'dme_longitude_deg': float | None,
+    'dme_elevation_ft': int | None,
+    'adjusted_variation_deg': float | None,
+    'magnetic_variation_deg': float | None,
+    'usage_type': str | None,
+    'power': str | None,
+    'airport_id': int | None
+}
@@ -1,4 +1,6 @@
+from array import array
 from collections import namedtuple
+from .search import MATCH_EXACT
 
 
 Region = namedtuple(
@@ -19,11 +21,60 @@ Region.__annotations__ = {
 
 
 
+class RegionBatch:
+    # Many regions held a column at a time rather than as a Region each: the
+    # id columns in arrays of 64-bit integers and the rest in lists. A batch
+    # holds regions read from the database, so none of their ids are None.
+    # Indexing or iterating over it makes Regions as they are asked for.
+    __slots__ = (
+        'region_ids', 'region_codes', 'local_codes', 'names',
+        'continent_ids', 'country_ids', 'wikipedia_links', 'keywords')
+
+
+    def __init__(self, regions = ()):
+        columns = tuple(zip(*regions)) or ((),) * len(Region._fields)
+
+        self.region_ids = array('q', columns[0])
+        self.region_codes = list(columns[1])
+        self.local_codes = list(columns[2])
+        self.names = list(columns[3])
+        self.continent_ids = array('q', columns[4])
+        self.country_ids = array('q', columns[5])
+        self.wikipedia_links = list(columns[6])
+        self.keywords = list(columns[7])
+
+
+    def __len__(self) -> int:
+        return len(self.region_ids)
+
+
+    def __getitem__(self, index: int) -> Region:
+        return Region(
+            self.region_ids[index], self.region_codes[index], self.local_codes[index],
+            self.names[index], self.continent_ids[index], self.country_ids[index],
+            self.wikipedia_links[index], self.keywords[index])
+
+
+    def __iter__(self):
+        return map(
+            Region, self.region_ids, self.region_codes, self.local_codes, self.names,
+            self.continent_ids, self.country_ids, self.wikipedia_links, self.keywords)
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: {len(self)} regions'
+
+
+
 class StartRegionSearchEvent:
-    def __init__(self, region_code: str, local_code: str, name: str):
+    __slots__ = ('_region_code', '_local_code', '_name', '_match_mode')
+
+
+    def __init__(self, region_code: str, local_code: str, name: str, match_mode: str = MATCH_EXACT):
         self._region_code = region_code
         self._local_code = local_code
         self._name = name
+        self._match_mode = match_mode
 
 
     def region_code(self) -> str:
@@ -38,13 +89,21 @@ class StartRegionSearchEvent:
         return self._name
 
 
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}: region_code = {repr(self._region_code)}, ' + \
-               f'local_name = {repr(self._local_code)}, name = {repr(self._name)}'
+               f'local_name = {repr(self._local_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}'
 
 
 
 class RegionSearchResultEvent:
+    __slots__ = ('_region',)
+
+
     def __init__(self, region: Region):
         self._region = region
 
@@ -59,6 +118,9 @@ class RegionSearchResultEvent:
 
 
 class LoadRegionEvent:
+    __slots__ = ('_region_id',)
+
+
     def __init__(self, region_id: int):
         self._region_id = region_id
 
@@ -73,6 +135,9 @@ class LoadRegionEvent:
 
 
 class RegionLoadedEvent:
+    __slots__ = ('_region',)
+
+
     def __init__(self, region: Region):
         self._region = region
 
@@ -87,6 +152,9 @@ class RegionLoadedEvent:
 
 
 class SaveNewRegionEvent:
+    __slots__ = ('_region',)
+
+
     def __init__(self, region: Region):
         self._region = region
 
@@ -101,6 +169,9 @@ class SaveNewRegionEvent:
 
 
 class SaveRegionEvent:
+    __slots__ = ('_region',)
+
+
     def __init__(self, region: Region):
         self._region = region
 
@@ -115,6 +186,9 @@ class SaveRegionEvent:
 
 
 class RegionSavedEvent:
+    __slots__ = ('_region',)
+
+
     def __init__(self, region: Region):
         self._region = region
 
@@ -129,6 +203,9 @@ class RegionSavedEvent:
 
 
 class SaveRegionFailedEvent:
+    __slots__ = ('_reason',)
+
+
     def __init__(self, reason: str):
         self._reason = reason
 
@@ -139,3 +216,106 @@ class SaveRegionFailedEvent:
 
     def __repr__(self) -> str:
         return f'{type(self).__name__}: reason = {repr(self._reason)}'
+
+
+
+class LoadRegionSearchPageEvent:
+    __slots__ = ('_region_code', '_local_code', '_name', '_match_mode', '_page_cursor', '_page_size')
+
+
+    def __init__(self, region_code: str, local_code: str, name: str, match_mode: str = MATCH_EXACT,
+                 page_cursor: object = None, page_size: int = 100):
+        self._region_code = region_code
+        self._local_code = local_code
+        self._name = name
+        self._match_mode = match_mode
+        self._page_cursor = page_cursor
+        self._page_size = page_size
+
+
+    def region_code(self) -> str:
+        return self._region_code
+
+
+    def local_code(self) -> str:
+        return self._local_code
+
+
+    def name(self) -> str:
+        return self._name
+
+
+    def match_mode(self) -> str:
+        return self._match_mode
+
+
+    def page_cursor(self) -> object:
+        return self._page_cursor
+
+
+    def page_size(self) -> int:
+        return self._page_size
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: region_code = {repr(self._region_code)}, ' + \
+               f'local_code = {repr(self._local_code)}, name = {repr(self._name)}, ' + \
+               f'match_mode = {repr(self._match_mode)}, page_cursor = {repr(self._page_cursor)}, ' + \
+               f'page_size = {repr(self._page_size)}'
+
+
+
+class RegionSearchPageEvent:
+    __slots__ = ('_regions', '_next_page_cursor')
+
+
+    def __init__(self, regions: RegionBatch, next_page_cursor: object):
+        self._regions = regions
+        self._next_page_cursor = next_page_cursor
+
+
+    def regions(self) -> RegionBatch:
+        return self._regions
+
+
+    def next_page_cursor(self) -> object:
+        return self._next_page_cursor
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: regions = {repr(self._regions)}, ' + \
+               f'next_page_cursor = {repr(self._next_page_cursor)}'
+
+
+
+class LoadRegionSearchRowsEvent:
+    __slots__ = ('_region_ids',)
+
+
+    def __init__(self, region_ids: list[int]):
+        self._region_ids = region_ids
+
+
+    def region_ids(self) -> list[int]:
+        return self._region_ids
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: region_ids = {repr(self._region_ids)}'
+
+
+
+class RegionSearchRowsEvent:
+    __slots__ = ('_regions',)
+
+
+    def __init__(self, regions: RegionBatch):
+        self._regions = regions
+
+
+    def regions(self) -> RegionBatch:
+        return self._regions
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: {len(self._regions)} regions'
@@ -0,0 +1,4 @@
+# How the name entered in a search is matched against the stored names
+MATCH_EXACT = 'exact'
+MATCH_PREFIX = 'prefix'
+MATCH_FULL_TEXT = 'full_text'
@@ -0,0 +1,102 @@
+from .airports import Airport
+from .navigation_aids import NavigationAid
+
+
+# The kinds of places a spatial search can look for, named after their tables
+SPATIAL_AIRPORTS = 'airport'
+SPATIAL_NAVIGATION_AIDS = 'navigation_aid'
+
+
+
+class StartRadiusSearchEvent:
+    __slots__ = ('_kind', '_latitude', '_longitude', '_radius_nm')
+
+
+    def __init__(self, kind: str, latitude: float, longitude: float, radius_nm: float):
+        self._kind = kind
+        self._latitude = latitude
+        self._longitude = longitude
+        self._radius_nm = radius_nm
+
+
+    def kind(self) -> str:
+        return self._kind
+
+
+    def latitude(self) -> float:
+        return self._latitude
+
+
+    def longitude(self) -> float:
+        return self._longitude
+
+
+    def radius_nm(self) -> float:
+        return self._radius_nm
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: kind = {repr(self._kind)}, latitude = {repr(self._latitude)}, ' + \
+               f'longitude = {repr(self._longitude)}, radius_nm = {repr(self._radius_nm)}'
+
+
+
+class StartBoxSearchEvent:
+    __slots__ = ('_kind', '_min_latitude', '_max_latitude', '_min_longitude', '_max_longitude')
+
+
+    def __init__(self, kind: str, min_latitude: float, max_latitude: float,
+                 min_longitude: float, max_longitude: float):
+        self._kind = kind
+        self._min_latitude = min_latitude
+        self._max_latitude = max_latitude
+        self._min_longitude = min_longitude
+        self._max_longitude = max_longitude
+
+
+    def kind(self) -> str:
+        return self._kind
+
+
+    def min_latitude(self) -> float:
+        return self._min_latitude
+
+
+    def max_latitude(self) -> float:
+        return self._max_latitude
+
+
+    def min_longitude(self) -> float:
+        return self._min_longitude
+
+
+    def max_longitude(self) -> float:
+        return self._max_longitude
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: kind = {repr(self._kind)}, ' + \
+               f'min_latitude = {repr(self._min_latitude)}, max_latitude = {repr(self._max_latitude)}, ' + \
+               f'min_longitude = {repr(self._min_longitude)}, max_longitude = {repr(self._max_longitude)}'
+
+
+
+class SpatialSearchResultEvent:
+    __slots__ = ('_place', '_distance_nm')
+
+
+    def __init__(self, place: Airport | NavigationAid, distance_nm: float | None):
+        self._place = place
+        self._distance_nm = distance_nm
+
+
+    def place(self) -> Airport | NavigationAid:
+        return self._place
+
+
+    def distance_nm(self) -> float | None:
+        return self._distance_nm
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}: place = {repr(self._place)}, distance_nm = {repr(self._distance_nm)}'
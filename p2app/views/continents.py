@@ -3,10 +3,21 @@ import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .incremental import IncrementalSearchCheckbutton, incremental_match_mode
+from .match_mode import MatchModeMenu
+
+
+# The number of search results loaded at a time
+_SEARCH_PAGE_SIZE = 100
 
 
 
 class ContinentsView(tkinter.Frame, EventHandler):
+    subscribed_events = (
+        SaveContinentFailedEvent, DiscardContinentEvent, NewContinentEvent, StartEditingContinentEvent,
+        ContinentLoadedEvent, ContinentSavedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -49,6 +60,9 @@ class ContinentsView(tkinter.Frame, EventHandler):
 
 
 class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
+    subscribed_events = (ClearContinentsSearchListEvent, ContinentSearchPageEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Continent Search')
 
@@ -76,8 +90,14 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
 
         self._search_button.grid(row = 2, column = 1, sticky = tkinter.E, padx = 5, pady = 5)
 
-        empty_area = tkinter.Label(self, text = '')
-        empty_area.grid(row = 3, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
+        match_mode_label = tkinter.Label(self, text = 'Match: ')
+        match_mode_label.grid(row = 2, column = 0, sticky = tkinter.E, padx = 5, pady = 5)
+
+        self._match_mode_menu = MatchModeMenu(self)
+        self._match_mode_menu.grid(row = 2, column = 1, sticky = tkinter.W, padx = 5, pady = 5)
+
+        self._incremental_search = IncrementalSearchCheckbutton(self, self._on_incremental_search)
+        self._incremental_search.grid(row = 3, column = 1, sticky = tkinter.NW, padx = 5, pady = 5)
 
         self._search_list = tkinter.Listbox(
             self, height = 4,
@@ -89,21 +109,29 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
             padx = 5, pady = 5)
 
         self._search_continent_ids = []
+        self._search_criteria = None
+        self._next_page_cursor = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 4, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
 
+        self._load_more_button = tkinter.Button(
+            button_frame, text = 'Load More', state = tkinter.DISABLED,
+            command = self._on_load_more)
+
+        self._load_more_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+
         self._new_button = tkinter.Button(
             button_frame, text = 'New Continent',
             command = self._on_new_continent)
 
-        self._new_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+        self._new_button.grid(row = 0, column = 1, padx = 5, pady = 5)
 
         self._edit_button = tkinter.Button(
             button_frame, text = 'Edit Continent', state = tkinter.DISABLED,
             command = self._on_edit_continent)
 
-        self._edit_button.grid(row = 0, column = 1, padx = 5, pady = 5)
+        self._edit_button.grid(row = 0, column = 2, padx = 5, pady = 5)
 
         self.rowconfigure(0, weight = 0)
         self.rowconfigure(1, weight = 0)
@@ -116,8 +144,33 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _on_search_button_clicked(self):
+        self._incremental_search.cancel()
+        self._start_search(self._get_search_criteria(self._match_mode_menu.match_mode()))
+
+
+    def _on_incremental_search(self):
+        criteria = self._get_search_criteria(incremental_match_mode(self._match_mode_menu.match_mode()))
+
+        if any(value is not None for value in criteria[:-1]) and criteria != self._search_criteria:
+            self._start_search(criteria)
+
+
+    def _start_search(self, criteria):
+        # Only the first page is loaded; a search started before this one has
+        # finished is superseded by the event bus
         self.initiate_event(ClearContinentsSearchListEvent())
-        self.initiate_event(StartContinentSearchEvent(self._get_search_code(), self._get_search_name()))
+        self._search_criteria = criteria
+        self.initiate_event(LoadContinentSearchPageEvent(*self._search_criteria, None, _SEARCH_PAGE_SIZE))
+
+
+    def _get_search_criteria(self, match_mode):
+        return self._get_search_code(), self._get_search_name(), match_mode
+
+
+    def _on_load_more(self):
+        self._load_more_button['state'] = tkinter.DISABLED
+        self.initiate_event(LoadContinentSearchPageEvent(
+            *self._search_criteria, self._next_page_cursor, _SEARCH_PAGE_SIZE))
 
 
     def _get_search_code(self):
@@ -142,6 +195,12 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
             new_state = tkinter.DISABLED
 
         self._search_button['state'] = new_state
+
+        if new_state == tkinter.NORMAL:
+            self._incremental_search.schedule()
+        else:
+            self._incremental_search.cancel()
+
         return True
 
 
@@ -165,15 +224,25 @@ class _ContinentsSearchView(tkinter.LabelFrame, EventHandler):
         self.initiate_event(LoadContinentEvent(self._get_selected_search_continent_id()))
 
 
+    def _add_search_results(self, continents):
+        # The whole page is added to the list with a single call to Tk
+        self._search_list.insert(tkinter.END, *[f'{continent.continent_code} - {continent.name}' for continent in continents])
+        self._search_continent_ids.extend(continent.continent_id for continent in continents)
+
+
     def on_event(self, event):
         if isinstance(event, ClearContinentsSearchListEvent):
             self._search_list.delete(0, tkinter.END)
             self._search_continent_ids = []
+            self._next_page_cursor = None
             self._edit_button['state'] = tkinter.DISABLED
-        elif isinstance(event, ContinentSearchResultEvent):
-            display_name = f'{event.continent().continent_code} - {event.continent().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_continent_ids.append(event.continent().continent_id)
+            self._load_more_button['state'] = tkinter.DISABLED
+        elif isinstance(event, ContinentSearchPageEvent):
+            self._add_search_results(event.continents())
+            self._next_page_cursor = event.next_page_cursor()
+
+            if self._next_page_cursor is not None:
+                self._load_more_button['state'] = tkinter.NORMAL
 
 
 
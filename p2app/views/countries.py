@@ -3,10 +3,21 @@ import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .incremental import IncrementalSearchCheckbutton, incremental_match_mode
+from .match_mode import MatchModeMenu
+
+
+# The number of search results loaded at a time
+_SEARCH_PAGE_SIZE = 100
 
 
 
 class CountriesView(tkinter.Frame, EventHandler):
+    subscribed_events = (
+        SaveCountryFailedEvent, DiscardCountryEvent, NewCountryEvent, StartEditingCountryEvent,
+        CountryLoadedEvent, CountrySavedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -50,6 +61,9 @@ class CountriesView(tkinter.Frame, EventHandler):
 
 
 class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
+    subscribed_events = (ClearCountriesSearchListEvent, CountrySearchPageEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Country Search')
 
@@ -77,8 +91,14 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
 
         self._search_button.grid(row = 2, column = 1, sticky = tkinter.E, padx = 5, pady = 5)
 
-        empty_area = tkinter.Label(self, text = '')
-        empty_area.grid(row = 3, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
+        match_mode_label = tkinter.Label(self, text = 'Match: ')
+        match_mode_label.grid(row = 2, column = 0, sticky = tkinter.E, padx = 5, pady = 5)
+
+        self._match_mode_menu = MatchModeMenu(self)
+        self._match_mode_menu.grid(row = 2, column = 1, sticky = tkinter.W, padx = 5, pady = 5)
+
+        self._incremental_search = IncrementalSearchCheckbutton(self, self._on_incremental_search)
+        self._incremental_search.grid(row = 3, column = 1, sticky = tkinter.NW, padx = 5, pady = 5)
 
         self._search_list = tkinter.Listbox(
             self, height = 4,
@@ -90,21 +110,29 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
             padx = 5, pady = 5)
 
         self._search_country_ids = []
+        self._search_criteria = None
+        self._next_page_cursor = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 4, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
 
+        self._load_more_button = tkinter.Button(
+            button_frame, text = 'Load More', state = tkinter.DISABLED,
+            command = self._on_load_more)
+
+        self._load_more_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+
         self._new_button = tkinter.Button(
             button_frame, text = 'New Country',
             command = self._on_new_country)
 
-        self._new_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+        self._new_button.grid(row = 0, column = 1, padx = 5, pady = 5)
 
         self._edit_button = tkinter.Button(
             button_frame, text = 'Edit Country', state = tkinter.DISABLED,
             command = self._on_edit_country)
 
-        self._edit_button.grid(row = 0, column = 1, padx = 5, pady = 5)
+        self._edit_button.grid(row = 0, column = 2, padx = 5, pady = 5)
 
         self.rowconfigure(0, weight = 0)
         self.rowconfigure(1, weight = 0)
@@ -117,8 +145,33 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _on_search_button_clicked(self):
+        self._incremental_search.cancel()
+        self._start_search(self._get_search_criteria(self._match_mode_menu.match_mode()))
+
+
+    def _on_incremental_search(self):
+        criteria = self._get_search_criteria(incremental_match_mode(self._match_mode_menu.match_mode()))
+
+        if any(value is not None for value in criteria[:-1]) and criteria != self._search_criteria:
+            self._start_search(criteria)
+
+
+    def _start_search(self, criteria):
+        # Only the first page is loaded; a search started before this one has
+        # finished is superseded by the event bus
         self.initiate_event(ClearCountriesSearchListEvent())
-        self.initiate_event(StartCountrySearchEvent(self._get_search_code(), self._get_search_name()))
+        self._search_criteria = criteria
+        self.initiate_event(LoadCountrySearchPageEvent(*self._search_criteria, None, _SEARCH_PAGE_SIZE))
+
+
+    def _get_search_criteria(self, match_mode):
+        return self._get_search_code(), self._get_search_name(), match_mode
+
+
+    def _on_load_more(self):
+        self._load_more_button['state'] = tkinter.DISABLED
+        self.initiate_event(LoadCountrySearchPageEvent(
+            *self._search_criteria, self._next_page_cursor, _SEARCH_PAGE_SIZE))
 
 
     def _get_search_code(self):
@@ -143,6 +196,12 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
             new_state = tkinter.DISABLED
 
         self._search_button['state'] = new_state
+
+        if new_state == tkinter.NORMAL:
+            self._incremental_search.schedule()
+        else:
+            self._incremental_search.cancel()
+
         return True
 
 
@@ -166,15 +225,25 @@ class _CountriesSearchView(tkinter.LabelFrame, EventHandler):
         self.initiate_event(LoadCountryEvent(self._get_selected_search_country_id()))
 
 
+    def _add_search_results(self, countries):
+        # The whole page is added to the list with a single call to Tk
+        self._search_list.insert(tkinter.END, *[f'{country.country_code} - {country.name}' for country in countries])
+        self._search_country_ids.extend(country.country_id for country in countries)
+
+
     def on_event(self, event):
         if isinstance(event, ClearCountriesSearchListEvent):
             self._search_list.delete(0, tkinter.END)
             self._search_country_ids = []
+            self._next_page_cursor = None
             self._edit_button['state'] = tkinter.DISABLED
-        elif isinstance(event, CountrySearchResultEvent):
-            display_name = f'{event.country().country_code} - {event.country().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_country_ids.append(event.country().country_id)
+            self._load_more_button['state'] = tkinter.DISABLED
+        elif isinstance(event, CountrySearchPageEvent):
+            self._add_search_results(event.countries())
+            self._next_page_cursor = event.next_page_cursor()
+
+            if self._next_page_cursor is not None:
+                self._load_more_button['state'] = tkinter.NORMAL
 
 
 
@@ -1,8 +1,129 @@
+import bisect
+import functools
+import itertools
+import math
 import tkinter
 
 
 
+# Event handlers are numbered as they are created, which orders siblings the
+# way winfo_children() does
+_creation_order = itertools.count()
+
+
+
+class EventRouter:
+    # Keeps the event handlers under one Tk root and, for each type of event,
+    # the order in which their on_event and on_event_post methods are called.
+    # That order is the one a walk of the widget tree would give: a handler's
+    # on_event, then its children's, then its on_event_post after theirs. Only
+    # handlers subscribed to the event are in it, so delivering an event does
+    # not visit the rest of the tree or ask Tk about any widget.
+
+    def __init__(self):
+        self._handlers = []
+        self._plans = {}
+        self._version = 0
+
+
+    def subscribe(self, handler):
+        self._handlers = [existing for existing in self._handlers if _is_alive(existing)]
+        self._handlers.append(handler)
+        self._plans.clear()
+        self._version += 1
+
+
+    def deliver(self, event, top):
+        top_path = top._event_path()
+
+        if top_path is None:
+            return
+
+        event_type = type(event)
+        plan = self._plan(event_type)
+        version = self._version
+        index = 0
+
+        while index < len(plan):
+            order, handler, is_post, path = plan[index]
+            index += 1
+
+            if path[:len(top_path)] == top_path and _is_alive(handler):
+                if is_post:
+                    handler.on_event_post(event)
+                else:
+                    handler.on_event(event)
+
+            if self._version != version:
+                # The call created handlers, such as a newly switched-to view;
+                # those the tree walk would still reach get this event too
+                plan = self._plan(event_type)
+                version = self._version
+                index = bisect.bisect_right(plan, order, key = lambda call: call[0])
+
+
+    def _plan(self, event_type):
+        try:
+            return self._plans[event_type]
+        except KeyError:
+            calls = []
+
+            for handler in self._handlers:
+                path = handler._event_path()
+
+                if path is None or not handler.is_subscribed(event_type):
+                    continue
+
+                if type(handler).on_event is not EventHandler.on_event:
+                    calls.append((path + (-1,), handler, False, path))
+
+                if type(handler).on_event_post is not EventHandler.on_event_post:
+                    calls.append((path + (math.inf,), handler, True, path))
+
+            calls.sort(key = lambda call: call[0])
+            self._plans[event_type] = calls
+            return calls
+
+
+
+def _is_alive(widget):
+    # tkinter removes a destroyed widget from its master's children, and
+    # destroys every child of a destroyed widget, without any call to Tk
+    return widget.master is None or widget.master.children.get(widget._name) is widget
+
+
+
+def _subscribe_when_created(init):
+    @functools.wraps(init)
+    def subscribing_init(self, *args, **kwargs):
+        is_outermost = '_event_order' not in self.__dict__
+
+        if is_outermost:
+            self._event_order = next(_creation_order)
+
+        init(self, *args, **kwargs)
+
+        if is_outermost:
+            self._event_router().subscribe(self)
+
+    subscribing_init._subscribes = True
+    return subscribing_init
+
+
+
 class EventHandler:
+    # The types of events this handler's on_event and on_event_post are called
+    # for, including their subclasses; None means every event
+    subscribed_events = None
+
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if '__init__' in cls.__dict__ and not getattr(cls.__init__, '_subscribes', False):
+            cls.__init__ = _subscribe_when_created(cls.__init__)
+
+
     def initiate_event(self, event):
         widget = self
 
@@ -17,17 +138,11 @@ class EventHandler:
 
 
     def handle_event(self, event):
-        self.on_event(event)
+        self._event_router().deliver(event, self)
 
-        if isinstance(self, tkinter.Tk) or isinstance(self, tkinter.Widget):
-            for child in self.winfo_children():
-                if not child.winfo_exists():
-                    continue
-
-                if isinstance(child, EventHandler):
-                    child.handle_event(event)
 
-        self.on_event_post(event)
+    def is_subscribed(self, event_type):
+        return self.subscribed_events is None or issubclass(event_type, self.subscribed_events)
 
 
     def on_event(self, event):
@@ -36,3 +151,32 @@ class EventHandler:
 
     def on_event_post(self, event):
         pass
+
+
+    def _event_router(self):
+        widget = self
+
+        while widget.master is not None:
+            widget = widget.master
+
+        if '_event_router_instance' not in widget.__dict__:
+            widget._event_router_instance = EventRouter()
+
+        return widget._event_router_instance
+
+
+    def _event_path(self):
+        # The creation numbers of this handler and its ancestors, from the
+        # root down, or None if an ancestor is not an event handler, which
+        # stops events from reaching it just as the tree walk did
+        path = []
+        widget = self
+
+        while widget is not None:
+            if not isinstance(widget, EventHandler) or '_event_order' not in widget.__dict__:
+                return None
+
+            path.append(widget._event_order)
+            widget = widget.master
+
+        return tuple(reversed(path))
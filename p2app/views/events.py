@@ -4,107 +4,161 @@ def is_internal_event(event):
 
 
 class _InternalEvent:
+    __slots__ = ('_INTERNAL',)
+
+
     def __init__(self):
         self._INTERNAL = True
 
 
 
 class ShowEditContinentsViewEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class ClearContinentsSearchListEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class NewContinentEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class StartEditingContinentEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class DiscardContinentEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class ShowEditCountriesViewEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class ClearCountriesSearchListEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class NewCountryEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class StartEditingCountryEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class DiscardCountryEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class ShowEditRegionsViewEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class ClearRegionsSearchListEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class NewRegionEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class StartEditingRegionEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class DiscardRegionEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class EnableDebugModeEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
 
 
 
 class DisableDebugModeEvent(_InternalEvent):
+    __slots__ = ()
+
+
     def __init__(self):
         super().__init__()
@@ -0,0 +1,61 @@
+import tkinter
+from p2app.events import *
+
+
+
+# How long, in milliseconds, typing has to pause before a search runs by itself
+DEFAULT_IDLE_MILLISECONDS = 300
+
+
+
+def incremental_match_mode(match_mode):
+    # Exact matches are of little use while a value is still being typed, so
+    # searches run as you type match by prefix instead
+    if match_mode == MATCH_EXACT:
+        return MATCH_PREFIX
+    else:
+        return match_mode
+
+
+
+class IncrementalSearchCheckbutton(tkinter.Checkbutton):
+    def __init__(self, parent, search, idle_milliseconds = DEFAULT_IDLE_MILLISECONDS):
+        self._is_enabled = tkinter.BooleanVar(parent)
+        self._is_enabled.set(False)
+
+        super().__init__(
+            parent, text = 'Search as you type', variable = self._is_enabled,
+            command = self.schedule)
+
+        self._search = search
+        self._idle_milliseconds = idle_milliseconds
+        self._pending_search = None
+
+
+    def is_enabled(self):
+        return self._is_enabled.get()
+
+
+    def schedule(self):
+        # Each call restarts the wait, so a burst of keystrokes is coalesced
+        # into the one search that runs once typing pauses
+        self.cancel()
+
+        if self.is_enabled():
+            self._pending_search = self.after(self._idle_milliseconds, self._on_idle)
+
+
+    def cancel(self):
+        if self._pending_search is not None:
+            self.after_cancel(self._pending_search)
+            self._pending_search = None
+
+
+    def destroy(self):
+        self.cancel()
+        super().destroy()
+
+
+    def _on_idle(self):
+        self._pending_search = None
+        self._search()
@@ -16,9 +16,19 @@ _INITIAL_WINDOW_HEIGHT = 600
 _PROJECT_NAME = 'Database Manipulator'
 _MISSING_DATABASE_NAME = '[no database open]'
 
+# How often an asynchronous event bus is checked for events sent by the engine
+_ENGINE_POLL_MILLISECONDS = 15
+
 
 
 class MainView(tkinter.Tk, EventHandler):
+    subscribed_events = (
+        ShowEditContinentsViewEvent, ShowEditCountriesViewEvent, ShowEditRegionsViewEvent,
+        DatabaseOpenedEvent, DatabaseClosedEvent, DatabaseOpenFailedEvent, IndexReportEvent,
+        FullTextSearchEnabledEvent, SpatialSearchEnabledEvent, TableExportedEvent,
+        EnableDebugModeEvent, DisableDebugModeEvent, EndApplicationEvent, ErrorEvent)
+
+
     def __init__(self, event_bus):
         super().__init__()
         self.geometry(f'{_INITIAL_WINDOW_WIDTH}x{_INITIAL_WINDOW_HEIGHT}')
@@ -39,9 +49,21 @@ class MainView(tkinter.Tk, EventHandler):
     def run(self):
         self._switch_view(EmptyView(self))
         self._update_database_path(None)
+
+        if self._event_bus.is_asynchronous():
+            self._event_bus.start()
+            self.after(_ENGINE_POLL_MILLISECONDS, self._deliver_engine_events)
+
         self.mainloop()
 
 
+    def _deliver_engine_events(self):
+        events_waiting = self._event_bus.deliver_events()
+
+        if self._event_bus.is_running():
+            self.after(1 if events_waiting else _ENGINE_POLL_MILLISECONDS, self._deliver_engine_events)
+
+
     def on_event(self, event):
         if isinstance(event, ShowEditContinentsViewEvent):
             self._switch_view(ContinentsView(self))
@@ -58,6 +80,24 @@ class MainView(tkinter.Tk, EventHandler):
             self._update_database_path(None)
             self._switch_view(EmptyView(self))
             tkinter.messagebox.showerror('Could Not Open Database', event.reason())
+        elif isinstance(event, IndexReportEvent):
+            tkinter.messagebox.showinfo('Index Report', event.report())
+        elif isinstance(event, FullTextSearchEnabledEvent):
+            if event.tables():
+                message = f'Full-text search enabled for: {", ".join(event.tables())}'
+            else:
+                message = 'Full-text search was already enabled.'
+
+            tkinter.messagebox.showinfo('Full-Text Search', message)
+        elif isinstance(event, SpatialSearchEnabledEvent):
+            if event.tables():
+                message = f'Spatial search enabled for: {", ".join(event.tables())}'
+            else:
+                message = 'Spatial search was already enabled.'
+
+            tkinter.messagebox.showinfo('Spatial Search', message)
+        elif isinstance(event, TableExportedEvent):
+            tkinter.messagebox.showinfo('Export', f'Exported {event.rows()} rows to {event.path()}')
         elif isinstance(event, EnableDebugModeEvent):
             self._event_bus.enable_debug_mode()
         elif isinstance(event, DisableDebugModeEvent):
@@ -66,6 +106,7 @@ class MainView(tkinter.Tk, EventHandler):
 
     def on_event_post(self, event):
         if isinstance(event, EndApplicationEvent):
+            self._event_bus.stop()
             self.destroy()
         elif isinstance(event, ErrorEvent):
             tkinter.messagebox.showerror('Error', event.message())
@@ -0,0 +1,23 @@
+import tkinter
+from p2app.events import *
+
+
+
+_MATCH_MODE_LABELS = {
+    'Exact': MATCH_EXACT,
+    'Prefix': MATCH_PREFIX,
+    'Full Text': MATCH_FULL_TEXT
+}
+
+
+
+class MatchModeMenu(tkinter.OptionMenu):
+    def __init__(self, parent):
+        self._selected_label = tkinter.StringVar(parent)
+        self._selected_label.set('Exact')
+
+        super().__init__(parent, self._selected_label, *_MATCH_MODE_LABELS)
+
+
+    def match_mode(self):
+        return _MATCH_MODE_LABELS[self._selected_label.get()]
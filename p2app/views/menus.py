@@ -7,10 +7,25 @@ from .event_handling import EventHandler
 
 
 _OPEN_DATABASE_DIALOG_TITLE = 'Open Database'
+_EXPORT_DIALOG_TITLE = 'Export'
+
+# The tables offered by the Export menu, with the label shown for each
+_EXPORT_TABLES = (
+    ('continent', 'Continents'),
+    ('country', 'Countries'),
+    ('region', 'Regions'),
+    ('airport', 'Airports'),
+    ('airport_frequency', 'Airport Frequencies'),
+    ('runway', 'Runways'),
+    ('navigation_aid', 'Navigation Aids')
+)
 
 
 
 class BaseMenu(tkinter.Menu, EventHandler):
+    subscribed_events = (DatabaseOpenedEvent, DatabaseClosedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, tearoff = 0)
 
@@ -26,8 +41,10 @@ class MainMenu(BaseMenu):
     def on_event(self, event):
         if isinstance(event, DatabaseOpenedEvent):
             self.insert_cascade(index = 1, label = 'Edit', menu = EditMenu(self))
+            self.insert_cascade(index = 2, label = 'Database', menu = DatabaseMenu(self))
         elif isinstance(event, DatabaseClosedEvent):
             self.delete('Edit')
+            self.delete('Database')
 
 
 
@@ -36,6 +53,7 @@ class FileMenu(BaseMenu):
         super().__init__(parent)
         self.add_command(label = 'Open', state = tkinter.NORMAL, command = self._on_open)
         self.add_command(label = 'Close', state = tkinter.DISABLED, command = self._on_close)
+        self.add_cascade(label = 'Export', state = tkinter.DISABLED, menu = ExportMenu(self))
         self.add_command(label = 'Exit', command = self._on_exit)
 
 
@@ -60,9 +78,33 @@ class FileMenu(BaseMenu):
         if isinstance(event, DatabaseOpenedEvent):
             self.entryconfig('Open', state = tkinter.DISABLED)
             self.entryconfig('Close', state = tkinter.NORMAL)
+            self.entryconfig('Export', state = tkinter.NORMAL)
         elif isinstance(event, DatabaseClosedEvent):
             self.entryconfig('Open', state = tkinter.NORMAL)
             self.entryconfig('Close', state = tkinter.DISABLED)
+            self.entryconfig('Export', state = tkinter.DISABLED)
+
+
+
+class ExportMenu(BaseMenu):
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        for table, label in _EXPORT_TABLES:
+            self.add_command(label = label, command = lambda table = table: self._on_export(table))
+
+
+    def _on_export(self, table):
+        export_path = tkinter.filedialog.asksaveasfilename(
+            title = _EXPORT_DIALOG_TITLE,
+            initialdir = Path.cwd(),
+            initialfile = f'{table}.csv',
+            defaultextension = '.csv',
+            filetypes = [('CSV', '*.csv'), ('JSON Lines', '*.jsonl'),
+                         ('Compressed CSV', '*.csv.gz'), ('Compressed JSON Lines', '*.jsonl.gz')])
+
+        if export_path:
+            self.initiate_event(ExportTableEvent(table, Path(export_path)))
 
 
 
@@ -87,6 +129,32 @@ class EditMenu(BaseMenu):
 
 
 
+class DatabaseMenu(BaseMenu):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.add_command(label = 'Index Report', command = self._on_index_report)
+        self.add_command(label = 'Apply Recommended Indexes', command = self._on_apply_indexes)
+        self.add_command(label = 'Enable Full-Text Search', command = self._on_enable_full_text)
+        self.add_command(label = 'Enable Spatial Search', command = self._on_enable_spatial)
+
+
+    def _on_index_report(self):
+        self.initiate_event(AnalyzeIndexesEvent())
+
+
+    def _on_apply_indexes(self):
+        self.initiate_event(ApplyRecommendedIndexesEvent())
+
+
+    def _on_enable_full_text(self):
+        self.initiate_event(EnableFullTextSearchEvent())
+
+
+    def _on_enable_spatial(self):
+        self.initiate_event(EnableSpatialSearchEvent())
+
+
+
 class DebugMenu(BaseMenu):
     def __init__(self, parent):
         super().__init__(parent)
@@ -3,10 +3,22 @@ import tkinter.messagebox
 from p2app.events import *
 from .event_handling import EventHandler
 from .events import *
+from .incremental import IncrementalSearchCheckbutton, incremental_match_mode
+from .match_mode import MatchModeMenu
+from .virtual_list import VirtualListbox
+
+
+# The number of search results loaded at a time
+_SEARCH_PAGE_SIZE = 100
 
 
 
 class RegionsView(tkinter.Frame, EventHandler):
+    subscribed_events = (
+        SaveRegionFailedEvent, DiscardRegionEvent, NewRegionEvent, StartEditingRegionEvent,
+        RegionLoadedEvent, RegionSavedEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -50,6 +62,9 @@ class RegionsView(tkinter.Frame, EventHandler):
 
 
 class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
+    subscribed_events = (ClearRegionsSearchListEvent, RegionSearchPageEvent, RegionSearchRowsEvent)
+
+
     def __init__(self, parent):
         super().__init__(parent, text = 'Region Search')
 
@@ -86,34 +101,45 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
         self._search_button.grid(row = 3, column = 1, sticky = tkinter.E, padx = 5, pady = 5)
 
-        empty_area = tkinter.Label(self, text = '')
-        empty_area.grid(row = 4, column = 1, sticky = tkinter.NSEW, padx = 5, pady = 5)
+        match_mode_label = tkinter.Label(self, text = 'Match: ')
+        match_mode_label.grid(row = 3, column = 0, sticky = tkinter.E, padx = 5, pady = 5)
+
+        self._match_mode_menu = MatchModeMenu(self)
+        self._match_mode_menu.grid(row = 3, column = 1, sticky = tkinter.W, padx = 5, pady = 5)
 
-        self._search_list = tkinter.Listbox(
-            self, height = 4,
-            activestyle = tkinter.NONE, selectmode = tkinter.SINGLE)
+        self._incremental_search = IncrementalSearchCheckbutton(self, self._on_incremental_search)
+        self._incremental_search.grid(row = 4, column = 1, sticky = tkinter.NW, padx = 5, pady = 5)
+
+        self._search_list = VirtualListbox(self, self._load_search_rows, height = 4)
 
         self._search_list.bind('<<ListboxSelect>>', self._on_search_selection_changed)
         self._search_list.grid(
             row = 0, column = 2, rowspan = 4, columnspan = 1, sticky = tkinter.NSEW,
             padx = 5, pady = 5)
 
-        self._search_region_ids = []
+        self._search_criteria = None
+        self._next_page_cursor = None
 
         button_frame = tkinter.Frame(self)
         button_frame.grid(row = 5, column = 2, sticky = tkinter.E, padx = 5, pady = 5)
 
+        self._load_more_button = tkinter.Button(
+            button_frame, text = 'Load More', state = tkinter.DISABLED,
+            command = self._on_load_more)
+
+        self._load_more_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+
         self._new_button = tkinter.Button(
             button_frame, text = 'New Region',
             command = self._on_new_region)
 
-        self._new_button.grid(row = 0, column = 0, padx = 5, pady = 5)
+        self._new_button.grid(row = 0, column = 1, padx = 5, pady = 5)
 
         self._edit_button = tkinter.Button(
             button_frame, text = 'Edit Region', state = tkinter.DISABLED,
             command = self._on_edit_region)
 
-        self._edit_button.grid(row = 0, column = 1, padx = 5, pady = 5)
+        self._edit_button.grid(row = 0, column = 2, padx = 5, pady = 5)
 
         self.rowconfigure(0, weight = 0)
         self.rowconfigure(1, weight = 0)
@@ -127,10 +153,41 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
 
     def _on_search_button_clicked(self):
+        self._incremental_search.cancel()
+        self._start_search(self._get_search_criteria(self._match_mode_menu.match_mode()))
+
+
+    def _on_incremental_search(self):
+        criteria = self._get_search_criteria(incremental_match_mode(self._match_mode_menu.match_mode()))
+
+        if any(value is not None for value in criteria[:-1]) and criteria != self._search_criteria:
+            self._start_search(criteria)
+
+
+    def _start_search(self, criteria):
+        # Only the first page is loaded; a search started before this one has
+        # finished is superseded by the event bus
         self.initiate_event(ClearRegionsSearchListEvent())
-        self.initiate_event(StartRegionSearchEvent(
+        self._search_criteria = criteria
+        self.initiate_event(LoadRegionSearchPageEvent(*self._search_criteria, None, _SEARCH_PAGE_SIZE))
+
+
+    def _get_search_criteria(self, match_mode):
+        return (
             self._get_search_region_code(), self._get_search_local_code(),
-            self._get_search_name()))
+            self._get_search_name(), match_mode)
+
+
+    def _on_load_more(self):
+        self._load_more_button['state'] = tkinter.DISABLED
+        self.initiate_event(LoadRegionSearchPageEvent(
+            *self._search_criteria, self._next_page_cursor, _SEARCH_PAGE_SIZE))
+
+
+    def _load_search_rows(self, region_ids):
+        # The list asks again for rows it has dropped from its cache once they
+        # are scrolled back into view
+        self.initiate_event(LoadRegionSearchRowsEvent(region_ids))
 
 
     def _get_search_region_code(self):
@@ -150,7 +207,7 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
 
     def _get_selected_search_region_id(self):
         selection, *_ = self._search_list.curselection()
-        return self._search_region_ids[selection]
+        return self._search_list.item_id(selection)
 
 
     def _on_search_changed(self, *args):
@@ -162,6 +219,12 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
             new_state = tkinter.DISABLED
 
         self._search_button['state'] = new_state
+
+        if new_state == tkinter.NORMAL:
+            self._incremental_search.schedule()
+        else:
+            self._incremental_search.cancel()
+
         return True
 
 
@@ -185,15 +248,32 @@ class _RegionsSearchView(tkinter.LabelFrame, EventHandler):
         self.initiate_event(LoadRegionEvent(self._get_selected_search_region_id()))
 
 
+    def _add_search_results(self, regions):
+        self._search_list.extend(regions.region_ids)
+        self._add_search_rows(regions)
+
+
+    def _add_search_rows(self, regions):
+        # Regions arrive as a RegionBatch, whose columns are read directly
+        # rather than making a Region for each row
+        self._search_list.add_rows(zip(regions.region_ids, (
+            f'{region_code} - {name}' for region_code, name in zip(regions.region_codes, regions.names))))
+
+
     def on_event(self, event):
         if isinstance(event, ClearRegionsSearchListEvent):
-            self._search_list.delete(0, tkinter.END)
-            self._search_region_ids = []
+            self._search_list.clear()
+            self._next_page_cursor = None
             self._edit_button['state'] = tkinter.DISABLED
-        elif isinstance(event, RegionSearchResultEvent):
-            display_name = f'{event.region().region_code} - {event.region().name}'
-            self._search_list.insert(tkinter.END, display_name)
-            self._search_region_ids.append(event.region().region_id)
+            self._load_more_button['state'] = tkinter.DISABLED
+        elif isinstance(event, RegionSearchPageEvent):
+            self._add_search_results(event.regions())
+            self._next_page_cursor = event.next_page_cursor()
+
+            if self._next_page_cursor is not None:
+                self._load_more_button['state'] = tkinter.NORMAL
+        elif isinstance(event, RegionSearchRowsEvent):
+            self._add_search_rows(event.regions())
 
 
 
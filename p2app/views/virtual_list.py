@@ -0,0 +1,229 @@
+import tkinter
+import tkinter.font
+from array import array
+from collections import OrderedDict
+
+
+
+# How many rows' text is kept once they are scrolled out of view, so that
+# scrolling back to them does not load them again
+_MAX_CACHED_ROWS = 2000
+
+# What a row shows until its text is loaded
+_PLACEHOLDER = '...'
+
+# How many rows a turn of the mouse wheel scrolls
+_WHEEL_ROWS = 3
+
+
+
+class VirtualListbox(tkinter.Frame):
+    # A list of rows that stays as fast and as small with a million rows as
+    # with a hundred. Rows are known by id, and only their ids are kept, in an
+    # array of 64-bit integers. The Listbox inside holds only the rows in view;
+    # the text of those rows, and of a window of rows either side of them, is
+    # asked for through load_rows(ids) as they come into view and is handed
+    # back through add_rows. It generates <<ListboxSelect>> and answers
+    # curselection() with the index of the selected row in the whole list, the
+    # way a Listbox does.
+
+    def __init__(self, parent, load_rows, height = 4):
+        super().__init__(parent)
+
+        self._load_rows = load_rows
+        self._ids = array('q')
+        self._rows = OrderedDict()
+        self._requested = set()
+        self._top = 0
+        self._visible_rows = height
+        self._selected = None
+        self._pending_render = None
+
+        self._listbox = tkinter.Listbox(
+            self, height = height, activestyle = tkinter.NONE,
+            selectmode = tkinter.SINGLE, exportselection = False)
+
+        self._listbox.grid(row = 0, column = 0, sticky = tkinter.NSEW)
+
+        self._scrollbar = tkinter.Scrollbar(self, orient = tkinter.VERTICAL, command = self._on_scroll)
+        self._scrollbar.grid(row = 0, column = 1, sticky = tkinter.NS)
+
+        self._listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self._listbox.bind('<Configure>', self._on_configure)
+        self._listbox.bind('<MouseWheel>', self._on_mouse_wheel)
+        self._listbox.bind('<Button-4>', lambda event: self._scroll_to(self._top - _WHEEL_ROWS))
+        self._listbox.bind('<Button-5>', lambda event: self._scroll_to(self._top + _WHEEL_ROWS))
+        self._listbox.bind('<Up>', lambda event: self._move_selection(-1))
+        self._listbox.bind('<Down>', lambda event: self._move_selection(1))
+        self._listbox.bind('<Prior>', lambda event: self._move_selection(-self._visible_rows))
+        self._listbox.bind('<Next>', lambda event: self._move_selection(self._visible_rows))
+
+        self.rowconfigure(0, weight = 1)
+        self.columnconfigure(0, weight = 1)
+
+
+    def size(self):
+        return len(self._ids)
+
+
+    def item_id(self, index):
+        return self._ids[index]
+
+
+    def curselection(self):
+        return () if self._selected is None else (self._selected,)
+
+
+    def clear(self):
+        self._ids = array('q')
+        self._rows.clear()
+        self._requested.clear()
+        self._top = 0
+        self._selected = None
+        self._render()
+
+
+    def extend(self, ids):
+        # Rows are usually added in large batches while a search is running, so
+        # the list is redrawn once Tk is idle rather than after every batch
+        self._ids.extend(ids)
+        self._schedule_render()
+
+
+    def add_rows(self, rows):
+        for row_id, text in rows:
+            self._rows[row_id] = text
+            self._rows.move_to_end(row_id)
+            self._requested.discard(row_id)
+
+        while len(self._rows) > _MAX_CACHED_ROWS:
+            self._rows.popitem(last = False)
+
+        self._schedule_render()
+
+
+    def destroy(self):
+        if self._pending_render is not None:
+            self.after_cancel(self._pending_render)
+            self._pending_render = None
+
+        super().destroy()
+
+
+    def _schedule_render(self):
+        if self._pending_render is None:
+            self._pending_render = self.after_idle(self._render)
+
+
+    def _render(self):
+        if self._pending_render is not None:
+            self.after_cancel(self._pending_render)
+            self._pending_render = None
+
+        count = len(self._ids)
+        self._top = max(0, min(self._top, count - self._visible_rows))
+        end = min(count, self._top + self._visible_rows)
+
+        texts = []
+
+        for row_id in self._ids[self._top:end]:
+            text = self._rows.get(row_id)
+
+            if text is None:
+                texts.append(_PLACEHOLDER)
+            else:
+                texts.append(text)
+                self._rows.move_to_end(row_id)
+
+        self._listbox.delete(0, tkinter.END)
+        self._listbox.insert(tkinter.END, *texts)
+
+        if self._selected is not None and self._top <= self._selected < end:
+            self._listbox.selection_set(self._selected - self._top)
+
+        if count > 0:
+            self._scrollbar.set(self._top / count, end / count)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+        self._request_rows(max(0, self._top - self._visible_rows), min(count, end + self._visible_rows))
+
+
+    def _request_rows(self, start, end):
+        # Loads the rows in view along with a window either side of them, so
+        # the next few scrolls find their rows already loaded
+        missing = [
+            row_id for row_id in self._ids[start:end]
+            if row_id not in self._rows and row_id not in self._requested]
+
+        if missing:
+            self._requested.update(missing)
+            self._load_rows(missing)
+
+
+    def _scroll_to(self, top):
+        self._top = top
+        self._render()
+
+
+    def _on_scroll(self, command, *args):
+        if command == tkinter.MOVETO:
+            self._scroll_to(int(float(args[0]) * len(self._ids)))
+        elif command == tkinter.SCROLL:
+            amount, what = args
+
+            if what == tkinter.PAGES:
+                self._scroll_to(self._top + int(amount) * self._visible_rows)
+            else:
+                self._scroll_to(self._top + int(amount))
+
+
+    def _on_mouse_wheel(self, event):
+        if event.delta > 0:
+            self._scroll_to(self._top - _WHEEL_ROWS)
+        elif event.delta < 0:
+            self._scroll_to(self._top + _WHEEL_ROWS)
+
+
+    def _on_configure(self, event):
+        # Works out how many rows fit the height the Listbox was given, with
+        # the row height Tk gives a Listbox of this font
+        font = tkinter.font.Font(font = self._listbox.cget('font'))
+        line_height = font.metrics('linespace') + 1 + 2 * int(self._listbox.cget('selectborderwidth'))
+        border = int(self._listbox.cget('borderwidth')) + int(self._listbox.cget('highlightthickness'))
+        visible_rows = max(1, (event.height - 2 * border) // line_height)
+
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._render()
+
+
+    def _on_listbox_select(self, event):
+        selection = self._listbox.curselection()
+
+        if selection:
+            self._selected = self._top + selection[0]
+        else:
+            self._selected = None
+
+        self.event_generate('<<ListboxSelect>>')
+
+
+    def _move_selection(self, rows):
+        if len(self._ids) > 0:
+            if self._selected is None:
+                selected = self._top
+            else:
+                selected = max(0, min(len(self._ids) - 1, self._selected + rows))
+
+            self._selected = selected
+
+            if selected < self._top:
+                self._top = selected
+            elif selected >= self._top + self._visible_rows:
+                self._top = selected - self._visible_rows + 1
+
+            self._render()
+            self.event_generate('<<ListboxSelect>>')
+
+        return 'break'
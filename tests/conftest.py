@@ -0,0 +1,52 @@
+import sqlite3
+from pathlib import Path
+import pytest
+
+
+SCHEMA = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+# Enough regions that reading them all at once takes far more memory than
+# reading them a batch at a time
+REGION_COUNT = 20000
+
+
+def build_database(path, region_count = REGION_COUNT):
+    """
+    Creates a scratch database at the given path from schema.sql, with two
+    continents, two countries, region_count regions and one airport
+    """
+    connection = sqlite3.connect(path)
+
+    try:
+        connection.executescript(SCHEMA.read_text())
+        connection.executemany('INSERT INTO continent VALUES (?, ?, ?);',
+                               [(1, 'NA', 'North America'), (2, 'EU', 'Europe')])
+        connection.executemany('INSERT INTO country VALUES (?, ?, ?, ?, ?, ?);',
+                               [(1, 'US', 'United States', 1, 'https://en.wikipedia.org/wiki/United_States', None),
+                                (2, 'FR', 'France', 2, 'https://en.wikipedia.org/wiki/France', 'Europe')])
+        connection.executemany(
+            'INSERT INTO region VALUES (?, ?, ?, ?, ?, ?, ?, ?);',
+            ((region_id, f'US-{region_id}', f'L{region_id % 100}', f'Region {region_id}', 1, 1, None, None)
+             for region_id in range(1, region_count + 1)))
+        connection.execute(
+            'INSERT INTO airport VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);',
+            (1, 'KAAA', 'small_airport', 'Airport 1', 33.5, -117.5, 100, '1', 1, 1,
+             'Town', 0, 'KAAA', 'AAA', 'AAA', None, None, None))
+        connection.commit()
+    finally:
+        connection.close()
+
+    return path
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    return build_database(tmp_path / 'scratch.db')
+
+
+@pytest.fixture
+def connection(database_path):
+    connection = sqlite3.connect(database_path)
+    connection.execute('PRAGMA foreign_keys = ON;')
+    yield connection
+    connection.close()
@@ -0,0 +1,95 @@
+import tracemalloc
+from p2app import Engine
+from p2app.events import *
+from conftest import build_database
+
+
+def _search_every_region(path):
+    # Searches for every region through the engine, as the view would, and
+    # returns how many regions were found and the peak memory the search took.
+    # The search cache is kept small, so these results are too large to cache.
+    engine = Engine(search_cache_bytes = 1024 * 1024)
+    list(engine.process_event(OpenDatabaseEvent(path)))
+    tracemalloc.start()
+
+    try:
+        found = 0
+
+        for event in engine.process_event(StartRegionSearchEvent(None, None, 'Region', MATCH_PREFIX)):
+            found += 1
+
+        return found, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        list(engine.process_event(CloseDatabaseEvent()))
+
+
+def _page_through(engine):
+    # Loads every page of a search for every region, the way Load More does,
+    # and returns the ids of the regions found
+    found = []
+    page_cursor = None
+
+    while True:
+        event, = engine.process_event(LoadRegionSearchPageEvent(None, None, 'Region', MATCH_PREFIX, page_cursor, 100))
+        found += event.regions().region_ids
+        page_cursor = event.next_page_cursor()
+
+        if page_cursor is None:
+            return found
+
+
+def test_a_search_takes_the_same_memory_however_many_regions_it_finds(tmp_path):
+    small_found, small_peak = _search_every_region(build_database(tmp_path / 'small.db', 5000))
+    large_found, large_peak = _search_every_region(build_database(tmp_path / 'large.db', 50000))
+
+    assert (small_found, large_found) == (5000, 50000)
+    assert large_peak < small_peak * 1.5
+
+
+def test_an_event_that_needs_a_database_is_answered_with_an_error_when_none_is_open(database_path):
+    engine = Engine()
+    list(engine.process_event(OpenDatabaseEvent(database_path)))
+    list(engine.process_event(CloseDatabaseEvent()))
+
+    for event in (StartRegionSearchEvent(None, None, 'Region', MATCH_PREFIX), LoadRegionEvent(1),
+                  LoadRegionSearchPageEvent(None, None, 'Region', MATCH_PREFIX), AnalyzeIndexesEvent()):
+        results = list(engine.process_event(event))
+
+        assert len(results) == 1 and isinstance(results[0], ErrorEvent)
+        assert results[0].message() == 'No database is open!'
+
+
+
+def test_load_more_is_served_from_the_search_cache(tmp_path):
+    engine = Engine()
+    list(engine.process_event(OpenDatabaseEvent(build_database(tmp_path / 'scratch.db', 2000))))
+    statements = []
+    engine.connections.connection().set_trace_callback(statements.append)
+
+    try:
+        assert _page_through(engine) == list(range(1, 2001))
+        # The first page is read alone and the other nineteen ten at a time
+        assert len([statement for statement in statements if 'FROM region' in statement]) == 3
+
+        statements.clear()
+        assert _page_through(engine) == list(range(1, 2001))
+        assert not [statement for statement in statements if 'FROM region' in statement]
+    finally:
+        list(engine.process_event(CloseDatabaseEvent()))
+
+
+def test_the_region_list_is_sent_its_rows_as_columns(database_path):
+    engine = Engine()
+    list(engine.process_event(OpenDatabaseEvent(database_path)))
+
+    try:
+        page, = engine.process_event(LoadRegionSearchPageEvent(None, None, 'Region', MATCH_PREFIX, None, 100))
+        rows, = engine.process_event(LoadRegionSearchRowsEvent([7, 3]))
+    finally:
+        list(engine.process_event(CloseDatabaseEvent()))
+
+    assert isinstance(page.regions(), RegionBatch) and isinstance(rows.regions(), RegionBatch)
+    assert list(page.regions().region_ids) == list(range(1, 101))
+    assert sorted(rows.regions()) == [Region(3, 'US-3', 'L3', 'Region 3', 1, 1, None, None),
+                                      Region(7, 'US-7', 'L7', 'Region 7', 1, 1, None, None)]
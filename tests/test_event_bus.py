@@ -0,0 +1,272 @@
+import threading
+import time
+from p2app import Engine, EventBus
+from p2app.engine.connection import ConnectionManager
+from p2app.events import *
+
+
+# How long a test waits for the worker before failing
+_TIMEOUT_SECONDS = 5
+
+
+class _RecordingView:
+    def __init__(self):
+        self.events = []
+
+
+    def handle_event(self, event):
+        self.events.append(event)
+
+
+
+class _SlowView(_RecordingView):
+    # Takes a millisecond over each event, as a view filling a widget might
+    def handle_event(self, event):
+        time.sleep(0.001)
+        super().handle_event(event)
+
+
+
+class _ScriptedEngine:
+    # Answers each region search with the messages it was given, as ErrorEvents.
+    # The first search stops after its first result until it is interrupted,
+    # the way a running query does until SQLite is interrupted.
+
+    def __init__(self, first_search_results = 1):
+        self.started = threading.Event()
+        self.interrupted = threading.Event()
+        self.interrupts = 0
+        self.searches = 0
+        self.first_search_results = first_search_results
+
+
+    def process_event(self, event):
+        self.searches += 1
+
+        if self.searches == 1:
+            for number in range(self.first_search_results):
+                yield ErrorEvent(f'first {number}')
+
+            self.started.set()
+            self.interrupted.wait(_TIMEOUT_SECONDS)
+            yield ErrorEvent('first after interrupt')
+        else:
+            yield ErrorEvent(f'search {self.searches}')
+
+
+    def interrupt(self):
+        self.interrupts += 1
+        self.interrupted.set()
+
+
+    def stats(self):
+        return ''
+
+
+
+def _start_bus(engine):
+    bus = EventBus(asynchronous = True)
+    view = _RecordingView()
+    bus.register_engine(engine)
+    bus.register_view(view)
+    bus.start()
+    return bus, view
+
+
+def _deliver_until(bus, view, message):
+    deadline = time.monotonic() + _TIMEOUT_SECONDS
+
+    while not any(event.message() == message for event in view.events):
+        assert time.monotonic() < deadline, f'{message} was never delivered'
+        bus.deliver_events()
+        time.sleep(0.001)
+
+
+def _search(name):
+    return StartRegionSearchEvent(None, None, name, MATCH_PREFIX)
+
+
+def test_a_superseded_search_does_not_block_on_a_full_queue():
+    # The first search fills the queue to the view and more, while the view
+    # delivers nothing, so its worker is waiting for room when it is superseded
+    engine = _ScriptedEngine(first_search_results = 1000)
+    engine.interrupted.set()
+    bus, view = _start_bus(engine)
+
+    try:
+        bus.initiate_event(_search('a'))
+        time.sleep(0.2)
+
+        bus.initiate_event(_search('b'))
+        _deliver_until(bus, view, 'search 2')
+
+        assert [event.message() for event in view.events] == ['search 2']
+    finally:
+        bus.stop()
+
+
+def test_one_delivery_keeps_to_its_time_budget_however_many_events_wait():
+    engine = _ScriptedEngine(first_search_results = 1000)
+    engine.interrupted.set()
+    bus = EventBus(asynchronous = True)
+    view = _SlowView()
+    bus.register_engine(engine)
+    bus.register_view(view)
+    bus.start()
+
+    try:
+        bus.initiate_event(_search('a'))
+        time.sleep(0.2)
+
+        start = time.perf_counter()
+        events_waiting = bus.deliver_events()
+        seconds = time.perf_counter() - start
+
+        # The budget may be overrun by the one event being handled when it runs out
+        assert events_waiting
+        assert 0 < len(view.events) < 1000
+        assert seconds < 0.015 + 0.010
+    finally:
+        bus.stop()
+
+
+def test_delivery_asks_to_run_again_soon_while_the_engine_is_working():
+    engine = _ScriptedEngine()
+    bus, view = _start_bus(engine)
+
+    try:
+        bus.initiate_event(_search('a'))
+        assert engine.started.wait(_TIMEOUT_SECONDS)
+        _deliver_until(bus, view, 'first 0')
+
+        assert bus.deliver_events()
+
+        engine.interrupted.set()
+        _deliver_until(bus, view, 'first after interrupt')
+        deadline = time.monotonic() + _TIMEOUT_SECONDS
+
+        while bus.deliver_events():
+            assert time.monotonic() < deadline, 'the engine never finished'
+            time.sleep(0.001)
+    finally:
+        bus.stop()
+
+
+def test_a_synchronous_bus_hands_every_result_to_the_view():
+    engine = _ScriptedEngine()
+    engine.interrupted.set()
+    bus = EventBus()
+    view = _RecordingView()
+    bus.register_engine(engine)
+    bus.register_view(view)
+
+    bus.initiate_event(_search('a'))
+
+    assert [event.message() for event in view.events] == ['first 0', 'first after interrupt']
+
+
+def test_the_engine_streams_a_search_through_the_bus(database_path):
+    bus = EventBus(asynchronous = True)
+    view = _RecordingView()
+    bus.register_engine(Engine())
+    bus.register_view(view)
+    bus.start()
+
+    try:
+        bus.initiate_event(OpenDatabaseEvent(database_path))
+        bus.initiate_event(_search('Region 1234'))
+        bus.initiate_event(LoadRegionEvent(1234))
+
+        deadline = time.monotonic() + _TIMEOUT_SECONDS
+
+        while not any(isinstance(event, RegionLoadedEvent) for event in view.events):
+            assert time.monotonic() < deadline, 'the region was never loaded'
+            bus.deliver_events()
+            time.sleep(0.001)
+    finally:
+        bus.stop()
+
+    found = [event.region().name for event in view.events if isinstance(event, RegionSearchResultEvent)]
+
+    assert isinstance(view.events[0], DatabaseOpenedEvent)
+    assert sorted(found) == ['Region 1234', 'Region 12340', 'Region 12341', 'Region 12342', 'Region 12343',
+                             'Region 12344', 'Region 12345', 'Region 12346', 'Region 12347', 'Region 12348',
+                             'Region 12349']
+
+
+def test_a_new_search_interrupts_the_one_running_and_discards_its_results():
+    engine = _ScriptedEngine()
+    bus, view = _start_bus(engine)
+
+    try:
+        bus.initiate_event(_search('a'))
+        assert engine.started.wait(_TIMEOUT_SECONDS)
+
+        bus.initiate_event(_search('b'))
+        _deliver_until(bus, view, 'search 2')
+
+        assert engine.interrupts == 1
+        assert [event.message() for event in view.events] == ['search 2']
+        assert bus.discarded_events() == 1
+    finally:
+        bus.stop()
+
+
+def test_a_search_that_has_finished_is_not_interrupted():
+    engine = _ScriptedEngine()
+    engine.interrupted.set()
+    bus, view = _start_bus(engine)
+
+    try:
+        bus.initiate_event(_search('a'))
+        _deliver_until(bus, view, 'first after interrupt')
+
+        bus.initiate_event(_search('b'))
+        _deliver_until(bus, view, 'search 2')
+
+        assert engine.interrupts == 0
+        assert bus.discarded_events() == 0
+    finally:
+        bus.stop()
+
+
+def test_interrupt_stops_a_query_running_on_another_thread(database_path):
+    connections = ConnectionManager()
+    errors = []
+    opened = threading.Event()
+
+    def run_query():
+        connection = connections.open(database_path)
+        opened.set()
+
+        try:
+            connection.execute(
+                'WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter) '
+                'SELECT count(*) FROM counter;').fetchone()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connections.close()
+
+    worker = threading.Thread(target = run_query)
+    worker.start()
+    assert opened.wait(_TIMEOUT_SECONDS)
+    time.sleep(0.05)
+
+    connections.interrupt()
+    worker.join(_TIMEOUT_SECONDS)
+
+    assert not worker.is_alive()
+    assert len(errors) == 1 and 'interrupted' in str(errors[0])
+
+
+def test_a_later_page_of_a_list_never_searched_is_still_processed():
+    engine = _ScriptedEngine()
+    engine.interrupted.set()
+    bus, view = _start_bus(engine)
+
+    try:
+        bus.initiate_event(LoadRegionSearchPageEvent(None, None, 'a', MATCH_PREFIX, 100, 100))
+        _deliver_until(bus, view, 'first after interrupt')
+    finally:
+        bus.stop()
@@ -0,0 +1,99 @@
+import sqlite3
+import p2app.engine.query as query
+import p2app.engine.search as search
+import p2app.engine.spatial as spatial
+from p2app.events import Continent, Country, Region
+from conftest import REGION_COUNT, build_database
+
+
+def _insert_steps(path, region_count):
+    # Counts the virtual machine instructions SQLite runs to save one new
+    # region in a database holding region_count regions
+    connection = sqlite3.connect(build_database(path, region_count))
+    steps = 0
+
+    def count():
+        nonlocal steps
+        steps += 1
+
+    try:
+        connection.set_progress_handler(count, 1)
+        query.save_new_region(connection, (None, 'FR-IDF', 'IDF', 'Ile-de-France', 2, 2, '', ''))
+        return steps
+    finally:
+        connection.close()
+
+
+def _region_prefix_search(connection):
+    return query.search_records(connection, 'region', [search.Criterion('name', search.PREFIX, 'Region')])
+
+
+def test_fetch_batches_yields_every_row_in_batches_of_at_most_size(connection):
+    batches = list(query.fetch_batches(_region_prefix_search(connection), 500))
+
+    assert sum(len(batch) for batch in batches) == REGION_COUNT
+    assert all(0 < len(batch) <= 500 for batch in batches)
+
+
+def test_search_records_reads_records_when_asked(connection):
+    cursor = query.search_records(connection, 'region', [search.Criterion('region_code', search.EQUALS, 'US-7')],
+                                  as_records = True)
+
+    assert cursor.fetchall() == [Region(7, 'US-7', 'L7', 'Region 7', 1, 1, None, None)]
+
+
+def test_save_new_continent_returns_it_with_the_assigned_id(connection):
+    continent = query.save_new_continent(connection, (None, 'AF', 'Africa'))
+
+    assert continent == Continent(3, 'AF', 'Africa')
+    assert query.load_continent(connection, continent.continent_id) == continent
+
+
+def test_save_new_country_returns_it_with_the_assigned_id(connection):
+    country = query.save_new_country(connection, (None, 'CA', 'Canada', 1, 'https://en.wikipedia.org/wiki/Canada', 'North'))
+
+    assert country == Country(3, 'CA', 'Canada', 1, 'https://en.wikipedia.org/wiki/Canada', 'North')
+    assert query.load_country(connection, country.country_id) == country
+
+
+def test_save_new_region_returns_it_with_the_assigned_id(connection):
+    region = query.save_new_region(connection, (None, 'FR-IDF', 'IDF', 'Ile-de-France', 2, 2, '', ''))
+
+    assert region.region_id == REGION_COUNT + 1
+    assert query.load_region(connection, region.region_id) == region._replace(wikipedia_link = None, keywords = None)
+
+
+def test_save_new_region_does_the_same_work_however_large_the_table(tmp_path):
+    small = _insert_steps(tmp_path / 'small.db', 1000)
+    large = _insert_steps(tmp_path / 'large.db', 50000)
+
+    assert large <= small * 1.1
+
+
+def test_save_new_airport_returns_it_as_stored(connection):
+    airport = query.save_new_airport(connection, (
+        None, 'KBBB', 'heliport', 'Airport 2', 34.0, -118.0, '', '1', 1, 1,
+        '', 0, '', '', '', '', '', ''))
+
+    assert airport.airport_id == 2
+    assert airport.municipality is None
+    assert query.load_airport(connection, airport.airport_id) == airport
+
+
+def test_save_airport_returns_it_as_stored(connection):
+    changed = query.load_airport(connection, 1)._replace(name = 'Renamed', home_link = '')
+    airport = query.save_airport(connection, tuple(changed))
+
+    assert airport == changed._replace(home_link = None)
+    assert query.load_airport(connection, 1) == airport
+
+
+def test_spatial_searches_read_airports_as_records(connection):
+    airport = query.load_airport(connection, 1)
+
+    for enabled in (False, True):
+        if enabled:
+            spatial.enable_spatial(connection)
+
+        assert spatial.box_search(connection, 'airport', 33, 34, -118, -117) == [airport]
+        assert spatial.radius_search(connection, 'airport', 33.5, -117.5, 10) == [(airport, 0.0)]